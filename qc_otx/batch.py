@@ -0,0 +1,628 @@
+# SPDX-License-Identifier: MPL-2.0
+# Copyright 2024, ASAM e.V.
+# This Source Code Form is subject to the terms of the Mozilla
+# Public License, v. 2.0. If a copy of the MPL was not distributed
+# with this file, You can obtain one at https://mozilla.org/MPL/2.0/.
+
+import argparse
+import collections
+import dataclasses
+import glob
+import json
+import logging
+import os
+import time
+import tracemalloc
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+from copy import deepcopy
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+
+from lxml import etree
+
+from qc_baselib import Configuration, Result, StatusType
+from qc_baselib.models import result as result_models
+from qc_otx import constants, main, result_cache
+from qc_otx.checks import models, registry, utils
+
+# Precedence used to combine the status of the same checker over several files
+STATUS_PRECEDENCE = {
+    StatusType.SKIPPED: 0,
+    StatusType.COMPLETED: 1,
+    StatusType.ERROR: 2,
+}
+
+INPUT_FILE_INFO_NAME = "InputFile"
+
+
+@dataclass
+class FileReport:
+    """Outcome of checking a single input file. It only holds plain data, so it
+    can be returned by a worker process.
+    """
+
+    input_file: str
+    checkers: List[models.CheckerRecord] = field(default_factory=list)
+    error: Optional[str] = None
+    profiles: Optional[List[models.CheckerProfile]] = None
+
+
+# Per-process state of the worker processes used with --jobs
+_worker_config_template: Optional[Configuration] = None
+_worker_cache: Optional[models.CheckerCache] = None
+_worker_profile: bool = False
+_worker_result_cache_dir: Optional[str] = None
+_worker_use_streaming: bool = False
+
+
+def args_entrypoint() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        prog="QC OTX Batch Checker",
+        description="Check the validity of many Open Test sequence eXchange (.otx) files in one process.",
+    )
+
+    parser.add_argument(
+        "inputs",
+        nargs="+",
+        help="OTX files, glob patterns or package directories to check.",
+    )
+    parser.add_argument(
+        "-c",
+        "--config_path",
+        help="Configuration used as template for every input file. The InputFile parameter is replaced.",
+    )
+
+    group = parser.add_mutually_exclusive_group(required=True)
+    group.add_argument(
+        "-o", "--output_dir", help="Write one result file per input file."
+    )
+    group.add_argument(
+        "-r", "--result_file", help="Write a single result file for all input files."
+    )
+
+    parser.add_argument(
+        "-j",
+        "--jobs",
+        type=int,
+        default=1,
+        help="Number of worker processes. 0 uses all the available CPUs.",
+    )
+    parser.add_argument(
+        "-p",
+        "--profile",
+        action="store_true",
+        help="Profile each checker and write the profiles as JSON next to the result files.",
+    )
+    parser.add_argument(
+        "-s",
+        "--streaming",
+        action="store_true",
+        help="Read the input files incrementally for the checkers that support it, to bound memory use on very large files.",
+    )
+    parser.add_argument(
+        "--no-cache",
+        dest="no_cache",
+        action="store_true",
+        help="Always run the checks, without reading or writing the result cache.",
+    )
+    parser.add_argument(
+        "--cache_dir",
+        help="Directory of the result cache. Defaults to $QC_OTX_CACHE_DIR or ~/.cache/qc_otx.",
+    )
+
+    return parser.parse_args()
+
+
+def collect_input_files(inputs: List[str]) -> List[str]:
+    """Expand the batch inputs into a list of OTX files.
+
+    Args:
+        inputs (List[str]): file paths, glob patterns or package directories
+
+    Returns:
+        List[str]: the normalized file paths, without duplicates
+    """
+    input_files = []
+    for current_input in inputs:
+        if os.path.isdir(current_input):
+            input_files.extend(sorted(utils.find_otx_files(current_input)))
+        elif glob.has_magic(current_input):
+            input_files.extend(sorted(glob.glob(current_input, recursive=True)))
+        else:
+            input_files.append(current_input)
+
+    return list(dict.fromkeys(os.path.normpath(x) for x in input_files))
+
+
+def create_file_config(
+    input_file: str, config_template: Optional[Configuration] = None
+) -> Configuration:
+    """Create the configuration of a single input file. The template is copied,
+    so that it is not changed and can be shared by all the files.
+    """
+    if config_template is None:
+        config = Configuration()
+        config.register_checker_bundle(checker_bundle_name=constants.BUNDLE_NAME)
+    else:
+        config = deepcopy(config_template)
+    config.set_config_param(name="InputFile", value=input_file)
+
+    return config
+
+
+def get_file_result_path(input_file: str, base_dir: str, output_dir: str) -> str:
+    relative_path = os.path.relpath(os.path.abspath(input_file), base_dir)
+    return os.path.join(output_dir, os.path.splitext(relative_path)[0] + ".xqar")
+
+
+def _create_issue(
+    issue_id: int, issue: models.IssueRecord, input_file_info: etree._Element
+) -> result_models.IssueType:
+    """Build the combined result issue of an issue record, with the locations
+    coalesced by description as Result.add_xml_location does.
+    """
+    locations: Dict[str, result_models.LocationType] = dict()
+    for xpaths, description in issue.xml_locations:
+        if isinstance(xpaths, str):
+            xpaths = [xpaths]
+        xml_locations = [result_models.XMLLocationType(xpath=x) for x in xpaths]
+        if description in locations:
+            locations[description].xml_location.extend(xml_locations)
+        else:
+            locations[description] = result_models.LocationType(
+                xml_location=xml_locations, description=description
+            )
+
+    domain_specific_info = etree.Element(
+        "DomainSpecificInfo", attrib={"name": INPUT_FILE_INFO_NAME}
+    )
+    domain_specific_info.append(deepcopy(input_file_info))
+
+    return result_models.IssueType(
+        issue_id=issue_id,
+        description=issue.description,
+        level=issue.level,
+        rule_uid=issue.rule_uid,
+        locations=list(locations.values()),
+        domain_specific_info=[domain_specific_info],
+    )
+
+
+def merge_results(combined_result: Result, file_reports: List[FileReport]) -> None:
+    """Append the checkers of the file reports to the combined result, in the
+    order of file_reports.
+
+    Checkers are registered once. Issues keep their description, level, rule
+    and locations and record the input file as domain specific information.
+    The status of a checker is the most severe status over all files. The
+    summaries of a checker are grouped, so that files with the same summary
+    are reported once with their count.
+
+    The issues of each checker are collected first and attached to it at once,
+    since Result.register_issue validates all the issues of the checker on
+    every call, which makes merging quadratic in the number of files.
+    """
+    errors = []
+    checkers: Dict[str, models.CheckerRecord] = dict()
+    statuses: Dict[str, StatusType] = dict()
+    issues: Dict[str, List[result_models.IssueType]] = dict()
+    summaries: Dict[str, Dict[str, List[str]]] = dict()
+
+    for file_report in file_reports:
+        input_file = file_report.input_file
+
+        if file_report.error is not None:
+            errors.append(f"Error in {input_file}: {file_report.error}.")
+            continue
+
+        input_file_info = etree.Element(
+            INPUT_FILE_INFO_NAME, attrib={"path": input_file}
+        )
+
+        for checker in file_report.checkers:
+            if checker.checker_id not in checkers:
+                checkers[checker.checker_id] = checker
+                issues[checker.checker_id] = []
+                summaries[checker.checker_id] = dict()
+
+            if checker.status is not None:
+                combined_status = statuses.get(checker.checker_id)
+                if (
+                    combined_status is None
+                    or STATUS_PRECEDENCE[checker.status]
+                    > STATUS_PRECEDENCE[combined_status]
+                ):
+                    statuses[checker.checker_id] = checker.status
+
+            # Issue ids are drawn from the result, as Result.register_issue does
+            issues[checker.checker_id].extend(
+                _create_issue(
+                    combined_result._id_manager.get_next_free_id(),
+                    x,
+                    input_file_info,
+                )
+                for x in checker.issues
+            )
+
+            if checker.summary != "":
+                summaries[checker.checker_id].setdefault(checker.summary, []).append(
+                    input_file
+                )
+
+    if len(errors) > 0:
+        combined_result.add_checker_bundle_summary(
+            constants.BUNDLE_NAME, " ".join(errors)
+        )
+
+    registered_checker_ids = set(combined_result.get_checker_ids(constants.BUNDLE_NAME))
+
+    for checker_id, checker in checkers.items():
+        if checker_id not in registered_checker_ids:
+            combined_result.register_checker(
+                checker_bundle_name=constants.BUNDLE_NAME,
+                checker_id=checker_id,
+                description=checker.description,
+            )
+            for rule_uid in checker.rule_uids:
+                combined_result.register_rule_by_uid(
+                    checker_bundle_name=constants.BUNDLE_NAME,
+                    checker_id=checker_id,
+                    rule_uid=rule_uid,
+                )
+
+        # Status is set first, since a SKIPPED checker cannot hold issues
+        if checker_id in statuses:
+            combined_result.set_checker_status(
+                checker_bundle_name=constants.BUNDLE_NAME,
+                checker_id=checker_id,
+                status=statuses[checker_id],
+            )
+
+        if len(issues[checker_id]) > 0:
+            combined_checker = combined_result.get_checker_result(
+                constants.BUNDLE_NAME, checker_id
+            )
+            combined_checker.issues.extend(issues[checker_id])
+            result_models.CheckerType.model_validate(combined_checker)
+
+        grouped_summaries = [
+            (
+                f"{files[0]}: {summary}"
+                if len(files) == 1
+                else f"{len(files)} files: {summary}"
+            )
+            for summary, files in summaries[checker_id].items()
+        ]
+        if len(grouped_summaries) > 0:
+            combined_result.add_checker_summary(
+                constants.BUNDLE_NAME, checker_id, " ".join(grouped_summaries)
+            )
+
+
+def check_file(
+    input_file: str,
+    config_template: Optional[Configuration],
+    cache: models.CheckerCache,
+    result_path: Optional[str] = None,
+    profile: bool = False,
+    result_cache_dir: Optional[str] = None,
+    use_streaming: bool = False,
+) -> FileReport:
+    """Run all the checks on a single input file.
+
+    If result_path is given, the result (and the profile, if requested) is
+    written next to it and the returned report does not carry the checkers.
+    Any exception is reported in the returned report instead of being raised.
+    Results are reused from and stored to result_cache_dir, if given.
+    """
+    logging.info(f"Checking {input_file}")
+
+    try:
+        config = create_file_config(input_file, config_template)
+        file_result = main.create_result()
+        profiles = dict() if profile else None
+        main.run_checks(
+            config,
+            file_result,
+            cache,
+            profiles=profiles,
+            result_cache_dir=result_cache_dir,
+            use_streaming=use_streaming,
+        )
+
+        if result_path is None:
+            return FileReport(
+                input_file,
+                utils.serialize_result(file_result),
+                profiles=main.sort_checker_profiles(profiles) if profile else None,
+            )
+
+        file_result.copy_param_from_config(config)
+        os.makedirs(os.path.dirname(result_path), exist_ok=True)
+        file_result.write_to_file(result_path, generate_summary=True)
+
+        if profile:
+            main.write_profile(
+                main.get_profile_file_path(result_path), input_file, profiles
+            )
+
+        return FileReport(input_file)
+    except Exception as e:
+        logging.exception(f"An error occurred while checking {input_file}.")
+        return FileReport(input_file, error=str(e))
+
+
+def _init_worker(
+    config_template: Optional[Configuration],
+    profile: bool,
+    result_cache_dir: Optional[str],
+    use_streaming: bool,
+) -> None:
+    """Initialize a worker process. The checker modules are imported lazily by the
+    registry, so they are loaded here, before the first file is submitted, rather
+    than while checking it.
+    """
+    global _worker_config_template, _worker_cache, _worker_profile
+    global _worker_result_cache_dir, _worker_use_streaming
+
+    _worker_config_template = config_template
+    _worker_cache = models.CheckerCache()
+    _worker_profile = profile
+    _worker_result_cache_dir = result_cache_dir
+    _worker_use_streaming = use_streaming
+
+    for checker in registry.get_checkers():
+        checker.load()
+
+    if profile and not tracemalloc.is_tracing():
+        tracemalloc.start()
+
+
+def _check_file_in_worker(input_file: str, result_path: Optional[str]) -> FileReport:
+    return check_file(
+        input_file,
+        _worker_config_template,
+        _worker_cache,
+        result_path,
+        _worker_profile,
+        _worker_result_cache_dir,
+        _worker_use_streaming,
+    )
+
+
+def _get_file_size(input_file: str) -> int:
+    try:
+        return os.path.getsize(input_file)
+    except OSError:
+        return 0
+
+
+def _check_file_in_new_process(
+    input_file: str,
+    result_path: Optional[str],
+    initargs: tuple,
+) -> FileReport:
+    """Check a single file alone in a fresh worker process, so that a crash of
+    the process only fails that file.
+    """
+    with ProcessPoolExecutor(
+        max_workers=1, initializer=_init_worker, initargs=initargs
+    ) as executor:
+        future = executor.submit(_check_file_in_worker, input_file, result_path)
+        try:
+            return future.result()
+        except BrokenProcessPool:
+            logging.error(f"The worker process crashed while checking {input_file}.")
+            return FileReport(input_file, error="Worker process crashed")
+
+
+def run_parallel(
+    input_files: List[str],
+    result_paths: Dict[str, Optional[str]],
+    config_template: Optional[Configuration],
+    jobs: int,
+    profile: bool = False,
+    result_cache_dir: Optional[str] = None,
+    use_streaming: bool = False,
+) -> Dict[str, FileReport]:
+    """Check the input files in a pool of worker processes.
+
+    Files are submitted largest first to reduce the total run time, and only
+    when a worker is free, so that the files in flight are known when a worker
+    process dies. Those files are then checked again one by one in a fresh
+    process, so that a crash only fails the file that caused it, and the files
+    not submitted yet continue in a new pool of jobs worker processes.
+    """
+    file_reports = dict()
+    pending_files = collections.deque(
+        sorted(input_files, key=_get_file_size, reverse=True)
+    )
+    initargs = (config_template, profile, result_cache_dir, use_streaming)
+
+    while len(pending_files) > 0:
+        broken_files = []
+
+        with ProcessPoolExecutor(
+            max_workers=jobs, initializer=_init_worker, initargs=initargs
+        ) as executor:
+            running = dict()
+            while len(broken_files) == 0 and (
+                len(pending_files) > 0 or len(running) > 0
+            ):
+                while len(pending_files) > 0 and len(running) < jobs:
+                    input_file = pending_files.popleft()
+                    future = executor.submit(
+                        _check_file_in_worker, input_file, result_paths[input_file]
+                    )
+                    running[future] = input_file
+
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    input_file = running.pop(future)
+                    try:
+                        file_reports[input_file] = future.result()
+                    except BrokenProcessPool:
+                        broken_files.append(input_file)
+
+            if len(broken_files) > 0:
+                broken_files.extend(running.values())
+
+        for input_file in broken_files:
+            file_reports[input_file] = _check_file_in_new_process(
+                input_file, result_paths[input_file], initargs
+            )
+
+    return file_reports
+
+
+def run_batch(
+    input_files: List[str],
+    config_template: Optional[Configuration] = None,
+    output_dir: Optional[str] = None,
+    result_file: Optional[str] = None,
+    cache: Optional[models.CheckerCache] = None,
+    jobs: int = 1,
+    profile: bool = False,
+    result_cache_dir: Optional[str] = None,
+    use_streaming: bool = False,
+) -> Optional[Result]:
+    """Run all the checks on each input file.
+
+    With jobs equal to 1 the files are checked in the current process, otherwise
+    in a pool of jobs worker processes. Imported documents and package scans are
+    cached and shared between the input files checked by the same process.
+    Either one result file per input file is written to output_dir, or a single
+    combined result is written to result_file. The combined result is merged in
+    the order of input_files, so it does not depend on the scheduling. With
+    profile, the checker profiles are written as JSON next to the result files.
+    With result_cache_dir, unchanged files reuse their result from the cache.
+    With use_streaming, the checkers that support it read the files incrementally.
+
+    Returns:
+        Optional[Result]: the combined result, None when writing one result per file
+    """
+    if cache is None:
+        cache = models.CheckerCache()
+
+    if jobs <= 0:
+        jobs = os.cpu_count() or 1
+
+    base_dir = ""
+    if len(input_files) > 0:
+        base_dir = os.path.commonpath(
+            [os.path.dirname(os.path.abspath(x)) for x in input_files]
+        )
+
+    result_paths = {
+        x: (
+            get_file_result_path(x, base_dir, output_dir)
+            if result_file is None
+            else None
+        )
+        for x in input_files
+    }
+
+    start_time = time.perf_counter()
+
+    if jobs == 1 or len(input_files) <= 1:
+        file_reports = {
+            x: check_file(
+                x,
+                config_template,
+                cache,
+                result_paths[x],
+                profile,
+                result_cache_dir,
+                use_streaming,
+            )
+            for x in input_files
+        }
+    else:
+        file_reports = run_parallel(
+            input_files,
+            result_paths,
+            config_template,
+            jobs,
+            profile,
+            result_cache_dir,
+            use_streaming,
+        )
+
+    elapsed_time = time.perf_counter() - start_time
+    throughput = len(input_files) / elapsed_time if elapsed_time > 0 else 0.0
+    failed_files = sum(1 for x in file_reports.values() if x.error is not None)
+    logging.info(
+        f"Checked {len(input_files)} file(s) in {elapsed_time:.2f} s "
+        f"({throughput:.2f} files/s) with {jobs} job(s), {failed_files} file(s) failed."
+    )
+
+    if result_file is None:
+        return None
+
+    combined_result = main.create_result()
+    merge_results(combined_result, [file_reports[x] for x in input_files])
+
+    combined_result.write_to_file(result_file, generate_summary=True)
+
+    if profile:
+        write_batch_profile(
+            main.get_profile_file_path(result_file),
+            [file_reports[x] for x in input_files],
+        )
+
+    return combined_result
+
+
+def write_batch_profile(profile_file_path: str, file_reports: List[FileReport]) -> None:
+    profile = {
+        "bundle_version": constants.BUNDLE_VERSION,
+        "files": [
+            {
+                "input_file": x.input_file,
+                "checkers": [dataclasses.asdict(y) for y in x.profiles],
+            }
+            for x in file_reports
+            if x.profiles is not None
+        ],
+    }
+
+    with open(profile_file_path, "w") as profile_file:
+        json.dump(profile, profile_file, indent=2)
+
+
+def main_batch():
+    args = args_entrypoint()
+
+    logging.info("Initializing batch checks")
+
+    config_template = None
+    if args.config_path is not None:
+        config_template = Configuration()
+        config_template.load_from_file(xml_file_path=args.config_path)
+
+    input_files = collect_input_files(args.inputs)
+
+    if args.profile:
+        tracemalloc.start()
+
+    result_cache_dir = None
+    if not args.no_cache:
+        result_cache_dir = args.cache_dir or result_cache.get_default_cache_dir()
+
+    run_batch(
+        input_files,
+        config_template=config_template,
+        output_dir=args.output_dir,
+        result_file=args.result_file,
+        jobs=args.jobs,
+        profile=args.profile,
+        result_cache_dir=result_cache_dir,
+        use_streaming=args.streaming,
+    )
+
+    logging.info("Done")
+
+
+if __name__ == "__main__":
+    main_batch()
@@ -0,0 +1,299 @@
+# SPDX-License-Identifier: MPL-2.0
+# Copyright 2024, ASAM e.V.
+# This Source Code Form is subject to the terms of the Mozilla
+# Public License, v. 2.0. If a copy of the MPL was not distributed
+# with this file, You can obtain one at https://mozilla.org/MPL/2.0/.
+
+import dataclasses
+import os
+from dataclasses import dataclass
+from typing import List, TextIO
+
+PACKAGE_NAME = "Bench"
+DOCUMENT_NAME = "BenchmarkDocument"
+DOCUMENT_VERSION = "1.0.0"
+
+# The elements are not in a namespace, like in the data type examples. The otx
+# prefix is declared for the checkers that look up OTX elements by prefix.
+NAMESPACE_DECLARATIONS = (
+    'xmlns:otx="http://iso.org/OTX/1.0.0" '
+    'xmlns:xsi="http://www.w3.org/2001/XMLSchema-instance" '
+    'xmlns:dataType="http://iso.org/OTX/1.0.0/DataType" '
+    'xmlns:smp="http://iso.org/OTX/1.0.0/StateMachineProcedure" '
+    'xmlns:event="http://iso.org/OTX/1.0.0/Event" '
+    'xmlns:zip="http://iso.org/OTX/1.0.0/ZipHandling"'
+)
+
+
+@dataclass
+class DocumentShape:
+    """Element counts of a synthetic OTX document.
+
+    The counts of the top level items grow with DocumentShape.scale, while the
+    counts of the nested items stay fixed, so that the size of the document is
+    proportional to the scale factor.
+
+    If issue_interval is above 0, every issue_interval-th constant, structure
+    access, ZipFile list literal and import violates its rule. Repeated accesses
+    to the same variable are always reported by the unique node names check.
+    """
+
+    procedures: int = 10
+    named_nodes_per_procedure: int = 10
+    signatures: int = 4
+    elements_per_signature: int = 4
+    variables_per_procedure: int = 2
+    constants: int = 10
+    imports: int = 2
+    state_machines: int = 2
+    states_per_machine: int = 5
+    transitions_per_state: int = 2
+    zip_lists: int = 4
+    issue_interval: int = 0
+
+    def scale(self, factor: int) -> "DocumentShape":
+        return dataclasses.replace(
+            self,
+            procedures=self.procedures * factor,
+            signatures=self.signatures * factor,
+            constants=self.constants * factor,
+            imports=self.imports * factor,
+            state_machines=self.state_machines * factor,
+            zip_lists=self.zip_lists * factor,
+        )
+
+
+def _has_issue(shape: DocumentShape, index: int) -> bool:
+    return shape.issue_interval > 0 and index % shape.issue_interval == 0
+
+
+def _write_header(file: TextIO, name: str) -> None:
+    file.write('<?xml version="1.0" encoding="utf-8"?>\n')
+    file.write(
+        f'<otx {NAMESPACE_DECLARATIONS} name="{name}" id="{name}_id" '
+        f'package="{PACKAGE_NAME}" version="{DOCUMENT_VERSION}" '
+        'timestamp="2024-01-01T00:00:00">\n'
+    )
+
+
+def _write_imported_document(path: str, name: str) -> None:
+    with open(path, "w", encoding="utf-8") as file:
+        _write_header(file, name)
+        file.write("  <procedures>\n")
+        file.write(
+            f'    <procedure name="main" id="{name}_main" visibility="PUBLIC">\n'
+            "      <realisation><flow/></realisation>\n"
+            "    </procedure>\n"
+        )
+        file.write("  </procedures>\n</otx>\n")
+
+
+def _write_signatures(file: TextIO, shape: DocumentShape) -> None:
+    file.write("  <signatures>\n")
+    for i in range(shape.signatures):
+        file.write(
+            f'    <signature name="Structure{i}" id="Signature{i}_id">\n'
+            '      <realisation xsi:type="dataType:StructureSignature">\n'
+            "        <dataType:elements>\n"
+        )
+        for j in range(shape.elements_per_signature):
+            file.write(
+                f'          <dataType:element name="Element{j}" id="Signature{i}_Element{j}_id">\n'
+                '            <realisation><dataType xsi:type="String"/></realisation>\n'
+                "          </dataType:element>\n"
+            )
+        file.write(
+            "        </dataType:elements>\n      </realisation>\n    </signature>\n"
+        )
+    file.write("  </signatures>\n")
+
+
+def _write_constants(file: TextIO, shape: DocumentShape) -> None:
+    file.write("  <declarations>\n")
+    for i in range(shape.constants):
+        file.write(f'    <constant name="Constant{i}" id="Constant{i}_id">\n')
+        if _has_issue(shape, i):
+            file.write(
+                '      <realisation><dataType xsi:type="Integer"/></realisation>\n'
+            )
+        else:
+            file.write(
+                '      <realisation><dataType xsi:type="Integer"><init value="0"/></dataType></realisation>\n'
+            )
+        file.write("    </constant>\n")
+    file.write("  </declarations>\n")
+
+
+def _write_procedure(
+    file: TextIO,
+    shape: DocumentShape,
+    procedure_index: int,
+    import_prefixes: List[str],
+    zip_list_indexes: List[int],
+) -> None:
+    name = "main" if procedure_index == 0 else f"Procedure{procedure_index}"
+    visibility = "PUBLIC" if procedure_index == 0 else "PRIVATE"
+    prefix = f"Procedure{procedure_index}_"
+    file.write(
+        f'    <procedure name="{name}" id="{prefix}id" visibility="{visibility}">\n'
+        f"      <specification>Synthetic procedure {procedure_index}</specification>\n"
+        "      <realisation>\n"
+    )
+
+    if shape.signatures > 0 and shape.variables_per_procedure > 0:
+        file.write("        <declarations>\n")
+        for i in range(shape.variables_per_procedure):
+            file.write(
+                f'          <variable name="Structure{i}Variable" id="{prefix}Variable{i}_id">\n'
+                f'            <realisation><dataType xsi:type="dataType:Structure" structureType="Structure{i % shape.signatures}"/></realisation>\n'
+                "          </variable>\n"
+            )
+        file.write("        </declarations>\n")
+
+    file.write("        <flow>\n")
+    for i in range(shape.named_nodes_per_procedure):
+        file.write(f'          <action name="Action{i}" id="{prefix}Action{i}_id">\n')
+        if shape.signatures > 0 and shape.variables_per_procedure > 0:
+            access_index = procedure_index * shape.named_nodes_per_procedure + i
+            element_name = f"Element{i % shape.elements_per_signature}"
+            if _has_issue(shape, access_index):
+                element_name = "MissingElement"
+            file.write(
+                '            <realisation xsi:type="Assignment">\n'
+                f'              <result xsi:type="StringVariable" name="Structure{i % shape.variables_per_procedure}Variable">\n'
+                f'                <path><stepByName xsi:type="StringLiteral" value="{element_name}"/></path>\n'
+                "              </result>\n"
+                '              <term xsi:type="StringLiteral" value="Text"/>\n'
+                "            </realisation>\n"
+            )
+        else:
+            file.write('            <realisation xsi:type="EmptyAction"/>\n')
+        file.write("          </action>\n")
+
+    for import_prefix in import_prefixes:
+        file.write(
+            f'          <action name="Call_{import_prefix}" id="{prefix}Call_{import_prefix}_id">\n'
+            f'            <realisation xsi:type="ProcedureCall" procedure="{import_prefix}:main"/>\n'
+            "          </action>\n"
+        )
+
+    for i in zip_list_indexes:
+        item_type = "Integer" if _has_issue(shape, i) else "String"
+        file.write(
+            f'          <action name="Zip{i}" id="{prefix}Zip{i}_id">\n'
+            '            <realisation xsi:type="zip:ZipFile">\n'
+            f'              <zip:source xsi:type="StringLiteral" value="source{i}"/>\n'
+            f'              <zip:target xsi:type="StringLiteral" value="target{i}.zip"/>\n'
+            '              <zip:extensions xsi:type="ListLiteral">\n'
+            f'                <itemType xsi:type="{item_type}"/>\n'
+            "                <items>\n"
+            '                  <item xsi:type="StringLiteral" value="log"/>\n'
+            '                  <item xsi:type="StringLiteral" value="txt"/>\n'
+            "                </items>\n"
+            "              </zip:extensions>\n"
+            "            </realisation>\n"
+            "          </action>\n"
+        )
+
+    file.write("        </flow>\n      </realisation>\n    </procedure>\n")
+
+
+def _write_state_machine(file: TextIO, shape: DocumentShape, index: int) -> None:
+    prefix = f"StateMachine{index}_"
+    state_count = max(shape.states_per_machine, 2)
+    completed_state = state_count - 1
+    file.write(
+        f'    <procedure xsi:type="smp:StateMachineProcedure" name="StateMachine{index}" id="{prefix}id" visibility="PRIVATE">\n'
+        f"      <specification>Synthetic state machine {index}</specification>\n"
+        '      <smp:realisation initialState="State0" '
+        f'completedState="State{completed_state}">\n'
+        "        <smp:states>\n"
+    )
+    for i in range(state_count):
+        file.write(f'          <smp:state name="State{i}" id="{prefix}State{i}_id">\n')
+        if i != completed_state:
+            file.write("            <smp:triggers>\n")
+            for j in range(shape.transitions_per_state):
+                file.write(
+                    f'              <smp:trigger name="Trigger{j}" id="{prefix}State{i}_Trigger{j}_id">\n'
+                    '                <smp:source xsi:type="event:TimerExpiredEventSource">\n'
+                    '                  <event:timeout xsi:type="IntegerLiteral" value="1000"/>\n'
+                    "                </smp:source>\n"
+                    "              </smp:trigger>\n"
+                )
+            file.write("            </smp:triggers>\n            <smp:transitions>\n")
+            for j in range(shape.transitions_per_state):
+                # The first transition moves forward, so that the completed state
+                # is reachable from every state
+                target = i + 1 if j == 0 else (i + j) % completed_state
+                file.write(
+                    f'              <smp:transition name="Transition{j}" id="{prefix}State{i}_Transition{j}_id" target="State{target}">\n'
+                    f'                <smp:triggerRefs><smp:triggerRef target="Trigger{j}"/></smp:triggerRefs>\n'
+                    "              </smp:transition>\n"
+                )
+            file.write("            </smp:transitions>\n")
+        file.write("          </smp:state>\n")
+    file.write("        </smp:states>\n      </smp:realisation>\n    </procedure>\n")
+
+
+def generate_otx_document(
+    output_dir: str, shape: DocumentShape, name: str = DOCUMENT_NAME
+) -> str:
+    """Write a synthetic OTX document and the documents it imports.
+
+    The documents are written to the package folder output_dir/Bench, so that
+    the package and import checks find them like in a real package.
+
+    Args:
+        output_dir (str): the folder to write the package folder to
+        shape (DocumentShape): the element counts of the document
+        name (str): the document name, also used as file name
+
+    Returns:
+        str: the path of the generated document
+    """
+    package_dir = os.path.join(output_dir, PACKAGE_NAME)
+    os.makedirs(package_dir, exist_ok=True)
+
+    import_prefixes = []
+    for i in range(shape.imports):
+        imported_name = f"{name}Import{i}"
+        _write_imported_document(
+            os.path.join(package_dir, imported_name + ".otx"), imported_name
+        )
+        import_prefixes.append(f"imp{i}")
+
+    input_file = os.path.join(package_dir, name + ".otx")
+    with open(input_file, "w", encoding="utf-8") as file:
+        _write_header(file, name)
+
+        if shape.imports > 0:
+            file.write("  <imports>\n")
+            for i, import_prefix in enumerate(import_prefixes):
+                file.write(
+                    f'    <import package="{PACKAGE_NAME}" document="{name}Import{i}" prefix="{import_prefix}"/>\n'
+                )
+            file.write("  </imports>\n")
+
+        _write_constants(file, shape)
+        _write_signatures(file, shape)
+
+        file.write("  <procedures>\n")
+        procedure_count = max(shape.procedures, 1)
+        for i in range(procedure_count):
+            # Unused imports are left without a procedure call
+            used_prefixes = [
+                x
+                for j, x in enumerate(import_prefixes)
+                if j % procedure_count == i and not _has_issue(shape, j)
+            ]
+            zip_list_indexes = [
+                x for x in range(shape.zip_lists) if x % procedure_count == i
+            ]
+            _write_procedure(file, shape, i, used_prefixes, zip_list_indexes)
+
+        for i in range(shape.state_machines):
+            _write_state_machine(file, shape, i)
+        file.write("  </procedures>\n</otx>\n")
+
+    return input_file
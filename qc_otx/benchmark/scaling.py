@@ -0,0 +1,384 @@
+# SPDX-License-Identifier: MPL-2.0
+# Copyright 2024, ASAM e.V.
+# This Source Code Form is subject to the terms of the Mozilla
+# Public License, v. 2.0. If a copy of the MPL was not distributed
+# with this file, You can obtain one at https://mozilla.org/MPL/2.0/.
+
+import argparse
+import dataclasses
+import json
+import logging
+import math
+import os
+import tempfile
+import time
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+
+from lxml import etree
+from qc_baselib import Configuration
+from qc_otx import constants, main
+from qc_otx.benchmark import generator
+from qc_otx.checks import registry, utils, xpaths
+
+# Label of the end-to-end timing, reported next to the checker ids
+RUN_CHECKS_LABEL = "run_checks"
+
+DEFAULT_SCALES = [1, 4, 16, 64]
+
+# Expressions of the checkers timed by measure_xpaths
+XPATH_EXPRESSIONS = [
+    xpaths.SMP_REALISATION,
+    xpaths.OTX_REALISATION,
+    xpaths.LIST_LITERALS,
+    xpaths.TYPED_DESCENDANTS,
+    xpaths.CONSTANT_INIT,
+    xpaths.NAMED_DESCENDANTS,
+    xpaths.STRUCTURE_ELEMENTS,
+    xpaths.STRUCTURE_TYPES,
+]
+
+
+@dataclass
+class ScalingSample:
+    """Timings of one generated document. wall_times holds the wall time of
+    each checker and of the whole run_checks call, in seconds.
+    """
+
+    scale: int
+    input_size: int
+    wall_times: Dict[str, float]
+
+
+@dataclass
+class RuleScaling:
+    """Wall times of a checker at each scale and the exponent k of the fit
+    wall_time ~ input_size ** k. A linear checker has an exponent close to 1.
+    """
+
+    checker_id: str
+    rule_uid: Optional[str]
+    wall_times: List[float]
+    exponent: Optional[float]
+
+
+@dataclass
+class XPathTiming:
+    """Time per context element of an expression, in seconds, evaluated with
+    element.xpath, which compiles it on every call, and with the expression
+    returned by xpaths.get_xpath.
+    """
+
+    expression: str
+    element_count: int
+    element_xpath_time: float
+    compiled_xpath_time: float
+
+
+def fit_scaling_exponent(sizes: List[float], times: List[float]) -> Optional[float]:
+    """Least squares slope of log(times) over log(sizes). None if the samples
+    cannot be fitted, e.g. a single size or a zero time.
+    """
+    points = [
+        (math.log(x), math.log(y)) for x, y in zip(sizes, times) if x > 0 and y > 0
+    ]
+    if len(points) < 2:
+        return None
+
+    mean_x = sum(x for x, _ in points) / len(points)
+    mean_y = sum(y for _, y in points) / len(points)
+    variance = sum((x - mean_x) ** 2 for x, _ in points)
+    if variance == 0:
+        return None
+
+    covariance = sum((x - mean_x) * (y - mean_y) for x, y in points)
+    return covariance / variance
+
+
+def measure_document(input_file: str, repeat: int = 1) -> Dict[str, float]:
+    """Run the checks on input_file and return the minimum wall time of each
+    checker and of run_checks over repeat runs. The checkers are timed with the
+    checker profiles, the end-to-end time on separate runs without profiling.
+    """
+    wall_times = dict()
+
+    for _ in range(repeat):
+        config = Configuration()
+        config.set_config_param(name="InputFile", value=input_file)
+        config.register_checker_bundle(checker_bundle_name=constants.BUNDLE_NAME)
+
+        profiles = dict()
+        main.run_checks(config, main.create_result(), profiles=profiles)
+        for checker_id, profile in profiles.items():
+            wall_times[checker_id] = min(
+                wall_times.get(checker_id, math.inf), profile.wall_time
+            )
+
+        start_time = time.perf_counter()
+        main.run_checks(config, main.create_result())
+        wall_times[RUN_CHECKS_LABEL] = min(
+            wall_times.get(RUN_CHECKS_LABEL, math.inf),
+            time.perf_counter() - start_time,
+        )
+
+    return wall_times
+
+
+def run_benchmark(
+    output_dir: str,
+    shape: generator.DocumentShape,
+    scales: List[int],
+    repeat: int = 1,
+) -> List[ScalingSample]:
+    samples = []
+    for scale in scales:
+        input_file = generator.generate_otx_document(
+            os.path.join(output_dir, f"scale_{scale}"), shape.scale(scale)
+        )
+        logging.info(f"Measuring scale {scale} ({input_file})")
+        samples.append(
+            ScalingSample(
+                scale=scale,
+                input_size=os.path.getsize(input_file),
+                wall_times=measure_document(input_file, repeat),
+            )
+        )
+
+    return samples
+
+
+def measure_xpaths(input_file: str, repeat: int = 1) -> List[XPathTiming]:
+    """Evaluate each expression of XPATH_EXPRESSIONS on every element of
+    input_file and return the minimum time per element over repeat runs. The
+    compiled expression is looked up with xpaths.get_xpath for each element, as
+    the checkers do, so the lookup is part of the measured time.
+    """
+    tree = etree.parse(input_file)
+    nsmap = utils.get_namespace_map(tree)
+    elements = list(tree.getroot().iter(etree.Element))
+
+    timings = []
+    for expression in XPATH_EXPRESSIONS:
+        element_xpath_time = math.inf
+        compiled_xpath_time = math.inf
+        for _ in range(repeat):
+            start_time = time.perf_counter()
+            for element in elements:
+                element.xpath(expression, namespaces=nsmap)
+            element_xpath_time = min(
+                element_xpath_time, time.perf_counter() - start_time
+            )
+
+            start_time = time.perf_counter()
+            for element in elements:
+                xpaths.get_xpath(expression, nsmap)(element)
+            compiled_xpath_time = min(
+                compiled_xpath_time, time.perf_counter() - start_time
+            )
+
+        timings.append(
+            XPathTiming(
+                expression=expression,
+                element_count=len(elements),
+                element_xpath_time=element_xpath_time / len(elements),
+                compiled_xpath_time=compiled_xpath_time / len(elements),
+            )
+        )
+
+    return timings
+
+
+def run_xpath_benchmark(
+    output_dir: str,
+    shape: generator.DocumentShape,
+    scale: int,
+    repeat: int = 1,
+) -> List[XPathTiming]:
+    input_file = generator.generate_otx_document(
+        os.path.join(output_dir, f"xpaths_{scale}"), shape.scale(scale)
+    )
+    logging.info(f"Measuring the XPath expressions at scale {scale} ({input_file})")
+    return measure_xpaths(input_file, repeat)
+
+
+def get_rule_scalings(samples: List[ScalingSample]) -> List[RuleScaling]:
+    """Fit the scaling exponent of each checker and of run_checks, in rule order."""
+    sizes = [x.input_size for x in samples]
+    checkers = registry.get_checkers()
+    rule_uids = {x.CHECKER_ID: x.RULE_UID for x in checkers}
+    labels = [x.CHECKER_ID for x in checkers] + [RUN_CHECKS_LABEL]
+
+    rule_scalings = []
+    for label in labels:
+        if any(label not in x.wall_times for x in samples):
+            continue
+        wall_times = [x.wall_times[label] for x in samples]
+        rule_scalings.append(
+            RuleScaling(
+                checker_id=label,
+                rule_uid=rule_uids.get(label),
+                wall_times=wall_times,
+                exponent=fit_scaling_exponent(sizes, wall_times),
+            )
+        )
+
+    return rule_scalings
+
+
+def format_rule_scalings(
+    samples: List[ScalingSample], rule_scalings: List[RuleScaling]
+) -> str:
+    header = ["checker"] + [f"x{x.scale} (s)" for x in samples] + ["exponent"]
+    rows = [header]
+    for rule_scaling in rule_scalings:
+        exponent = rule_scaling.exponent
+        rows.append(
+            [rule_scaling.checker_id]
+            + [f"{x:.4f}" for x in rule_scaling.wall_times]
+            + ["-" if exponent is None else f"{exponent:.2f}"]
+        )
+
+    widths = [max(len(row[i]) for row in rows) for i in range(len(header))]
+    lines = [
+        f"Input sizes: {', '.join(f'{x.input_size} B' for x in samples)}",
+    ]
+    for row in rows:
+        lines.append(
+            "  ".join(
+                cell.ljust(width) if i == 0 else cell.rjust(width)
+                for i, (cell, width) in enumerate(zip(row, widths))
+            )
+        )
+    return "\n".join(lines)
+
+
+def format_xpath_timings(xpath_timings: List[XPathTiming]) -> str:
+    header = ["expression", "element.xpath (us)", "get_xpath (us)", "saving"]
+    rows = [header]
+    for timing in xpath_timings:
+        saving = 1 - timing.compiled_xpath_time / timing.element_xpath_time
+        rows.append(
+            [
+                timing.expression,
+                f"{timing.element_xpath_time * 1e6:.2f}",
+                f"{timing.compiled_xpath_time * 1e6:.2f}",
+                f"{saving:.0%}",
+            ]
+        )
+
+    widths = [max(len(row[i]) for row in rows) for i in range(len(header))]
+    lines = [
+        (
+            f"Time per element over {xpath_timings[0].element_count} elements"
+            if len(xpath_timings) > 0
+            else "Time per element"
+        ),
+    ]
+    for row in rows:
+        lines.append(
+            "  ".join(
+                cell.ljust(width) if i == 0 else cell.rjust(width)
+                for i, (cell, width) in enumerate(zip(row, widths))
+            )
+        )
+    return "\n".join(lines)
+
+
+def args_entrypoint() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        prog="QC OTX Scaling Benchmark",
+        description="Time the OTX checkers on synthetic documents of growing size and fit the scaling exponent of each rule.",
+    )
+
+    parser.add_argument(
+        "--scales",
+        nargs="+",
+        type=int,
+        default=DEFAULT_SCALES,
+        help="Scale factors of the generated documents. The document size is proportional to the scale factor.",
+    )
+    parser.add_argument(
+        "--repeat",
+        type=int,
+        default=3,
+        help="Number of runs per document. The minimum wall time is reported.",
+    )
+    parser.add_argument(
+        "--issue_interval",
+        type=int,
+        default=10,
+        help="Make every n-th generated item violate its rule, 0 for a document without issues.",
+    )
+    parser.add_argument(
+        "--output_dir",
+        help="Folder to keep the generated documents in. A temporary folder is used by default.",
+    )
+    parser.add_argument(
+        "-o",
+        "--output",
+        help="Also write the timings and scaling exponents to a JSON file.",
+    )
+    parser.add_argument(
+        "--xpaths",
+        action="store_true",
+        help="Also time the XPath expressions of the checkers per element on the largest document, compiled on each call and compiled once.",
+    )
+
+    for field in dataclasses.fields(generator.DocumentShape):
+        if field.name == "issue_interval":
+            continue
+        parser.add_argument(
+            "--" + field.name,
+            type=int,
+            default=field.default,
+            help=f"Base count of {field.name.replace('_', ' ')} (default {field.default}).",
+        )
+
+    return parser.parse_args()
+
+
+def main_benchmark():
+    args = args_entrypoint()
+    logging.getLogger().setLevel(logging.WARNING)
+
+    shape = generator.DocumentShape(
+        **{
+            x.name: getattr(args, x.name)
+            for x in dataclasses.fields(generator.DocumentShape)
+        }
+    )
+
+    def run(output_dir: str):
+        samples = run_benchmark(output_dir, shape, args.scales, args.repeat)
+        xpath_timings = None
+        if args.xpaths:
+            xpath_timings = run_xpath_benchmark(
+                output_dir, shape, max(args.scales), args.repeat
+            )
+        return samples, xpath_timings
+
+    if args.output_dir is not None:
+        samples, xpath_timings = run(args.output_dir)
+    else:
+        with tempfile.TemporaryDirectory() as output_dir:
+            samples, xpath_timings = run(output_dir)
+
+    rule_scalings = get_rule_scalings(samples)
+    print(format_rule_scalings(samples, rule_scalings))
+    if xpath_timings is not None:
+        print(format_xpath_timings(xpath_timings))
+
+    if args.output is not None:
+        output = {
+            "shape": dataclasses.asdict(shape),
+            "samples": [dataclasses.asdict(x) for x in samples],
+            "rules": [dataclasses.asdict(x) for x in rule_scalings],
+        }
+        if xpath_timings is not None:
+            output["xpaths"] = [dataclasses.asdict(x) for x in xpath_timings]
+        with open(args.output, "w") as output_file:
+            json.dump(output, output_file, indent=2)
+
+
+if __name__ == "__main__":
+    main_benchmark()
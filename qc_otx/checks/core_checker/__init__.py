@@ -4,17 +4,25 @@
 # Public License, v. 2.0. If a copy of the MPL was not distributed
 # with this file, You can obtain one at https://mozilla.org/MPL/2.0/.
 
-from . import document_name_matches_filename as document_name_matches_filename
-from . import document_name_package_uniqueness as document_name_package_uniqueness
-from . import no_unused_imports as no_unused_imports
-from . import no_dead_import_links as no_dead_import_links
-from . import (
-    have_specification_if_no_realisation_exists as have_specification_if_no_realisation_exists,
-)
-from . import public_main_procedure as public_main_procedure
-from . import mandatory_constant_initialization as mandatory_constant_initialization
-from . import unique_node_names as unique_node_names
-from . import no_use_of_undefined_import_prefixes as no_use_of_undefined_import_prefixes
-from . import (
-    match_of_imported_document_data_model_version as match_of_imported_document_data_model_version,
-)
+import importlib
+
+# The rule modules are imported on first access as attributes of the package,
+# so that importing the package does not import all of its rules
+RULE_MODULES = [
+    "document_name_matches_filename",
+    "document_name_package_uniqueness",
+    "no_unused_imports",
+    "no_dead_import_links",
+    "have_specification_if_no_realisation_exists",
+    "public_main_procedure",
+    "mandatory_constant_initialization",
+    "unique_node_names",
+    "no_use_of_undefined_import_prefixes",
+    "match_of_imported_document_data_model_version",
+]
+
+
+def __getattr__(name: str):
+    if name in RULE_MODULES:
+        return importlib.import_module(f"{__name__}.{name}")
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
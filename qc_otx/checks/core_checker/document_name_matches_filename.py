@@ -7,12 +7,15 @@
 import logging
 
 
+from lxml import etree
+
 from qc_baselib import IssueSeverity, StatusType
 
 from qc_otx import constants
-from qc_otx.checks import models
+from qc_otx.checks import models, streaming
 
 from pathlib import Path
+from typing import Optional
 
 CHECKER_ID = "check_asam_otx_core_chk_001_document_name_matches_filename"
 CHECKER_DESCRIPTION = "For OTX documents stored in a file system, the attribute name of the <otx> root element should match the filename of the containing file (without the extension '.otx')."
@@ -20,22 +23,10 @@ CHECKER_PRECONDITIONS = set()
 RULE_UID = "asam.net:otx:1.0.0:core.chk_001.document_name_matches_filename"
 
 
-def check_rule(checker_data: models.CheckerData) -> None:
-    """
-    Implements core checker rule Core_Chk001
-    Criterion:
-    For OTX documents stored in a file system, the attribute name of the <otx>
-    root element should match the filename of the containing file
-    (without the extension “.otx”).
-    Severity:
-    Warning
-    """
-    logging.info("Executing document_name_matches_filename check")
-
-    root = checker_data.input_file_xml_root
-    root_attrib = root.getroot().attrib
-
-    if "name" not in root_attrib:
+def _check_document_name(
+    checker_data: models.CheckerData, document_name: Optional[str]
+) -> None:
+    if document_name is None:
         checker_data.result.set_checker_status(
             checker_bundle_name=constants.BUNDLE_NAME,
             checker_id=CHECKER_ID,
@@ -50,7 +41,6 @@ def check_rule(checker_data: models.CheckerData) -> None:
 
         return
 
-    document_name = root_attrib["name"]
     config_file_path = checker_data.config.get_config_param("InputFile")
     filename = Path(config_file_path).stem
 
@@ -73,3 +63,34 @@ def check_rule(checker_data: models.CheckerData) -> None:
             xpath="/otx",
             description=f"Invalid otx name {document_name} detected. Do not match filename {filename}",
         )
+
+
+def check_rule(checker_data: models.CheckerData) -> None:
+    """
+    Implements core checker rule Core_Chk001
+    Criterion:
+    For OTX documents stored in a file system, the attribute name of the <otx>
+    root element should match the filename of the containing file
+    (without the extension “.otx”).
+    Severity:
+    Warning
+    """
+    logging.info("Executing document_name_matches_filename check")
+
+    root = checker_data.input_file_xml_root
+    _check_document_name(checker_data, root.getroot().get("name"))
+
+
+class StreamChecker(streaming.StreamChecker):
+    """Streaming variant of check_rule, which only reads the root element."""
+
+    def __init__(self):
+        self.document_name = None
+
+    def start(self, element: etree._Element, path: streaming.ElementPath) -> None:
+        if path.parent is None:
+            self.document_name = element.get("name")
+
+    def check_rule(self, checker_data: models.CheckerData) -> None:
+        logging.info("Executing document_name_matches_filename check")
+        _check_document_name(checker_data, self.document_name)
@@ -6,11 +6,14 @@
 
 import logging
 
+from typing import List, Optional, Tuple
+
+from lxml import etree
 
 from qc_baselib import IssueSeverity
 
 from qc_otx import constants
-from qc_otx.checks import models
+from qc_otx.checks import models, streaming, utils
 
 CHECKER_ID = "check_asam_otx_core_chk_007_have_specification_if_no_realisation_exists"
 CHECKER_DESCRIPTION = "For all elements with specification and realisation parts in an OTX document: if there is no <realisation> given, the according <specification> element should exist and have content (no empty string)."
@@ -26,6 +29,41 @@ NODES_WITH_SPECIFICATION_AND_REALISATION = [
 ]
 
 
+def _is_valid(
+    has_realisation: bool, has_specification: bool, specification_text: Optional[str]
+) -> bool:
+    specification_has_content = (
+        has_specification
+        and specification_text is not None
+        and specification_text != '""'
+    )
+
+    is_valid = True
+
+    if not has_realisation:
+        is_valid = has_specification and specification_has_content
+
+    return is_valid
+
+
+def _report_node(checker_data: models.CheckerData, current_xpath: str) -> None:
+    issue_id = checker_data.result.register_issue(
+        checker_bundle_name=constants.BUNDLE_NAME,
+        checker_id=CHECKER_ID,
+        description="Empty realisation has content in specification",
+        level=IssueSeverity.WARNING,
+        rule_uid=RULE_UID,
+    )
+
+    checker_data.result.add_xml_location(
+        checker_bundle_name=constants.BUNDLE_NAME,
+        checker_id=CHECKER_ID,
+        issue_id=issue_id,
+        xpath=current_xpath,
+        description=f"Node {current_xpath} has no realisation and no specification or empty string in specification",
+    )
+
+
 def check_rule(checker_data: models.CheckerData) -> None:
     """
     Implements core checker rule Core_Chk007
@@ -36,46 +74,79 @@ def check_rule(checker_data: models.CheckerData) -> None:
     """
     logging.info("Executing have_specification_if_no_realisation_exists check")
 
-    tree = checker_data.input_file_xml_root
-    root = tree.getroot()
-
-    # Construct the XPath expression using the union operator
-    xpath_expr = "|".join(
-        [f"//{node}" for node in NODES_WITH_SPECIFICATION_AND_REALISATION]
-    )
+    elements_by_tag = checker_data.document_index.elements_by_tag
 
-    # Use XPath to find all matching elements
-    result = root.xpath(xpath_expr)
+    # Collect all matching elements from the document index. The index lists
+    # them by tag, so they are sorted back into document order.
+    result = [
+        element
+        for node in NODES_WITH_SPECIFICATION_AND_REALISATION
+        for element in elements_by_tag.get(node, [])
+    ]
+    result.sort(key=utils.get_document_position)
 
     for node in result:
-        has_realisation = node.find("realisation") is not None
-        has_specification = node.find("specification") is not None
-        specification_has_content = (
-            has_specification
-            and node.find("specification").text is not None
-            and node.find("specification").text != '""'
+        specification = node.find("specification")
+        is_valid = _is_valid(
+            node.find("realisation") is not None,
+            specification is not None,
+            specification.text if specification is not None else None,
         )
 
-        is_valid = True
+        if not is_valid:
+            _report_node(checker_data, checker_data.locator.get_path(node))
 
-        if not has_realisation:
-            is_valid = has_specification and specification_has_content
+            if checker_data.is_fail_fast_issue(IssueSeverity.WARNING):
+                return
 
-        current_xpath = tree.getpath(node)
 
-        if not is_valid:
-            issue_id = checker_data.result.register_issue(
-                checker_bundle_name=constants.BUNDLE_NAME,
-                checker_id=CHECKER_ID,
-                description="Empty realisation has content in specification",
-                level=IssueSeverity.WARNING,
-                rule_uid=RULE_UID,
-            )
+class StreamChecker(streaming.StreamChecker):
+    """Streaming variant of check_rule. The first <realisation> and <specification>
+    children of each open node are recorded on their end event, so that the
+    nodes are checked on their own end event. Invalid nodes are reported in the
+    order of their start event, which is the document order.
+    """
 
-            checker_data.result.add_xml_location(
-                checker_bundle_name=constants.BUNDLE_NAME,
-                checker_id=CHECKER_ID,
-                issue_id=issue_id,
-                xpath=current_xpath,
-                description=f"Node {current_xpath} has no realisation and no specification or empty string in specification",
+    def __init__(self):
+        # (element, has_realisation, has_specification, specification_text,
+        # start order) of the open nodes
+        self.open_nodes: List[list] = []
+        self.node_count = 0
+        # (start order, path) of the invalid nodes
+        self.invalid_nodes: List[Tuple[int, streaming.ElementPath]] = []
+
+    def start(self, element: etree._Element, path: streaming.ElementPath) -> None:
+        if element.tag in NODES_WITH_SPECIFICATION_AND_REALISATION:
+            self.open_nodes.append([element, False, False, None, self.node_count])
+            self.node_count += 1
+
+    def end(self, element: etree._Element, path: streaming.ElementPath) -> None:
+        # A child of an open node has it as innermost open node
+        if (
+            element.tag in ("realisation", "specification")
+            and len(self.open_nodes) > 0
+            and self.open_nodes[-1][0] is element.getparent()
+        ):
+            open_node = self.open_nodes[-1]
+            if element.tag == "realisation":
+                open_node[1] = True
+            elif not open_node[2]:
+                open_node[2] = True
+                open_node[3] = element.text
+
+        if element.tag in NODES_WITH_SPECIFICATION_AND_REALISATION:
+            _, has_realisation, has_specification, specification_text, order = (
+                self.open_nodes.pop()
             )
+            if not _is_valid(has_realisation, has_specification, specification_text):
+                self.invalid_nodes.append((order, path))
+
+    def check_rule(self, checker_data: models.CheckerData) -> None:
+        logging.info("Executing have_specification_if_no_realisation_exists check")
+        # Nested nodes end before their parent, so the nodes are sorted back
+        # into the order of their start event
+        for _, path in sorted(self.invalid_nodes, key=lambda x: x[0]):
+            _report_node(checker_data, str(path))
+
+            if checker_data.is_fail_fast_issue(IssueSeverity.WARNING):
+                return
@@ -6,10 +6,14 @@
 
 import logging
 
+from typing import List
+
+from lxml import etree
+
 from qc_baselib import IssueSeverity
 
 from qc_otx import constants
-from qc_otx.checks import models
+from qc_otx.checks import models, streaming, xpaths
 
 CHECKER_ID = "check_asam_otx_core_chk_009_mandatory_constant_initialization"
 CHECKER_DESCRIPTION = "Constant declarations shall always be initialized."
@@ -17,6 +21,26 @@ CHECKER_PRECONDITIONS = set()
 RULE_UID = "asam.net:otx:1.0.0:core.chk_009.mandatory_constant_initialization"
 
 
+def _report_constant(
+    checker_data: models.CheckerData, constant_name: str, current_xpath: str
+) -> None:
+    issue_id = checker_data.result.register_issue(
+        checker_bundle_name=constants.BUNDLE_NAME,
+        checker_id=CHECKER_ID,
+        description="Constant declaration without initialization",
+        level=IssueSeverity.ERROR,
+        rule_uid=RULE_UID,
+    )
+
+    checker_data.result.add_xml_location(
+        checker_bundle_name=constants.BUNDLE_NAME,
+        checker_id=CHECKER_ID,
+        issue_id=issue_id,
+        xpath=current_xpath,
+        description=f"Constant {constant_name} at {current_xpath} is not initialized",
+    )
+
+
 def check_rule(checker_data: models.CheckerData) -> None:
     """
     Implements core checker rule Core_Chk009
@@ -25,33 +49,72 @@ def check_rule(checker_data: models.CheckerData) -> None:
     """
     logging.info("Executing mandatory_constant_initialization check")
 
-    tree = checker_data.input_file_xml_root
-    # Use XPath to find all nodes constant
-    constant_nodes = tree.xpath("//constant")
+    # Use the document index to find all nodes constant
+    constant_nodes = checker_data.document_index.elements_by_tag.get("constant", [])
+
+    # XPath expression for the sequence of children
+    init_xpath = xpaths.get_xpath(xpaths.CONSTANT_INIT)
 
     for constant_node in constant_nodes:
         constant_name = constant_node.get("name")
 
-        # Define the XPath expression for the sequence of children
-        xpath_expr = ".//realisation/dataType/init"
-
         # Use XPath to find if the sequence exists
-        is_valid = constant_node.xpath(xpath_expr)
+        is_valid = init_xpath(constant_node)
 
         if not is_valid:
-            current_xpath = tree.getpath(constant_node)
-            issue_id = checker_data.result.register_issue(
-                checker_bundle_name=constants.BUNDLE_NAME,
-                checker_id=CHECKER_ID,
-                description="Constant declaration without initialization",
-                level=IssueSeverity.ERROR,
-                rule_uid=RULE_UID,
+            _report_constant(
+                checker_data,
+                constant_name,
+                checker_data.locator.get_path(constant_node),
+            )
+
+            if checker_data.is_fail_fast_issue(IssueSeverity.ERROR):
+                return
+
+
+class StreamChecker(streaming.StreamChecker):
+    """Streaming variant of check_rule. An <init> element ending inside
+    realisation/dataType initializes all the open constants, which are its
+    ancestors.
+    """
+
+    def __init__(self):
+        self.constant_count = 0
+        # [order, name, path, is_initialized] of the open constants
+        self.open_constants: List[list] = []
+        # (order, name, path) of the constants without initialization
+        self.invalid_constants: List[tuple] = []
+
+    def start(self, element: etree._Element, path: streaming.ElementPath) -> None:
+        if element.tag == "constant":
+            self.open_constants.append(
+                [self.constant_count, element.get("name"), path, False]
             )
+            self.constant_count += 1
 
-            checker_data.result.add_xml_location(
-                checker_bundle_name=constants.BUNDLE_NAME,
-                checker_id=CHECKER_ID,
-                issue_id=issue_id,
-                xpath=current_xpath,
-                description=f"Constant {constant_name} at {current_xpath} is not initialized",
+    def end(self, element: etree._Element, path: streaming.ElementPath) -> None:
+        if element.tag == "constant":
+            order, constant_name, constant_path, is_initialized = (
+                self.open_constants.pop()
             )
+            if not is_initialized:
+                self.invalid_constants.append((order, constant_name, constant_path))
+        elif element.tag == "init" and len(self.open_constants) > 0:
+            data_type = element.getparent()
+            realisation = data_type.getparent()
+            if (
+                data_type.tag == "dataType"
+                and realisation is not None
+                and realisation.tag == "realisation"
+            ):
+                for constant in self.open_constants:
+                    constant[3] = True
+
+    def check_rule(self, checker_data: models.CheckerData) -> None:
+        logging.info("Executing mandatory_constant_initialization check")
+        # Nested constants end before their parent, so the document order is restored
+        for _, constant_name, path in sorted(self.invalid_constants):
+            _report_constant(checker_data, constant_name, str(path))
+
+            if checker_data.is_fail_fast_issue(IssueSeverity.ERROR):
+                return
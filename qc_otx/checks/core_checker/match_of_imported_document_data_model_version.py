@@ -4,14 +4,16 @@
 # Public License, v. 2.0. If a copy of the MPL was not distributed
 # with this file, You can obtain one at https://mozilla.org/MPL/2.0/.
 
-import logging, os
+import logging
+
+from typing import Dict, List, Optional, Tuple
 
 from lxml import etree
 
 from qc_baselib import IssueSeverity, StatusType
 
 from qc_otx import constants
-from qc_otx.checks import models, utils
+from qc_otx.checks import models, streaming, utils
 
 
 CHECKER_ID = "check_asam_otx_core_chk_006_match_of_imported_document_data_model_version"
@@ -22,24 +24,11 @@ RULE_UID = (
 )
 
 
-def check_rule(checker_data: models.CheckerData) -> None:
-    """
-    Implements core checker rule Core_Chk006
-    Criterion: An imported OTX document (imported by an <import> element)
-                shall be bound to the same data model version as the importing document.
-                For this, the OTX XSD namespaces claimed by the <otx> root elements
-                of both documents (attribute xmlns = "http://iso.org/OTX/<version > ") shall be identical.
-
-    Severity: Critical
-
-    """
-    logging.info("Executing match_of_imported_document_data_model_version check")
-
-    input_file_path = checker_data.config.get_config_param("InputFile")
-    tree = checker_data.input_file_xml_root
-    root = tree.getroot()
-
-    source_data_model_version = utils.get_data_model_version(root)
+def _check_imported_versions(
+    checker_data: models.CheckerData,
+    source_data_model_version: Optional[str],
+    import_links: Optional[List[Tuple[Dict[str, str], object]]],
+) -> None:
     if source_data_model_version is None:
         checker_data.result.set_checker_status(
             checker_bundle_name=constants.BUNDLE_NAME,
@@ -57,9 +46,7 @@ def check_rule(checker_data: models.CheckerData) -> None:
 
     logging.debug(f"source_data_model_version: {source_data_model_version}")
 
-    import_nodes = root.findall(".//import", namespaces=root.nsmap)
-
-    if import_nodes is None:
+    if import_links is None:
         checker_data.result.set_checker_status(
             checker_bundle_name=constants.BUNDLE_NAME,
             checker_id=CHECKER_ID,
@@ -74,26 +61,32 @@ def check_rule(checker_data: models.CheckerData) -> None:
 
         return
 
-    # Store previous working directory and move to config path dir for relative package paths
-    previous_wd = os.getcwd()
-    os.chdir(os.path.dirname(input_file_path))
+    for import_attributes, import_location in import_links:
 
-    for import_node in import_nodes:
-
-        current_document = import_node.get("document")
+        current_document = import_attributes.get("document")
         if current_document is None:
             continue
 
-        current_document_filepath = current_document + ".otx"
-        current_xpath = tree.getpath(import_node)
+        current_document_filepath = checker_data.resolve_import(current_document)
+        checker_data.dependencies.files.add(current_document_filepath)
 
-        if not os.path.exists(current_document_filepath):
+        # Imported documents are shared by many importing documents, so the data
+        # model version is read only once per file
+        imported_document = utils.get_imported_document(
+            checker_data.cache.import_graph, current_document_filepath
+        )
+        if not imported_document.exists:
             continue
 
-        current_imported_document_root = etree.parse(current_document_filepath)
-        current_data_model_version = utils.get_data_model_version(
-            current_imported_document_root.getroot()
-        )
+        if imported_document.error is not None:
+            checker_data.result.add_checker_summary(
+                constants.BUNDLE_NAME,
+                CHECKER_ID,
+                f"Imported document {current_document} cannot be read: {imported_document.error}.",
+            )
+            continue
+
+        current_data_model_version = imported_document.data_model_version
         logging.debug(
             f"Current document {current_document} - data model version {current_data_model_version}"
         )
@@ -112,8 +105,57 @@ def check_rule(checker_data: models.CheckerData) -> None:
                 checker_bundle_name=constants.BUNDLE_NAME,
                 checker_id=CHECKER_ID,
                 issue_id=issue_id,
-                xpath=current_xpath,
+                xpath=checker_data.locator.get_path(import_location),
                 description=f"Imported document {current_document} data model version {current_data_model_version} different than current model version {source_data_model_version}",
             )
 
-    os.chdir(previous_wd)
+            if checker_data.is_fail_fast_issue(IssueSeverity.ERROR):
+                return
+
+
+def check_rule(checker_data: models.CheckerData) -> None:
+    """
+    Implements core checker rule Core_Chk006
+    Criterion: An imported OTX document (imported by an <import> element)
+                shall be bound to the same data model version as the importing document.
+                For this, the OTX XSD namespaces claimed by the <otx> root elements
+                of both documents (attribute xmlns = "http://iso.org/OTX/<version > ") shall be identical.
+
+    Severity: Critical
+
+    """
+    logging.info("Executing match_of_imported_document_data_model_version check")
+
+    tree = checker_data.input_file_xml_root
+    root = tree.getroot()
+
+    import_links = [(x.attrib, x) for x in checker_data.document_index.import_nodes]
+    _check_imported_versions(
+        checker_data, utils.get_data_model_version(root), import_links
+    )
+
+
+class StreamChecker(streaming.StreamChecker):
+    """Streaming variant of check_rule, which reads the root element and collects
+    the <import> elements.
+    """
+
+    def __init__(self):
+        self.source_data_model_version = None
+        self.import_tag = None
+        self.import_links = []
+
+    def start(self, element: etree._Element, path: streaming.ElementPath) -> None:
+        if path.parent is None:
+            self.source_data_model_version = utils.get_data_model_version(element)
+            self.import_tag = utils.get_import_tag(element)
+        elif element.tag == self.import_tag:
+            self.import_links.append((dict(element.attrib), path))
+
+    def check_rule(self, checker_data: models.CheckerData) -> None:
+        logging.info("Executing match_of_imported_document_data_model_version check")
+        _check_imported_versions(
+            checker_data,
+            self.source_data_model_version,
+            self.import_links,
+        )
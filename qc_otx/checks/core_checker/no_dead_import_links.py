@@ -6,10 +6,14 @@
 
 import logging, os
 
+from typing import Dict, List, Tuple
+
+from lxml import etree
+
 from qc_baselib import IssueSeverity
 
 from qc_otx import constants
-from qc_otx.checks import models
+from qc_otx.checks import models, streaming, utils
 
 CHECKER_ID = "check_asam_otx_core_chk_003_no_dead_import_links"
 CHECKER_DESCRIPTION = "Imported OTX documents (referenced by package name and document name via <import> elements) should exist and should be accessible."
@@ -17,44 +21,57 @@ CHECKER_PRECONDITIONS = set()
 RULE_UID = "asam.net:otx:1.0.0:core.chk_003.no_dead_import_links"
 
 
-def check_rule(checker_data: models.CheckerData) -> None:
-    """
-    Implements core checker rule Core_Chk003
-    Criterion: Imported OTX documents (referenced by package name and document name via <import> elements)
-    should exist and should be accessible.
-    Severity: Critical
+def _report_import_cycles(checker_data: models.CheckerData) -> None:
+    """Add the import cycles reachable from the input document to the checker
+    summary. Cycles are allowed by the standard, but make every document of the
+    cycle depend on all the others.
     """
+    input_file_path = os.path.abspath(checker_data.config.get_config_param("InputFile"))
+    import_graph = checker_data.cache.import_graph
+    visited_files = set()
+    cycles = utils.find_import_cycles(import_graph, [input_file_path], visited_files)
+    visited_files.discard(input_file_path)
+    # Only the imports of the input document are hashed, the documents imported
+    # transitively only matter for the cycles found here
+    checker_data.dependencies.stat_files.update(visited_files)
 
-    logging.info("Executing no_dead_import_links check")
-
-    tree = checker_data.input_file_xml_root
-    root = tree.getroot()
-    input_file_path = checker_data.config.get_config_param("InputFile")
+    for cycle in cycles:
+        cycle_names = [os.path.basename(x) for x in cycle + [cycle[0]]]
+        checker_data.result.add_checker_summary(
+            constants.BUNDLE_NAME,
+            CHECKER_ID,
+            f"Import cycle found: {' -> '.join(cycle_names)}.",
+        )
 
-    import_nodes = root.findall(".//import", namespaces=root.nsmap)
 
-    # Store previous working directory and move to config path dir for relative package paths
-    previous_wd = os.getcwd()
-    os.chdir(os.path.dirname(input_file_path))
+def _check_import_links(
+    checker_data: models.CheckerData, import_links: List[Tuple[Dict[str, str], object]]
+) -> None:
+    """Report the imported documents that do not exist.
 
-    for import_node in import_nodes:
-        import_prefix = import_node.get("prefix")
-        import_package = import_node.get("package")
-        import_document = import_node.get("document")
+    Args:
+        checker_data (models.CheckerData): the checker data
+        import_links (List[Tuple[Dict[str, str], object]]): attributes and location of each <import> element
+    """
+    for import_attributes, import_location in import_links:
+        import_prefix = import_attributes.get("prefix")
+        import_package = import_attributes.get("package")
+        import_document = import_attributes.get("document")
         logging.debug(
             f"import_prefix: {import_prefix} - import_package {import_package} - import_document {import_document}"
         )
-        import_xpath = tree.getpath(import_node)
         # Import path checked in the same input file directory following
         # Recommendation: Use only references inside the same package.
-        full_imported_path = os.path.join(import_document + ".otx")
+        full_imported_path = checker_data.resolve_import(import_document)
+        checker_data.dependencies.files.add(full_imported_path)
 
-        logging.debug(f"cwd: {os.getcwd()}")
         logging.debug(f"full_imported_path: {full_imported_path}")
         # Check if file exists
-        import_file_exists = os.path.exists(full_imported_path)
+        imported_document = utils.get_imported_document(
+            checker_data.cache.import_graph, full_imported_path
+        )
 
-        if not import_file_exists:
+        if not imported_document.exists:
             issue_id = checker_data.result.register_issue(
                 checker_bundle_name=constants.BUNDLE_NAME,
                 checker_id=CHECKER_ID,
@@ -67,8 +84,43 @@ def check_rule(checker_data: models.CheckerData) -> None:
                 checker_bundle_name=constants.BUNDLE_NAME,
                 checker_id=CHECKER_ID,
                 issue_id=issue_id,
-                xpath=import_xpath,
+                xpath=checker_data.locator.get_path(import_location),
                 description=f"Imported otx document [package: {import_package}, document:{import_document}, prefix:{import_prefix}] does not exists",
             )
 
-    os.chdir(previous_wd)
+            if checker_data.is_fail_fast_issue(IssueSeverity.ERROR):
+                break
+
+    _report_import_cycles(checker_data)
+
+
+def check_rule(checker_data: models.CheckerData) -> None:
+    """
+    Implements core checker rule Core_Chk003
+    Criterion: Imported OTX documents (referenced by package name and document name via <import> elements)
+    should exist and should be accessible.
+    Severity: Critical
+    """
+
+    logging.info("Executing no_dead_import_links check")
+
+    import_links = [(x.attrib, x) for x in checker_data.document_index.import_nodes]
+    _check_import_links(checker_data, import_links)
+
+
+class StreamChecker(streaming.StreamChecker):
+    """Streaming variant of check_rule, which collects the <import> elements."""
+
+    def __init__(self):
+        self.import_tag = None
+        self.import_links = []
+
+    def start(self, element: etree._Element, path: streaming.ElementPath) -> None:
+        if path.parent is None:
+            self.import_tag = utils.get_import_tag(element)
+        elif element.tag == self.import_tag:
+            self.import_links.append((dict(element.attrib), path))
+
+    def check_rule(self, checker_data: models.CheckerData) -> None:
+        logging.info("Executing no_dead_import_links check")
+        _check_import_links(checker_data, self.import_links)
@@ -6,12 +6,14 @@
 
 import logging
 
-from typing import List
+from typing import Dict, Iterable, List, Set, Tuple
+
+from lxml import etree
 
 from qc_baselib import IssueSeverity
 
 from qc_otx import constants
-from qc_otx.checks import models
+from qc_otx.checks import models, streaming, utils
 
 
 CHECKER_ID = "check_asam_otx_core_chk_004_no_unused_imports"
@@ -22,36 +24,23 @@ CHECKER_PRECONDITIONS = set()
 RULE_UID = "asam.net:otx:1.0.0:core.chk_004.no_unused_imports"
 
 
-def _is_prefix_never_used_in_attributes(attributes: List, prefix: str) -> bool:
-    # Check if the prefix is never used in any attribute value
-    for attr in attributes:
-        if ":" in attr and prefix in attr.split(":")[0]:
-            return False  # Found the prefix in an attribute value
-    return True  # Prefix is never used in any attribute value
-
-
-def check_rule(checker_data: models.CheckerData) -> None:
+def _get_used_prefixes(attribute_values: Iterable[str]) -> Set[str]:
+    """Prefixes of the attribute values of the form "prefix:name", collected in a
+    single pass so that each import is answered with a set lookup.
     """
-    Implements core checker rule Core_Chk004
-    Criterion: An imported OTX document should be used at least once in the importing document.
-    Severity: Warning
+    return {x.split(":", 1)[0] for x in attribute_values if ":" in x}
 
-    """
-    logging.info("Executing no_unused_imports check")
-
-    tree = checker_data.input_file_xml_root
-    root = tree.getroot()
 
-    import_nodes = root.findall(".//import", namespaces=root.nsmap)
-    xpath_query = "//@*"
-    otx_document_attributes = root.xpath(xpath_query)
-
-    for import_node in import_nodes:
-        import_prefix = import_node.get("prefix")
-        import_package = import_node.get("package")
-        import_document = import_node.get("document")
-        import_path = tree.getpath(import_node)
-        if _is_prefix_never_used_in_attributes(otx_document_attributes, import_prefix):
+def _check_unused_imports(
+    checker_data: models.CheckerData,
+    import_links: List[Tuple[Dict[str, str], object]],
+    used_prefixes: Set[str],
+) -> None:
+    for import_attributes, import_location in import_links:
+        import_prefix = import_attributes.get("prefix")
+        import_package = import_attributes.get("package")
+        import_document = import_attributes.get("document")
+        if import_prefix not in used_prefixes:
             issue_id = checker_data.result.register_issue(
                 checker_bundle_name=constants.BUNDLE_NAME,
                 checker_id=CHECKER_ID,
@@ -64,6 +53,50 @@ def check_rule(checker_data: models.CheckerData) -> None:
                 checker_bundle_name=constants.BUNDLE_NAME,
                 checker_id=CHECKER_ID,
                 issue_id=issue_id,
-                xpath=import_path,
+                xpath=checker_data.locator.get_path(import_location),
                 description=f"Imported otx document [package: {import_package}, document:{import_document}, prefix:{import_prefix}] is never used in current document",
             )
+
+            if checker_data.is_fail_fast_issue(IssueSeverity.WARNING):
+                return
+
+
+def check_rule(checker_data: models.CheckerData) -> None:
+    """
+    Implements core checker rule Core_Chk004
+    Criterion: An imported OTX document should be used at least once in the importing document.
+    Severity: Warning
+
+    """
+    logging.info("Executing no_unused_imports check")
+
+    import_links = [(x.attrib, x) for x in checker_data.document_index.import_nodes]
+    used_prefixes = _get_used_prefixes(
+        element.get(attr)
+        for attr, elements in checker_data.document_index.attributes.items()
+        for element in elements
+    )
+    _check_unused_imports(checker_data, import_links, used_prefixes)
+
+
+class StreamChecker(streaming.StreamChecker):
+    """Streaming variant of check_rule. Only the prefixes used by the attribute
+    values are kept.
+    """
+
+    def __init__(self):
+        self.import_tag = None
+        self.import_links = []
+        self.used_prefixes = set()
+
+    def start(self, element: etree._Element, path: streaming.ElementPath) -> None:
+        if path.parent is None:
+            self.import_tag = utils.get_import_tag(element)
+        elif element.tag == self.import_tag:
+            self.import_links.append((dict(element.attrib), path))
+
+        self.used_prefixes.update(_get_used_prefixes(element.attrib.values()))
+
+    def check_rule(self, checker_data: models.CheckerData) -> None:
+        logging.info("Executing no_unused_imports check")
+        _check_unused_imports(checker_data, self.import_links, self.used_prefixes)
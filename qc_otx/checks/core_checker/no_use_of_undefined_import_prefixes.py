@@ -6,10 +6,14 @@
 
 import logging
 
+from typing import List, Optional, Set
+
+from lxml import etree
+
 from qc_baselib import IssueSeverity, StatusType
 
 from qc_otx import constants
-from qc_otx.checks import models, utils
+from qc_otx.checks import models, streaming, utils
 
 CHECKER_ID = "check_asam_otx_core_chk_005_no_use_of_undefined_import_prefixes"
 CHECKER_DESCRIPTION = "If an imported name is accessed by prefix in an OtxLink type attribute, the corresponding prefix definition shall exist in an <import> element."
@@ -25,6 +29,48 @@ OTX_LINK_ATTRIBUTES.add("valueOf")
 OTX_LINK_ATTRIBUTES.add("mutexLock")
 
 
+def _get_undefined_prefix(value: str, import_prefixes: Set[str]) -> Optional[str]:
+    """Prefix of an OtxLink value if no <import> element defines it, else None."""
+    if ":" not in value:
+        return None
+    prefix = value.split(":")[0]
+    if prefix in import_prefixes:
+        return None
+    return prefix
+
+
+def _report_undefined_prefixes(
+    checker_data: models.CheckerData,
+    undefined_prefix_links: List[models.AttributeInfo],
+) -> None:
+    """Register an issue for each OtxLink attribute, given in document order,
+    whose prefix is not defined by an <import> element.
+    """
+    logging.debug(f"undefined_prefix_links: {undefined_prefix_links}")
+
+    for otx_link in undefined_prefix_links:
+        current_prefix = otx_link.value.split(":")[0]
+
+        issue_id = checker_data.result.register_issue(
+            checker_bundle_name=constants.BUNDLE_NAME,
+            checker_id=CHECKER_ID,
+            description="Prefix definition does not exists in an <import> element",
+            level=IssueSeverity.ERROR,
+            rule_uid=RULE_UID,
+        )
+
+        checker_data.result.add_xml_location(
+            checker_bundle_name=constants.BUNDLE_NAME,
+            checker_id=CHECKER_ID,
+            issue_id=issue_id,
+            xpath=checker_data.locator.get_path(otx_link.location),
+            description=f"Imported prefix {current_prefix} not found across import elements",
+        )
+
+        if checker_data.is_fail_fast_issue(IssueSeverity.ERROR):
+            return
+
+
 def check_rule(checker_data: models.CheckerData) -> None:
     """
     Implements core checker rule Core_Chk005
@@ -35,10 +81,7 @@ def check_rule(checker_data: models.CheckerData) -> None:
     """
     logging.info("Executing no_use_of_undefined_import_prefixes check")
 
-    tree = checker_data.input_file_xml_root
-    root = tree.getroot()
-
-    import_nodes = root.findall(".//import", namespaces=root.nsmap)
+    import_nodes = checker_data.document_index.import_nodes
 
     if import_nodes is None:
         checker_data.result.set_checker_status(
@@ -55,38 +98,54 @@ def check_rule(checker_data: models.CheckerData) -> None:
 
         return
 
-    import_prefixes = [x.get("prefix") for x in import_nodes]
+    import_prefixes = set(x.get("prefix") for x in import_nodes)
+    logging.debug(f"import_prefixes: {import_prefixes}")
 
-    attributes = utils.get_all_attributes(tree, root)
-    otx_link_attributes = [x for x in attributes if x.name in OTX_LINK_ATTRIBUTES]
+    attributes = checker_data.document_index.attributes
+    undefined_prefix_links = [
+        models.AttributeInfo(name, element.get(name), element)
+        for name in OTX_LINK_ATTRIBUTES
+        for element in attributes.get(name, [])
+        if _get_undefined_prefix(element.get(name), import_prefixes) is not None
+    ]
+    # The index lists the elements by attribute name, so the links are sorted
+    # back into document order, then by their order within their element
+    undefined_prefix_links.sort(
+        key=lambda x: (
+            utils.get_document_position(x.location),
+            list(x.location.attrib).index(x.name),
+        )
+    )
+    _report_undefined_prefixes(checker_data, undefined_prefix_links)
 
-    logging.debug(f"attributes: {attributes}")
-    logging.debug(f"import_prefixes: {import_prefixes}")
-    logging.debug(f"otx_link_attributes: {otx_link_attributes}")
-
-    for otx_link in otx_link_attributes:
-        if ":" not in otx_link.value:
-            continue
-        current_value_split = otx_link.value.split(":")
-        if len(current_value_split) == 0:
-            continue
-        current_prefix = current_value_split[0]
-
-        has_issue = current_prefix not in import_prefixes
-
-        if has_issue:
-            issue_id = checker_data.result.register_issue(
-                checker_bundle_name=constants.BUNDLE_NAME,
-                checker_id=CHECKER_ID,
-                description="Prefix definition does not exists in an <import> element",
-                level=IssueSeverity.ERROR,
-                rule_uid=RULE_UID,
-            )
-
-            checker_data.result.add_xml_location(
-                checker_bundle_name=constants.BUNDLE_NAME,
-                checker_id=CHECKER_ID,
-                issue_id=issue_id,
-                xpath=otx_link.xpath,
-                description=f"Imported prefix {current_prefix} not found across import elements",
-            )
+
+class StreamChecker(streaming.StreamChecker):
+    """Streaming variant of check_rule. Only the OtxLink attributes with a prefix
+    are kept, in document order.
+    """
+
+    def __init__(self):
+        self.import_tag = None
+        self.import_prefixes: Set[str] = set()
+        self.otx_link_attributes: List[models.AttributeInfo] = []
+
+    def start(self, element: etree._Element, path: streaming.ElementPath) -> None:
+        if path.parent is None:
+            self.import_tag = utils.get_import_tag(element)
+        elif element.tag == self.import_tag:
+            self.import_prefixes.add(element.get("prefix"))
+
+        for name, value in element.attrib.items():
+            if name in OTX_LINK_ATTRIBUTES and ":" in value:
+                self.otx_link_attributes.append(models.AttributeInfo(name, value, path))
+
+    def check_rule(self, checker_data: models.CheckerData) -> None:
+        logging.info("Executing no_use_of_undefined_import_prefixes check")
+        # Imports precede the OtxLink attributes that use them, so the prefixes
+        # are only checked once the whole document was read
+        undefined_prefix_links = [
+            x
+            for x in self.otx_link_attributes
+            if _get_undefined_prefix(x.value, self.import_prefixes) is not None
+        ]
+        _report_undefined_prefixes(checker_data, undefined_prefix_links)
@@ -6,10 +6,14 @@
 
 import logging
 
+from typing import List
+
+from lxml import etree
+
 from qc_baselib import IssueSeverity
 
 from qc_otx import constants
-from qc_otx.checks import models
+from qc_otx.checks import models, streaming
 
 
 CHECKER_ID = "check_asam_otx_core_chk_008_public_main_procedure"
@@ -18,6 +22,35 @@ CHECKER_PRECONDITIONS = set()
 RULE_UID = "asam.net:otx:1.0.0:core.chk_008.public_main_procedure"
 
 
+def _has_issue(procedure_node: etree._Element) -> bool:
+    procedure_name = procedure_node.get("name")
+    procedure_visibility = procedure_node.get("visibility")
+
+    # Visibility defaults to private if not specified
+    if procedure_visibility is None:
+        procedure_visibility = "PRIVATE"
+
+    return procedure_name == "main" and procedure_visibility != "PUBLIC"
+
+
+def _report_procedure(checker_data: models.CheckerData, current_xpath: str) -> None:
+    issue_id = checker_data.result.register_issue(
+        checker_bundle_name=constants.BUNDLE_NAME,
+        checker_id=CHECKER_ID,
+        description="Procedure called main has not PUBLIC visibility",
+        level=IssueSeverity.ERROR,
+        rule_uid=RULE_UID,
+    )
+
+    checker_data.result.add_xml_location(
+        checker_bundle_name=constants.BUNDLE_NAME,
+        checker_id=CHECKER_ID,
+        issue_id=issue_id,
+        xpath=current_xpath,
+        description=f"Procedure at {current_xpath} is called main but its visibility is not PUBLIC",
+    )
+
+
 def check_rule(checker_data: models.CheckerData) -> None:
     """
     Implements core checker rule Core_Chk008
@@ -26,35 +59,33 @@ def check_rule(checker_data: models.CheckerData) -> None:
     """
     logging.info("Executing public_main_procedure check")
 
-    tree = checker_data.input_file_xml_root
-
     # Use XPath to find all nodes procedures
-    procedure_nodes = tree.xpath(f"//procedure")
+    procedure_nodes = checker_data.document_index.elements_by_tag.get("procedure", [])
 
     for procedure_node in procedure_nodes:
-        procedure_name = procedure_node.get("name")
-        procedure_visibility = procedure_node.get("visibility")
-
-        # Visibility defaults to private if not specified
-        if procedure_visibility is None:
-            procedure_visibility = "PRIVATE"
-
-        has_issue = procedure_name == "main" and procedure_visibility != "PUBLIC"
-
-        if has_issue:
-            current_xpath = tree.getpath(procedure_node)
-            issue_id = checker_data.result.register_issue(
-                checker_bundle_name=constants.BUNDLE_NAME,
-                checker_id=CHECKER_ID,
-                description="Procedure called main has not PUBLIC visibility",
-                level=IssueSeverity.ERROR,
-                rule_uid=RULE_UID,
+        if _has_issue(procedure_node):
+            _report_procedure(
+                checker_data, checker_data.locator.get_path(procedure_node)
             )
 
-            checker_data.result.add_xml_location(
-                checker_bundle_name=constants.BUNDLE_NAME,
-                checker_id=CHECKER_ID,
-                issue_id=issue_id,
-                xpath=current_xpath,
-                description=f"Procedure at {current_xpath} is called main but its visibility is not PUBLIC",
-            )
+            if checker_data.is_fail_fast_issue(IssueSeverity.ERROR):
+                return
+
+
+class StreamChecker(streaming.StreamChecker):
+    """Streaming variant of check_rule, which reads the attributes of the procedures."""
+
+    def __init__(self):
+        self.invalid_procedures: List[streaming.ElementPath] = []
+
+    def start(self, element: etree._Element, path: streaming.ElementPath) -> None:
+        if element.tag == "procedure" and _has_issue(element):
+            self.invalid_procedures.append(path)
+
+    def check_rule(self, checker_data: models.CheckerData) -> None:
+        logging.info("Executing public_main_procedure check")
+        for path in self.invalid_procedures:
+            _report_procedure(checker_data, str(path))
+
+            if checker_data.is_fail_fast_issue(IssueSeverity.ERROR):
+                return
@@ -6,10 +6,14 @@
 
 import logging
 
+from typing import Dict, List
+
+from lxml import etree
+
 from qc_baselib import IssueSeverity
 
 from qc_otx import constants
-from qc_otx.checks import models
+from qc_otx.checks import models, streaming, xpaths
 
 CHECKER_ID = "check_asam_otx_core_chk_010_unique_node_names"
 CHECKER_DESCRIPTION = "The value of a nodes name attribute should be unique among all nodes in a procedure."
@@ -17,6 +21,42 @@ CHECKER_PRECONDITIONS = set()
 RULE_UID = "asam.net:otx:1.0.0:core.chk_010.unique_node_names"
 
 
+def _report_duplicated_names(
+    checker_data: models.CheckerData,
+    procedure_name: str,
+    name_map: Dict[str, List],
+) -> bool:
+    """Register an issue for each duplicated name of a procedure.
+
+    Returns:
+        bool: True if the check stops there in fail-fast mode
+    """
+    for name, name_locations in name_map.items():
+        if len(name_locations) <= 1:
+            continue
+
+        issue_id = checker_data.result.register_issue(
+            checker_bundle_name=constants.BUNDLE_NAME,
+            checker_id=CHECKER_ID,
+            description="Nodes with same attribute name found in a procedure",
+            level=IssueSeverity.WARNING,
+            rule_uid=RULE_UID,
+        )
+
+        checker_data.result.add_xml_location(
+            checker_bundle_name=constants.BUNDLE_NAME,
+            checker_id=CHECKER_ID,
+            issue_id=issue_id,
+            xpath=[checker_data.locator.get_path(x) for x in name_locations],
+            description=f"Procedure {procedure_name} contains duplicated name.",
+        )
+
+        if checker_data.is_fail_fast_issue(IssueSeverity.WARNING):
+            return True
+
+    return False
+
+
 def check_rule(checker_data: models.CheckerData) -> None:
     """
     Rule ID: asam.net:otx:1.0.0:core.chk_010.unique_node_names
@@ -35,50 +75,66 @@ def check_rule(checker_data: models.CheckerData) -> None:
     """
     logging.info("Executing unique_node_names check")
 
-    tree = checker_data.input_file_xml_root
-    # Use XPath to find all nodes procedure
-    procedure_nodes = tree.xpath("//procedure")
+    # Use the document index to find all nodes procedure
+    procedure_nodes = checker_data.document_index.elements_by_tag.get("procedure", [])
+
+    # XPath expression to find all elements with a "name" attribute
+    named_descendants_xpath = xpaths.get_xpath(xpaths.NAMED_DESCENDANTS)
 
     for procedure_node in procedure_nodes:
         procedure_name = procedure_node.get("name")
 
-        # Define the XPath expression to find all elements with a "name" attribute
-        xpath_expr = ".//*[@name]"
-
         # Use XPath to find all matching elements from the given procedure node
-        result = procedure_node.xpath(xpath_expr)
+        result = named_descendants_xpath(procedure_node)
 
-        # Dictionary to store the found names and their corresponding XPath expressions
+        # Dictionary to store the found names and their corresponding elements.
+        # Paths are only built for the duplicated names.
         name_map = dict()
 
-        # Build the XPaths for elements and check for duplicates
         for elem in result:
             name = elem.get("name")
             if name is None:
                 continue
-            xpath = tree.getpath(elem)
 
             if name not in name_map:
                 name_map[name] = []
 
-            name_map[name].append(xpath)
+            name_map[name].append(elem)
 
-        for name, xpaths in name_map.items():
-            if len(xpaths) <= 1:
-                continue
+        if _report_duplicated_names(checker_data, procedure_name, name_map):
+            return
+
+
+class StreamChecker(streaming.StreamChecker):
+    """Streaming variant of check_rule. The paths of the named nodes are collected
+    for each open procedure and only kept for the duplicated names.
+    """
 
-            issue_id = checker_data.result.register_issue(
-                checker_bundle_name=constants.BUNDLE_NAME,
-                checker_id=CHECKER_ID,
-                description="Nodes with same attribute name found in a procedure",
-                level=IssueSeverity.WARNING,
-                rule_uid=RULE_UID,
-            )
-
-            checker_data.result.add_xml_location(
-                checker_bundle_name=constants.BUNDLE_NAME,
-                checker_id=CHECKER_ID,
-                issue_id=issue_id,
-                xpath=xpaths,
-                description=f"Procedure {procedure_name} contains duplicated name.",
-            )
+    def __init__(self):
+        self.procedure_count = 0
+        # (order, procedure name, name map) of the open procedures
+        self.open_procedures: List[tuple] = []
+        # (order, procedure name, name map of the duplicated names) of the ended procedures
+        self.procedures: List[tuple] = []
+
+    def start(self, element: etree._Element, path: streaming.ElementPath) -> None:
+        name = element.get("name")
+        if name is not None:
+            for _, _, name_map in self.open_procedures:
+                name_map.setdefault(name, []).append(path)
+
+        if element.tag == "procedure":
+            self.open_procedures.append((self.procedure_count, name, dict()))
+            self.procedure_count += 1
+
+    def end(self, element: etree._Element, path: streaming.ElementPath) -> None:
+        if element.tag == "procedure":
+            order, procedure_name, name_map = self.open_procedures.pop()
+            duplicated_names = {x: y for x, y in name_map.items() if len(y) > 1}
+            self.procedures.append((order, procedure_name, duplicated_names))
+
+    def check_rule(self, checker_data: models.CheckerData) -> None:
+        logging.info("Executing unique_node_names check")
+        for _, procedure_name, name_map in sorted(self.procedures, key=lambda x: x[0]):
+            if _report_duplicated_names(checker_data, procedure_name, name_map):
+                return
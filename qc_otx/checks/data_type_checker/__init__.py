@@ -4,7 +4,17 @@
 # Public License, v. 2.0. If a copy of the MPL was not distributed
 # with this file, You can obtain one at https://mozilla.org/MPL/2.0/.
 
-from . import accessing_structure_elements as accessing_structure_elements
-from . import (
-    correct_target_for_structure_element as correct_target_for_structure_element,
-)
+import importlib
+
+# The rule modules are imported on first access as attributes of the package,
+# so that importing the package does not import all of its rules
+RULE_MODULES = [
+    "accessing_structure_elements",
+    "correct_target_for_structure_element",
+]
+
+
+def __getattr__(name: str):
+    if name in RULE_MODULES:
+        return importlib.import_module(f"{__name__}.{name}")
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -9,7 +9,7 @@ import logging
 from qc_baselib import IssueSeverity
 
 from qc_otx import constants
-from qc_otx.checks import models
+from qc_otx.checks import models, utils
 
 
 CHECKER_ID = "check_asam_otx_data_type_chk_001_accessing_structure_elements"
@@ -34,33 +34,10 @@ def check_rule(checker_data: models.CheckerData) -> None:
     logging.info("Executing accessing_structure_elements check")
 
     tree = checker_data.input_file_xml_root
+    elements_by_tag = checker_data.document_index.elements_by_tag
+    symbol_table = utils.get_structure_symbol_table(checker_data)
 
-    # Use XPath to find all nodes procedure
-    signature_nodes = tree.xpath("//signature")
-
-    signature_dict = dict()
-    for signature in signature_nodes:
-
-        field_list = []
-        fields = signature.xpath(".//*[local-name()='element']")
-        for field in fields:
-            field_list.append(field.get("name"))
-
-        signature_dict[signature.get("name")] = field_list
-
-    logging.debug(f"signature_dict {signature_dict}")
-
-    variable_nodes = tree.xpath("//variable")
-    variable_type_dict = dict()
-    for variable in variable_nodes:
-        variable_type = variable.xpath(".//*[@structureType]")
-        if len(variable_type) == 0:
-            continue
-        variable_type_dict[variable.get("name")] = variable_type[0].get("structureType")
-
-    logging.debug(f"variable_type_dict {variable_type_dict}")
-
-    step_by_name_nodes = tree.xpath("//stepByName")
+    step_by_name_nodes = elements_by_tag.get("stepByName", [])
 
     for step_by_name_node in step_by_name_nodes:
         logging.debug(f"step_by_name_node: {step_by_name_node}")
@@ -72,16 +49,17 @@ def check_rule(checker_data: models.CheckerData) -> None:
             continue
 
         logging.debug(f"current_value {current_value}")
-        if current_result_name not in variable_type_dict:
+        current_variable_type = symbol_table.get_structure_type(
+            current_result_name, step_by_name_node
+        )
+        if current_variable_type is None:
             continue
-
-        current_variable_type = variable_type_dict[current_result_name]
         logging.debug(f"current_variable_type {current_variable_type}")
 
-        if current_variable_type not in signature_dict:
+        if current_variable_type not in symbol_table.signatures:
             continue
 
-        has_issue = current_value not in signature_dict[current_variable_type]
+        has_issue = current_value not in symbol_table.signatures[current_variable_type]
 
         if has_issue:
             current_xpath = tree.getelementpath(step_by_name_node)
@@ -100,3 +78,6 @@ def check_rule(checker_data: models.CheckerData) -> None:
                 xpath=current_xpath,
                 description=f"Accessing {current_value} for variable {current_result_name} of type {current_variable_type} is not present in type definition",
             )
+
+            if checker_data.is_fail_fast_issue(IssueSeverity.ERROR):
+                return
@@ -4,12 +4,15 @@
 # Public License, v. 2.0. If a copy of the MPL was not distributed
 # with this file, You can obtain one at https://mozilla.org/MPL/2.0/.
 
+import itertools
 import logging
 
+from lxml import etree
+
 from qc_baselib import IssueSeverity
 
 from qc_otx import constants
-from qc_otx.checks import models
+from qc_otx.checks import models, utils
 
 
 CHECKER_ID = "check_asam_otx_data_type_chk_008_correct_target_for_structure_element"
@@ -33,68 +36,51 @@ def check_rule(checker_data: models.CheckerData) -> None:
     """
     logging.info("Executing correct_target_for_structure_element check")
 
-    tree = checker_data.input_file_xml_root
-
-    # Use XPath to find all nodes procedure
-    signature_nodes = tree.xpath("//signature")
-
-    signature_dict = dict()
-    for signature in signature_nodes:
-
-        field_list = []
-        fields = signature.xpath(".//*[local-name()='element']")
-        for field in fields:
-            field_list.append(field.get("name"))
-
-        signature_dict[signature.get("name")] = field_list
-
-    logging.debug(f"signature_dict {signature_dict}")
+    symbol_table = utils.get_structure_symbol_table(checker_data)
+    declared_names = dict.fromkeys(
+        itertools.chain(
+            symbol_table.global_types, *symbol_table.procedure_types.values()
+        )
+    )
 
-    variable_nodes = tree.xpath("//variable")
-    variable_type_dict = dict()
-    for variable in variable_nodes:
-        variable_type = variable.xpath(".//*[@structureType]")
-        if len(variable_type) == 0:
-            continue
-        variable_type_dict[variable.get("name")] = variable_type[0].get("structureType")
-
-    logging.debug(f"variable_type_dict {variable_type_dict}")
-
-    for structure_name in variable_type_dict.keys():
+    # The elements named like a declaration are looked up in the name index, so
+    # each structure access is visited once beneath its instance
+    for structure_name in declared_names:
         logging.debug(f"structure_name: {structure_name}")
 
-        structure_instances = tree.xpath(f"//*[@name='{structure_name}']")
-
-        logging.debug(f"structure_instances: {structure_instances}")
+        structure_instances = checker_data.document_index.elements_by_name.get(
+            structure_name, []
+        )
 
         for structure_instance in structure_instances:
-            structure_accesses = structure_instance.xpath(".//*[@value]")
-
-            for structure_access in structure_accesses:
+            current_variable_type = symbol_table.get_structure_type(
+                structure_name, structure_instance
+            )
+            # Structure types of imported documents are not known
+            field_names = symbol_table.signatures.get(current_variable_type)
+            if field_names is None:
+                continue
+
+            for structure_access in structure_instance.iterdescendants(etree.Element):
                 current_value = structure_access.get("value")
-                if current_value is None:
+                if current_value is None or current_value in field_names:
                     continue
-                logging.debug(f"current_value: {current_value}")
-
-                current_variable_type = variable_type_dict[structure_name]
-                logging.debug(f"current_variable_type: {current_variable_type}")
-
-                has_issue = current_value not in signature_dict[current_variable_type]
-
-                if has_issue:
-                    current_xpath = tree.getpath(structure_instance)
-                    issue_id = checker_data.result.register_issue(
-                        checker_bundle_name=constants.BUNDLE_NAME,
-                        checker_id=CHECKER_ID,
-                        description="Invalid names used while accessing structure element",
-                        level=IssueSeverity.ERROR,
-                        rule_uid=RULE_UID,
-                    )
-
-                    checker_data.result.add_xml_location(
-                        checker_bundle_name=constants.BUNDLE_NAME,
-                        checker_id=CHECKER_ID,
-                        issue_id=issue_id,
-                        xpath=current_xpath,
-                        description=f"Accessing {current_value} for variable {structure_name} of type {current_variable_type} is not present in type definition",
-                    )
+
+                issue_id = checker_data.result.register_issue(
+                    checker_bundle_name=constants.BUNDLE_NAME,
+                    checker_id=CHECKER_ID,
+                    description="Invalid names used while accessing structure element",
+                    level=IssueSeverity.ERROR,
+                    rule_uid=RULE_UID,
+                )
+
+                checker_data.result.add_xml_location(
+                    checker_bundle_name=constants.BUNDLE_NAME,
+                    checker_id=CHECKER_ID,
+                    issue_id=issue_id,
+                    xpath=checker_data.locator.get_path(structure_instance),
+                    description=f"Accessing {current_value} for variable {structure_name} of type {current_variable_type} is not present in type definition",
+                )
+
+                if checker_data.is_fail_fast_issue(IssueSeverity.ERROR):
+                    return
@@ -0,0 +1,73 @@
+# SPDX-License-Identifier: MPL-2.0
+# Copyright 2024, ASAM e.V.
+# This Source Code Form is subject to the terms of the Mozilla
+# Public License, v. 2.0. If a copy of the MPL was not distributed
+# with this file, You can obtain one at https://mozilla.org/MPL/2.0/.
+
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+
+from lxml import etree
+
+from qc_otx.checks import models, utils
+
+
+@dataclass
+class FamilyRequirement:
+    """Namespace prefixes and xsi:types a document needs for the checkers of a
+    family to have anything to check. The family is skipped as a whole if one of
+    the prefixes is missing, or if none of the xsi:types is used.
+    """
+
+    prefixes: List[str]
+    missing_prefix_summary: str
+    xsi_types: List[str] = field(default_factory=list)
+    missing_xsi_type_summary: Optional[str] = None
+
+
+# Families are named after the rule uids, e.g. "state_machine" for
+# asam.net:otx:1.0.0:state_machine.chk_001.no_procedure_realization
+FAMILY_REQUIREMENTS = {
+    "zip_file": FamilyRequirement(
+        prefixes=["xsi", "zip"],
+        missing_prefix_summary="xsi is not in nsmap or zip is not in nsmap. Skip the check.",
+        xsi_types=["zip:ZipFile", "zip:UnZipFile"],
+        missing_xsi_type_summary="No ZipFile or UnZipFile action found. Skip the check.",
+    ),
+    "state_machine": FamilyRequirement(
+        prefixes=["smp"],
+        missing_prefix_summary="No state machine procedure prefix 'smp' found in document namespaces. Skip the check.",
+        xsi_types=["smp:StateMachineProcedure"],
+        missing_xsi_type_summary="State machine procedures not found. Skip the check.",
+    ),
+}
+
+
+def get_rule_family(rule_uid: str) -> str:
+    """Family of a rule, e.g. "core" for asam.net:otx:1.0.0:core.chk_001.name."""
+    return rule_uid.split(":")[-1].split(".")[0]
+
+
+def get_family_skip_reasons(
+    tree: Optional[etree._ElementTree], document_index: models.DocumentIndex
+) -> Dict[str, str]:
+    """Check the family requirements once per document, from the namespaces of the
+    root element and the xsi:types of the document index.
+
+    Returns:
+        Dict[str, str]: the summary of each family to skip, by family name
+    """
+    if tree is None:
+        return dict()
+
+    nsmap = utils.get_namespace_map(tree)
+    skip_reasons = dict()
+    for family, requirement in FAMILY_REQUIREMENTS.items():
+        if any(x not in nsmap for x in requirement.prefixes):
+            skip_reasons[family] = requirement.missing_prefix_summary
+        elif len(requirement.xsi_types) > 0 and not any(
+            x in document_index.elements_by_xsi_type for x in requirement.xsi_types
+        ):
+            skip_reasons[family] = requirement.missing_xsi_type_summary
+
+    return skip_reasons
@@ -0,0 +1,90 @@
+# SPDX-License-Identifier: MPL-2.0
+# Copyright 2024, ASAM e.V.
+# This Source Code Form is subject to the terms of the Mozilla
+# Public License, v. 2.0. If a copy of the MPL was not distributed
+# with this file, You can obtain one at https://mozilla.org/MPL/2.0/.
+
+from typing import Dict, Tuple, Union
+
+from lxml import etree
+
+# Sibling counter key of the elements in a default namespace. libxml2 writes them
+# as "*" in element paths and numbers them among all their sibling elements.
+GENERIC_PATH_KEY = "*"
+
+
+def get_path_step(element: etree._Element) -> Tuple[str, Union[str, Tuple[str, str]]]:
+    """Label of an element in a path and the key its index is counted by among
+    its siblings.
+    """
+    qname = etree.QName(element)
+    if qname.namespace is None:
+        return qname.localname, ("", qname.localname)
+    if element.prefix is None:
+        return GENERIC_PATH_KEY, GENERIC_PATH_KEY
+    label = element.prefix + ":" + qname.localname
+    return label, (element.prefix, qname.localname)
+
+
+class ElementLocator:
+    """Paths of the elements of a parsed document, in the format of
+    etree._ElementTree.getpath.
+
+    Checkers keep element references and only ask for a path when they register
+    an issue. Paths are computed on first use and cached. The steps of all the
+    children of a parent are numbered in a single pass, so locating many
+    siblings does not rescan them for each one, unlike getpath.
+
+    Locations may also be streaming.ElementPath objects, which are turned into
+    strings as they are.
+    """
+
+    def __init__(self):
+        self._paths: Dict[etree._Element, str] = dict()
+
+    def get_path(self, location) -> str:
+        if not isinstance(location, etree._Element):
+            return str(location)
+
+        path = self._paths.get(location)
+        if path is not None:
+            return path
+
+        # Locate the closest located ancestor, then number the steps downwards
+        ancestors = []
+        current = location
+        while current is not None and current not in self._paths:
+            ancestors.append(current)
+            current = current.getparent()
+
+        for element in reversed(ancestors):
+            parent = element.getparent()
+            if parent is None:
+                self._paths[element] = "/" + get_path_step(element)[0]
+            else:
+                self._add_child_paths(parent)
+
+        return self._paths[location]
+
+    def _add_child_paths(self, parent: etree._Element) -> None:
+        parent_path = self._paths[parent]
+        children = [(x, *get_path_step(x)) for x in parent.iterchildren(etree.Element)]
+
+        sibling_counts = dict()
+        for _, _, key in children:
+            sibling_counts[GENERIC_PATH_KEY] = (
+                sibling_counts.get(GENERIC_PATH_KEY, 0) + 1
+            )
+            if key != GENERIC_PATH_KEY:
+                sibling_counts[key] = sibling_counts.get(key, 0) + 1
+
+        indexes = dict()
+        for child, label, key in children:
+            indexes[GENERIC_PATH_KEY] = indexes.get(GENERIC_PATH_KEY, 0) + 1
+            if key != GENERIC_PATH_KEY:
+                indexes[key] = indexes.get(key, 0) + 1
+
+            if sibling_counts[key] == 1:
+                self._paths[child] = f"{parent_path}/{label}"
+            else:
+                self._paths[child] = f"{parent_path}/{label}[{indexes[key]}]"
@@ -4,24 +4,184 @@
 # Public License, v. 2.0. If a copy of the MPL was not distributed
 # with this file, You can obtain one at https://mozilla.org/MPL/2.0/.
 
-from dataclasses import dataclass
+import os
+from dataclasses import dataclass, field
 from lxml import etree
-from typing import Union, List, Optional
+from typing import Union, List, Optional, Dict, Set, Tuple
 
-from qc_baselib import Configuration, Result
+from qc_baselib import Configuration, IssueSeverity, Result, StatusType
 
-
-@dataclass
-class QueueNode:
-    element: etree._ElementTree
-    xpath: Optional[str]
+from qc_otx.checks import locations
 
 
 @dataclass
 class AttributeInfo:
+    """Attribute of an element. The location is the element itself, or its
+    streaming.ElementPath when the document is streamed. Its path is looked up
+    with ElementLocator.get_path only when an issue is registered.
+    """
+
     name: str
     value: str
-    xpath: str
+    location: object
+
+
+@dataclass
+class DocumentIndex:
+    """Lookup tables of the input document, built in a single traversal.
+
+    Tags are stored in Clark notation ("{namespace}tag"), exactly as lxml
+    reports them. Every list keeps the elements in document order.
+    """
+
+    elements_by_tag: Dict[str, List[etree._Element]]
+    elements_by_xsi_type: Dict[str, List[etree._Element]]
+    elements_by_name: Dict[str, List[etree._Element]]
+    import_nodes: List[etree._Element]
+    attributes: Dict[str, List[etree._Element]]
+
+
+@dataclass
+class DocumentHeader:
+    """Attributes and namespaces of the <otx> root element of a document."""
+
+    name: Optional[str]
+    package: Optional[str]
+    version: Optional[str]
+    nsmap: Dict[Optional[str], str]
+
+
+@dataclass
+class PackageIndex:
+    """OTX documents found under a package root folder, by the "package.name" of
+    their root element. Each file is indexed with the (mtime_ns, size) it had when
+    it was read, so that only changed files are read again. All paths are absolute.
+    """
+
+    package_root: str
+    file_stats: Dict[str, Tuple[int, int]] = field(default_factory=dict)
+    dot_names: Dict[str, Optional[str]] = field(default_factory=dict)
+    files_by_dot_name: Dict[str, List[str]] = field(default_factory=dict)
+
+
+@dataclass
+class ImportedDocument:
+    """Metadata of a document reachable through <import> elements. imports holds
+    the absolute paths its own <import> elements resolve to. The file is read
+    again if its (mtime_ns, size) changes.
+    """
+
+    file_path: str
+    file_stat: Optional[Tuple[int, int]]
+    exists: bool
+    data_model_version: Optional[str] = None
+    imports: List[str] = field(default_factory=list)
+    error: Optional[str] = None
+
+
+@dataclass
+class ImportGraph:
+    """Documents reachable through <import> elements by absolute file path. Each
+    document is read once, however many documents import it.
+    """
+
+    documents: Dict[str, ImportedDocument] = field(default_factory=dict)
+
+
+@dataclass
+class StructureSymbolTable:
+    """Structure signatures and structure typed declarations of a document.
+
+    signatures maps each signature name to the names of its elements. Variables,
+    constants and parameters declared in a procedure are looked up in the scope
+    of their procedure first, then among the declarations outside procedures.
+    """
+
+    signatures: Dict[str, Set[str]] = field(default_factory=dict)
+    global_types: Dict[str, str] = field(default_factory=dict)
+    procedure_types: Dict[etree._Element, Dict[str, str]] = field(default_factory=dict)
+
+    def get_structure_type(self, name: str, element: etree._Element) -> Optional[str]:
+        """Structure type of the declaration called name that is visible from element."""
+        procedure = next(element.iterancestors("procedure"), None)
+        if procedure is not None:
+            structure_type = self.procedure_types.get(procedure, {}).get(name)
+            if structure_type is not None:
+                return structure_type
+        return self.global_types.get(name)
+
+
+@dataclass
+class DocumentModels:
+    """Models of the input document that several checkers need. Each one is built
+    on first use by its utils getter and then shared by all the checkers of the run.
+    """
+
+    structure_symbols: Optional[StructureSymbolTable] = None
+    # State machine of each StateMachineProcedure element, None if it has no valid realisation
+    state_machines: Optional[Dict[etree._Element, Optional["StateMachine"]]] = None
+    state_machine_findings: Optional["StateMachineFindings"] = None
+
+
+@dataclass
+class CheckerCache:
+    """Data read from other files than the input document. The cache can be shared
+    by several calls of run_checks, e.g. when validating many documents in one process.
+    All keys are absolute file paths.
+    """
+
+    import_graph: ImportGraph = field(default_factory=ImportGraph)
+    package_indexes: Dict[str, PackageIndex] = field(default_factory=dict)
+
+
+@dataclass
+class InputDependencies:
+    """Files and directories other than the input document read by the checkers.
+    A result is only valid as long as they do not change. All paths are absolute.
+
+    files are compared by content hash, so they should only hold the documents
+    imported directly by the input document. stat_files are compared by their
+    (mtime_ns, size), which is enough for the other documents of the package.
+    """
+
+    files: Set[str] = field(default_factory=set)
+    stat_files: Set[str] = field(default_factory=set)
+    directories: Set[str] = field(default_factory=set)
+
+
+@dataclass
+class IssueRecord:
+    description: str
+    level: IssueSeverity
+    rule_uid: str
+    # List of (xpaths, description) pairs
+    xml_locations: List[Tuple[List[str], str]]
+
+
+@dataclass
+class CheckerRecord:
+    """Plain data copy of a checker result, which can be pickled or stored as JSON."""
+
+    checker_id: str
+    description: str
+    summary: str
+    status: Optional[StatusType]
+    rule_uids: List[str]
+    issues: List[IssueRecord]
+
+
+@dataclass
+class CheckerProfile:
+    """Resources used by a single checker. peak_memory is the increase of the
+    traced memory in bytes, None if tracemalloc is not tracing.
+    """
+
+    checker_id: str
+    rule_uid: str
+    wall_time: float
+    cpu_time: float
+    peak_memory: Optional[int]
+    issue_count: int
 
 
 @dataclass
@@ -30,6 +190,56 @@ class CheckerData:
     config: Configuration
     result: Result
     schema_version: str
+    document_index: DocumentIndex
+    cache: CheckerCache = field(default_factory=CheckerCache)
+    dependencies: InputDependencies = field(default_factory=InputDependencies)
+    # Profile of each executed checker by checker id. Checkers are not profiled if None.
+    profiles: Optional[Dict[str, CheckerProfile]] = None
+    # Models and paths of the input document, built on first use and shared by all checkers
+    document_models: DocumentModels = field(default_factory=DocumentModels)
+    locator: locations.ElementLocator = field(default_factory=locations.ElementLocator)
+    # In fail-fast mode, the lowest severity that ends the checks of the document
+    fail_fast_severity: Optional[IssueSeverity] = None
+
+    def is_fail_fast_issue(self, level: IssueSeverity) -> bool:
+        """Whether an issue of this level ends the checks in fail-fast mode. A
+        checker stops looking for more issues once it registered one.
+        """
+        return (
+            self.fail_fast_severity is not None
+            and level.value <= self.fail_fast_severity.value
+        )
+
+    # Paths of other documents are resolved against the folder of the input file,
+    # never against the working directory, so that checkers can run concurrently.
+
+    def get_input_directory(self) -> str:
+        """Absolute path of the folder of the input file."""
+        input_file_path = self.config.get_config_param("InputFile")
+        return os.path.dirname(os.path.abspath(input_file_path))
+
+    def get_package_root(self, package_name: str) -> str:
+        """Absolute path of the root folder of a package, e.g. <root>/a for the
+        package "a.b.c", assuming that the input file is stored in the folder of
+        its package.
+        """
+        package_splits = package_name.split(".")
+        return os.path.normpath(
+            os.path.join(
+                self.get_input_directory(),
+                *([os.pardir] * len(package_splits)),
+                package_splits[0],
+            )
+        )
+
+    def resolve_import(self, document: str) -> str:
+        """Absolute path of the document imported by an <import> element. Imported
+        documents are looked up in the folder of the input file, following the
+        recommendation to only use references inside the same package.
+        """
+        return os.path.abspath(
+            os.path.join(self.get_input_directory(), document + ".otx")
+        )
 
 
 @dataclass
@@ -65,3 +275,25 @@ class StateMachine:
     name: str
     states: List[SMState]
     xml_element: etree._Element
+    # The <smp:realisation> element of the procedure
+    realisation: Optional[etree._Element] = None
+
+
+@dataclass
+class StateMachineFindings:
+    """Elements violating the StateMachine_Chk001 to StateMachine_Chk006 rules,
+    collected in a single pass over the StateMachineProcedures. Each list keeps
+    the order of the procedures and of their states, and is reported by the
+    checker of its rule.
+    """
+
+    # (procedure, its otx:realisation) of the procedures with a ProcedureRealisation
+    procedure_realisations: List[Tuple[etree._Element, etree._Element]] = field(
+        default_factory=list
+    )
+    states_without_target: List[SMState] = field(default_factory=list)
+    completed_states_with_target: List[SMState] = field(default_factory=list)
+    states_without_trigger: List[SMState] = field(default_factory=list)
+    states_without_transition: List[SMState] = field(default_factory=list)
+    # smp:realisation elements whose initialState and completedState are equal
+    undistinguished_realisations: List[etree._Element] = field(default_factory=list)
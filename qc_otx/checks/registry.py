@@ -0,0 +1,273 @@
+# SPDX-License-Identifier: MPL-2.0
+# Copyright 2024, ASAM e.V.
+# This Source Code Form is subject to the terms of the Mozilla
+# Public License, v. 2.0. If a copy of the MPL was not distributed
+# with this file, You can obtain one at https://mozilla.org/MPL/2.0/.
+
+import importlib
+import importlib.metadata
+import logging
+import types
+from typing import Iterable, List, Optional, Set
+
+# Entry point group of the rule packs of other distributions. An entry point
+# refers either to a checker module or to a list of CheckerEntry, e.g.
+#   [tool.poetry.plugins."qc_otx.checkers"]
+#   acme = "acme_otx_rules.registry:CHECKERS"
+# With CheckerEntry, the checker modules of the pack are only imported when
+# their rule is run.
+ENTRY_POINT_GROUP = "qc_otx.checkers"
+
+
+class CheckerEntry:
+    """Metadata of a checker module, with the interface of the module.
+
+    The metadata is enough to select, schedule and skip the checker. The module
+    is imported on the first access to any other attribute, such as check_rule
+    or StreamChecker, so that the modules of the rules that are not run are
+    never imported.
+
+    distribution names the distribution and version of a plugin checker, None
+    for the checkers of this bundle.
+    """
+
+    def __init__(
+        self,
+        module_name: str,
+        checker_id: str,
+        checker_description: str,
+        rule_uid: str,
+        checker_preconditions: Optional[Set[str]] = None,
+        distribution: Optional[str] = None,
+    ):
+        self.__name__ = module_name
+        self.CHECKER_ID = checker_id
+        self.CHECKER_DESCRIPTION = checker_description
+        self.CHECKER_PRECONDITIONS = (
+            set() if checker_preconditions is None else checker_preconditions
+        )
+        self.RULE_UID = rule_uid
+        self.distribution = distribution
+        self._module: Optional[types.ModuleType] = None
+
+    def load(self) -> types.ModuleType:
+        if self._module is None:
+            self._module = importlib.import_module(self.__name__)
+        return self._module
+
+    def __getattr__(self, name: str):
+        # Only called for the attributes not set in __init__
+        if name.startswith("_"):
+            raise AttributeError(name)
+        return getattr(self.load(), name)
+
+    def __repr__(self) -> str:
+        return f"CheckerEntry({self.__name__!r})"
+
+
+def create_checker_entry(
+    module: types.ModuleType, distribution: Optional[str] = None
+) -> CheckerEntry:
+    """Entry of an already imported checker module."""
+    checker_entry = CheckerEntry(
+        module_name=module.__name__,
+        checker_id=module.CHECKER_ID,
+        checker_description=module.CHECKER_DESCRIPTION,
+        rule_uid=module.RULE_UID,
+        checker_preconditions=module.CHECKER_PRECONDITIONS,
+        distribution=distribution,
+    )
+    checker_entry._module = module
+    return checker_entry
+
+
+# All the checkers of the bundle, in rule order. The issues of the checkers are
+# reported in this order, whatever the order of execution. The metadata is
+# checked against the checker modules by the tests.
+BUILTIN_CHECKERS = [
+    # 1. Basic checks
+    CheckerEntry(
+        module_name="qc_otx.checks.core_checker.document_name_matches_filename",
+        checker_id="check_asam_otx_core_chk_001_document_name_matches_filename",
+        checker_description="For OTX documents stored in a file system, the attribute name of the <otx> root element should match the filename of the containing file (without the extension '.otx').",
+        rule_uid="asam.net:otx:1.0.0:core.chk_001.document_name_matches_filename",
+    ),
+    CheckerEntry(
+        module_name="qc_otx.checks.core_checker.document_name_package_uniqueness",
+        checker_id="check_asam_otx_core_chk_002_document_name_package_uniqueness",
+        checker_description="The value of the <otx> attribute name shall be unique within the scope of all OTX documents belonging to the same package.",
+        rule_uid="asam.net:otx:1.0.0:core.chk_002.document_name_package_uniqueness",
+    ),
+    CheckerEntry(
+        module_name="qc_otx.checks.core_checker.no_dead_import_links",
+        checker_id="check_asam_otx_core_chk_003_no_dead_import_links",
+        checker_description="Imported OTX documents (referenced by package name and document name via <import> elements) should exist and should be accessible.",
+        rule_uid="asam.net:otx:1.0.0:core.chk_003.no_dead_import_links",
+    ),
+    CheckerEntry(
+        module_name="qc_otx.checks.core_checker.no_unused_imports",
+        checker_id="check_asam_otx_core_chk_004_no_unused_imports",
+        checker_description="An imported OTX document should be used at least once in the importing document.",
+        rule_uid="asam.net:otx:1.0.0:core.chk_004.no_unused_imports",
+    ),
+    CheckerEntry(
+        module_name="qc_otx.checks.core_checker.no_use_of_undefined_import_prefixes",
+        checker_id="check_asam_otx_core_chk_005_no_use_of_undefined_import_prefixes",
+        checker_description="If an imported name is accessed by prefix in an OtxLink type attribute, the corresponding prefix definition shall exist in an <import> element.",
+        rule_uid="asam.net:otx:1.0.0:core.chk_005.no_use_of_undefined_import_prefixes",
+    ),
+    CheckerEntry(
+        module_name="qc_otx.checks.core_checker.match_of_imported_document_data_model_version",
+        checker_id="check_asam_otx_core_chk_006_match_of_imported_document_data_model_version",
+        checker_description="An imported OTX document (imported by an <import> element) shall be bound to the same data model version as the importing document.",
+        rule_uid="asam.net:otx:1.0.0:core.chk_006.match_of_imported_document_data_model_version",
+    ),
+    CheckerEntry(
+        module_name="qc_otx.checks.core_checker.have_specification_if_no_realisation_exists",
+        checker_id="check_asam_otx_core_chk_007_have_specification_if_no_realisation_exists",
+        checker_description="For all elements with specification and realisation parts in an OTX document: if there is no <realisation> given, the according <specification> element should exist and have content (no empty string).",
+        rule_uid="asam.net:otx:1.0.0:core.chk_007.have_specification_if_no_realisation_exists",
+    ),
+    CheckerEntry(
+        module_name="qc_otx.checks.core_checker.public_main_procedure",
+        checker_id="check_asam_otx_core_chk_008_public_main_procedure",
+        checker_description="he value of <procedure> attribute visibility shall always be 'PUBLIC' if the procedure name is 'main'.",
+        rule_uid="asam.net:otx:1.0.0:core.chk_008.public_main_procedure",
+    ),
+    CheckerEntry(
+        module_name="qc_otx.checks.core_checker.mandatory_constant_initialization",
+        checker_id="check_asam_otx_core_chk_009_mandatory_constant_initialization",
+        checker_description="Constant declarations shall always be initialized.",
+        rule_uid="asam.net:otx:1.0.0:core.chk_009.mandatory_constant_initialization",
+    ),
+    CheckerEntry(
+        module_name="qc_otx.checks.core_checker.unique_node_names",
+        checker_id="check_asam_otx_core_chk_010_unique_node_names",
+        checker_description="The value of a nodes name attribute should be unique among all nodes in a procedure.",
+        rule_uid="asam.net:otx:1.0.0:core.chk_010.unique_node_names",
+    ),
+    # 2. Data type checks
+    CheckerEntry(
+        module_name="qc_otx.checks.data_type_checker.accessing_structure_elements",
+        checker_id="check_asam_otx_data_type_chk_001_accessing_structure_elements",
+        checker_description="Accessing structure elements is only allowed via StepByName using matching string literals.",
+        rule_uid="asam.net:otx:1.0.0:data_type.chk_001.accessing_structure_elements",
+    ),
+    CheckerEntry(
+        module_name="qc_otx.checks.data_type_checker.correct_target_for_structure_element",
+        checker_id="check_asam_otx_data_type_chk_008_correct_target_for_structure_element",
+        checker_description="When referring to a structure element, an existing <element> name of the referenced StructureSignature shall be used.",
+        rule_uid="asam.net:otx:1.0.0:data_type.chk_008.correct_target_for_structure_element",
+    ),
+    # 3. Zip file checks
+    CheckerEntry(
+        module_name="qc_otx.checks.zip_file_checker.type_safe_zip_file",
+        checker_id="check_asam_otx_zip_file_chk_002_type_safe_zip_file",
+        checker_description="In a ZipFile action, the list described by ListTerm <extensions> shall have a data type of <String>.",
+        rule_uid="asam.net:otx:1.0.0:zip_file.chk_002.type_safe_zip_file",
+    ),
+    CheckerEntry(
+        module_name="qc_otx.checks.zip_file_checker.type_safe_unzip_file",
+        checker_id="check_asam_otx_zip_file_chk_001_type_safe_unzip_file",
+        checker_description="In an UnZipFile action, the list described by ListTerm <extensions> shall have a data type of <String>.",
+        rule_uid="asam.net:otx:1.0.0:zip_file.chk_001.type_safe_unzip_file",
+    ),
+    # 4. State machine checks
+    CheckerEntry(
+        module_name="qc_otx.checks.state_machine_checker.no_procedure_realization",
+        checker_id="check_asam_otx_state_machine_chk_001_no_procedure_realization",
+        checker_description="A StateMachineProcedure shall not have a ProcedureRealisation.",
+        rule_uid="asam.net:otx:1.0.0:state_machine.chk_001.no_procedure_realization",
+    ),
+    CheckerEntry(
+        module_name="qc_otx.checks.state_machine_checker.mandatory_target_state",
+        checker_id="check_asam_otx_state_machine_chk_002_mandatory_target_state",
+        checker_description="Each state except the completed state shall have a target state.",
+        rule_uid="asam.net:otx:1.0.0:state_machine.chk_002.mandatory_target_state",
+    ),
+    CheckerEntry(
+        module_name="qc_otx.checks.state_machine_checker.no_target_state_for_completed_state",
+        checker_id="check_asam_otx_state_machine_chk_003_no_target_state_for_completed_state",
+        checker_description="After finishing the completed state the procedure is finished and shall return to the caller. Therefore the completed state shall not have a target state.",
+        rule_uid="asam.net:otx:1.0.0:state_machine.chk_003.no_target_state_for_completed_state",
+    ),
+    CheckerEntry(
+        module_name="qc_otx.checks.state_machine_checker.mandatory_transition",
+        checker_id="check_asam_otx_state_machine_chk_005_mandatory_transition",
+        checker_description="Each state except the completed state shall have at least one transition.",
+        rule_uid="asam.net:otx:1.0.0:state_machine.chk_005.mandatory_transition",
+    ),
+    CheckerEntry(
+        module_name="qc_otx.checks.state_machine_checker.mandatory_trigger",
+        checker_id="check_asam_otx_state_machine_chk_004_mandatory_trigger",
+        checker_description="Each state except the completed state shall have at least one trigger.",
+        rule_uid="asam.net:otx:1.0.0:state_machine.chk_004.mandatory_trigger",
+    ),
+    CheckerEntry(
+        module_name="qc_otx.checks.state_machine_checker.distinguished_initial_and_completed_state",
+        checker_id="check_asam_otx_state_machine_chk_006_distinguished_initial_and_completed_state",
+        checker_description="The values of the mandatory initialState and optional completedState attributes shall be distinguished.",
+        rule_uid="asam.net:otx:1.0.0:state_machine.chk_006.distinguished_initial_and_completed_state",
+    ),
+]
+
+
+def load_plugin_checkers(
+    entry_points: Optional[Iterable[importlib.metadata.EntryPoint]] = None,
+) -> List[CheckerEntry]:
+    """Load the checker entries of the ENTRY_POINT_GROUP entry points, in the order
+    of the entry point names. An entry point that fails to load is logged and
+    ignored, so that a broken rule pack does not stop the checks of the bundle.
+    """
+    if entry_points is None:
+        entry_points = importlib.metadata.entry_points(group=ENTRY_POINT_GROUP)
+
+    checkers = []
+    for entry_point in sorted(entry_points, key=lambda x: x.name):
+        distribution = None
+        if entry_point.dist is not None:
+            distribution = f"{entry_point.dist.name} {entry_point.dist.version}"
+
+        try:
+            value = entry_point.load()
+        except Exception:
+            logging.exception(f"Cannot load the checkers of entry point {entry_point}.")
+            continue
+
+        if isinstance(value, types.ModuleType):
+            checkers.append(create_checker_entry(value, distribution))
+            continue
+
+        for checker in value:
+            if isinstance(checker, types.ModuleType):
+                checker = create_checker_entry(checker, distribution)
+            elif checker.distribution is None:
+                checker.distribution = distribution
+            checkers.append(checker)
+
+    return checkers
+
+
+_checkers: Optional[List[CheckerEntry]] = None
+
+
+def get_checkers() -> List[CheckerEntry]:
+    """The checkers of the bundle followed by the plugin checkers. The entry
+    points are read once per process. Plugin checkers with the id of another
+    checker are ignored.
+    """
+    global _checkers
+    if _checkers is None:
+        checkers = list(BUILTIN_CHECKERS)
+        checker_ids = set(x.CHECKER_ID for x in checkers)
+        for checker in load_plugin_checkers():
+            if checker.CHECKER_ID in checker_ids:
+                logging.error(
+                    f"Ignoring the plugin checker {checker.CHECKER_ID} of {checker.distribution}, its id is already registered."
+                )
+                continue
+            checker_ids.add(checker.CHECKER_ID)
+            checkers.append(checker)
+        _checkers = checkers
+
+    return _checkers
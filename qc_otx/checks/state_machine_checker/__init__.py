@@ -4,11 +4,21 @@
 # Public License, v. 2.0. If a copy of the MPL was not distributed
 # with this file, You can obtain one at https://mozilla.org/MPL/2.0/.
 
-from . import no_procedure_realization as no_procedure_realization
-from . import mandatory_target_state as mandatory_target_state
-from . import no_target_state_for_completed_state as no_target_state_for_completed_state
-from . import mandatory_transition as mandatory_transition
-from . import mandatory_trigger as mandatory_trigger
-from . import (
-    distinguished_initial_and_completed_state as distinguished_initial_and_completed_state,
-)
+import importlib
+
+# The rule modules are imported on first access as attributes of the package,
+# so that importing the package does not import all of its rules
+RULE_MODULES = [
+    "no_procedure_realization",
+    "mandatory_target_state",
+    "no_target_state_for_completed_state",
+    "mandatory_transition",
+    "mandatory_trigger",
+    "distinguished_initial_and_completed_state",
+]
+
+
+def __getattr__(name: str):
+    if name in RULE_MODULES:
+        return importlib.import_module(f"{__name__}.{name}")
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -59,7 +59,9 @@ def check_rule(checker_data: models.CheckerData) -> None:
 
         return
 
-    state_machine_procedures = utils.get_state_machine_procedures(tree, nsmap)
+    state_machine_procedures = utils.get_state_machine_procedures(
+        checker_data.document_index
+    )
 
     if state_machine_procedures is None:
         checker_data.result.set_checker_status(
@@ -78,41 +80,25 @@ def check_rule(checker_data: models.CheckerData) -> None:
 
     logging.debug(f"state_machine_procedures: {state_machine_procedures}")
 
-    # smp = "state machine procedure"
-    for state_machine_procedure in state_machine_procedures:
+    findings = utils.get_state_machine_findings(checker_data)
 
-        state_machine = utils.get_state_machine(state_machine_procedure, nsmap)
-
-        if state_machine is None:
-            continue
-
-        smp_realisation = state_machine_procedure.xpath(
-            "./smp:realisation", namespaces=nsmap
+    for smp_realisation in findings.undistinguished_realisations:
+        current_xpath = tree.getelementpath(smp_realisation)
+        issue_id = checker_data.result.register_issue(
+            checker_bundle_name=constants.BUNDLE_NAME,
+            checker_id=CHECKER_ID,
+            description="initialState and completedState cannot be distinguished",
+            level=IssueSeverity.ERROR,
+            rule_uid=RULE_UID,
         )
-        logging.debug(f"smp_realisation: {smp_realisation}")
-
-        if smp_realisation is None or len(smp_realisation) != 1:
-            continue
 
-        smp_realisation = smp_realisation[0]
-
-        has_issue = smp_realisation.get("initialState") == smp_realisation.get(
-            "completedState"
+        checker_data.result.add_xml_location(
+            checker_bundle_name=constants.BUNDLE_NAME,
+            checker_id=CHECKER_ID,
+            issue_id=issue_id,
+            xpath=current_xpath,
+            description=f"State machine realisation cannot distinguish between initial and completed state",
         )
-        if has_issue:
-            current_xpath = tree.getelementpath(smp_realisation)
-            issue_id = checker_data.result.register_issue(
-                checker_bundle_name=constants.BUNDLE_NAME,
-                checker_id=CHECKER_ID,
-                description="initialState and completedState cannot be distinguished",
-                level=IssueSeverity.ERROR,
-                rule_uid=RULE_UID,
-            )
-
-            checker_data.result.add_xml_location(
-                checker_bundle_name=constants.BUNDLE_NAME,
-                checker_id=CHECKER_ID,
-                issue_id=issue_id,
-                xpath=current_xpath,
-                description=f"State machine realisation cannot distinguish between initial and completed state",
-            )
+
+        if checker_data.is_fail_fast_issue(IssueSeverity.ERROR):
+            return
@@ -53,7 +53,9 @@ def check_rule(checker_data: models.CheckerData) -> None:
 
         return
 
-    state_machine_procedures = utils.get_state_machine_procedures(tree, nsmap)
+    state_machine_procedures = utils.get_state_machine_procedures(
+        checker_data.document_index
+    )
 
     if state_machine_procedures is None:
         checker_data.result.set_checker_status(
@@ -72,30 +74,25 @@ def check_rule(checker_data: models.CheckerData) -> None:
 
     logging.debug(f"state_machine_procedures: {state_machine_procedures}")
 
-    # smp = "state machine procedure"
-    for state_machine_procedure in state_machine_procedures:
-
-        state_machine = utils.get_state_machine(state_machine_procedure, nsmap)
-
-        if state_machine is None:
-            continue
-
-        for sm_state in state_machine.states:
-            has_issue = not sm_state.is_completed and len(sm_state.triggers) == 0
-            if has_issue:
-                current_xpath = tree.getelementpath(sm_state.xml_element)
-                issue_id = checker_data.result.register_issue(
-                    checker_bundle_name=constants.BUNDLE_NAME,
-                    checker_id=CHECKER_ID,
-                    description="Non completed state has no triggers",
-                    level=IssueSeverity.ERROR,
-                    rule_uid=RULE_UID,
-                )
-
-                checker_data.result.add_xml_location(
-                    checker_bundle_name=constants.BUNDLE_NAME,
-                    checker_id=CHECKER_ID,
-                    issue_id=issue_id,
-                    xpath=current_xpath,
-                    description=f"State {sm_state.name} with id {sm_state.id} does not have any trigger",
-                )
+    findings = utils.get_state_machine_findings(checker_data)
+
+    for sm_state in findings.states_without_trigger:
+        current_xpath = tree.getelementpath(sm_state.xml_element)
+        issue_id = checker_data.result.register_issue(
+            checker_bundle_name=constants.BUNDLE_NAME,
+            checker_id=CHECKER_ID,
+            description="Non completed state has no triggers",
+            level=IssueSeverity.ERROR,
+            rule_uid=RULE_UID,
+        )
+
+        checker_data.result.add_xml_location(
+            checker_bundle_name=constants.BUNDLE_NAME,
+            checker_id=CHECKER_ID,
+            issue_id=issue_id,
+            xpath=current_xpath,
+            description=f"State {sm_state.name} with id {sm_state.id} does not have any trigger",
+        )
+
+        if checker_data.is_fail_fast_issue(IssueSeverity.ERROR):
+            return
@@ -50,7 +50,9 @@ def check_rule(checker_data: models.CheckerData) -> None:
 
         return
 
-    state_machine_procedures = utils.get_state_machine_procedures(tree, nsmap)
+    state_machine_procedures = utils.get_state_machine_procedures(
+        checker_data.document_index
+    )
     if state_machine_procedures is None:
         checker_data.result.set_checker_status(
             checker_bundle_name=constants.BUNDLE_NAME,
@@ -68,29 +70,26 @@ def check_rule(checker_data: models.CheckerData) -> None:
 
     logging.debug(f"state_machine_procedures: {state_machine_procedures}")
 
-    for state_machine_procedure in state_machine_procedures:
-        realisations = state_machine_procedure.xpath(
-            "./otx:realisation", namespaces=nsmap
+    findings = utils.get_state_machine_findings(checker_data)
+
+    for state_machine_procedure, realisation in findings.procedure_realisations:
+        current_xpath = tree.getelementpath(state_machine_procedure)
+        procedure_realisation_xpath = checker_data.locator.get_path(realisation)
+        issue_id = checker_data.result.register_issue(
+            checker_bundle_name=constants.BUNDLE_NAME,
+            checker_id=CHECKER_ID,
+            description="StateMachineProcedure has a ProcedureRealisation",
+            level=IssueSeverity.ERROR,
+            rule_uid=RULE_UID,
+        )
+
+        checker_data.result.add_xml_location(
+            checker_bundle_name=constants.BUNDLE_NAME,
+            checker_id=CHECKER_ID,
+            issue_id=issue_id,
+            xpath=current_xpath,
+            description=f"State machine {state_machine_procedure.get('id')} has a ProcedureRealisation at {procedure_realisation_xpath}",
         )
 
-        logging.debug(f"realisations: {realisations}")
-
-        has_issue = realisations is not None and len(realisations) != 0
-        if has_issue:
-            current_xpath = tree.getelementpath(state_machine_procedure)
-            procedure_realisation_xpath = tree.getpath(realisations[0])
-            issue_id = checker_data.result.register_issue(
-                checker_bundle_name=constants.BUNDLE_NAME,
-                checker_id=CHECKER_ID,
-                description="StateMachineProcedure has a ProcedureRealisation",
-                level=IssueSeverity.ERROR,
-                rule_uid=RULE_UID,
-            )
-
-            checker_data.result.add_xml_location(
-                checker_bundle_name=constants.BUNDLE_NAME,
-                checker_id=CHECKER_ID,
-                issue_id=issue_id,
-                xpath=current_xpath,
-                description=f"State machine {state_machine_procedure.get('id')} has a ProcedureRealisation at {procedure_realisation_xpath}",
-            )
+        if checker_data.is_fail_fast_issue(IssueSeverity.ERROR):
+            return
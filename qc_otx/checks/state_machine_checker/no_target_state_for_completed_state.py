@@ -54,7 +54,9 @@ def check_rule(checker_data: models.CheckerData) -> None:
 
         return
 
-    state_machine_procedures = utils.get_state_machine_procedures(tree, nsmap)
+    state_machine_procedures = utils.get_state_machine_procedures(
+        checker_data.document_index
+    )
 
     if state_machine_procedures is None:
         checker_data.result.set_checker_status(
@@ -73,38 +75,25 @@ def check_rule(checker_data: models.CheckerData) -> None:
 
     logging.debug(f"state_machine_procedures: {state_machine_procedures}")
 
-    # smp = "state machine procedure"
-    for state_machine_procedure in state_machine_procedures:
-
-        state_machine = utils.get_state_machine(state_machine_procedure, nsmap)
-
-        if state_machine is None:
-            continue
-
-        completed_state = None
-        for sm_state in state_machine.states:
-            if sm_state.is_completed:
-                completed_state = sm_state
-                break
-
-        if completed_state is None:
-            continue
-
-        has_issue = len(completed_state.target_state_ids) != 0
-        if has_issue:
-            current_xpath = tree.getelementpath(completed_state.xml_element)
-            issue_id = checker_data.result.register_issue(
-                checker_bundle_name=constants.BUNDLE_NAME,
-                checker_id=CHECKER_ID,
-                description="completed state has a target state",
-                level=IssueSeverity.WARNING,
-                rule_uid=RULE_UID,
-            )
-
-            checker_data.result.add_xml_location(
-                checker_bundle_name=constants.BUNDLE_NAME,
-                checker_id=CHECKER_ID,
-                issue_id=issue_id,
-                xpath=current_xpath,
-                description=f"Completed state {completed_state.name} with id {completed_state.id} has a target state but it should not",
-            )
+    findings = utils.get_state_machine_findings(checker_data)
+
+    for completed_state in findings.completed_states_with_target:
+        current_xpath = tree.getelementpath(completed_state.xml_element)
+        issue_id = checker_data.result.register_issue(
+            checker_bundle_name=constants.BUNDLE_NAME,
+            checker_id=CHECKER_ID,
+            description="completed state has a target state",
+            level=IssueSeverity.WARNING,
+            rule_uid=RULE_UID,
+        )
+
+        checker_data.result.add_xml_location(
+            checker_bundle_name=constants.BUNDLE_NAME,
+            checker_id=CHECKER_ID,
+            issue_id=issue_id,
+            xpath=current_xpath,
+            description=f"Completed state {completed_state.name} with id {completed_state.id} has a target state but it should not",
+        )
+
+        if checker_data.is_fail_fast_issue(IssueSeverity.WARNING):
+            return
@@ -0,0 +1,137 @@
+# SPDX-License-Identifier: MPL-2.0
+# Copyright 2024, ASAM e.V.
+# This Source Code Form is subject to the terms of the Mozilla
+# Public License, v. 2.0. If a copy of the MPL was not distributed
+# with this file, You can obtain one at https://mozilla.org/MPL/2.0/.
+
+import abc
+
+from typing import Dict, List, Optional, Tuple, Union
+
+from lxml import etree
+
+from qc_otx.checks import locations, models, utils
+
+
+class ElementPath:
+    """Path of an element read by stream_document, in the format of
+    etree._ElementTree.getpath.
+
+    The index of a path step depends on the following siblings of the element,
+    so the path can only be turned into a string once its parent element ended.
+    Holding an ElementPath does not keep the element alive.
+    """
+
+    __slots__ = ("parent", "label", "key", "index", "sibling_counts")
+
+    def __init__(
+        self,
+        parent: Optional["ElementPath"],
+        label: str,
+        key: Union[str, Tuple[str, str]],
+        index: int,
+        sibling_counts: Dict,
+    ):
+        self.parent = parent
+        self.label = label
+        self.key = key
+        self.index = index
+        self.sibling_counts = sibling_counts
+
+    def __str__(self) -> str:
+        steps = []
+        current = self
+        while current is not None:
+            if current.sibling_counts[current.key] == 1:
+                steps.append("/" + current.label)
+            else:
+                steps.append(f"/{current.label}[{current.index}]")
+            current = current.parent
+        return "".join(reversed(steps))
+
+
+class StreamChecker(abc.ABC):
+    """Streaming variant of a check_rule function. It receives the start and end
+    events of all the elements of the input document, in document order, and
+    registers its issues once the whole document was read.
+
+    On its start event, an element holds its attributes and its ancestors, but
+    not its content. On its end event, it also holds its content. Elements are
+    cleared after their end event, so they must not be kept by the checker.
+    """
+
+    def start(self, element: etree._Element, path: ElementPath) -> None:
+        pass
+
+    def end(self, element: etree._Element, path: ElementPath) -> None:
+        pass
+
+    @abc.abstractmethod
+    def check_rule(self, checker_data: models.CheckerData) -> None:
+        """Register the issues found in the events received."""
+
+
+def stream_document(
+    input_file: str, stream_checkers: List[StreamChecker]
+) -> Optional[str]:
+    """Read the input document with etree.iterparse and forward the element events
+    to the stream checkers. Memory use is proportional to the depth of the
+    document rather than to its size, since processed elements are cleared.
+
+    Returns:
+        Optional[str]: the schema version of the document, as read by
+            utils.get_standard_schema_version
+    """
+    schema_version = None
+    # Sibling counters of the open elements. The first entry counts the root.
+    sibling_counts_stack: List[Dict] = [dict()]
+    path_stack: List[ElementPath] = []
+    # Only the events handled by a checker are forwarded to it
+    start_checkers = [
+        x for x in stream_checkers if type(x).start is not StreamChecker.start
+    ]
+    end_checkers = [x for x in stream_checkers if type(x).end is not StreamChecker.end]
+
+    for event, element in etree.iterparse(input_file, events=("start", "end")):
+        if event == "start":
+            if len(path_stack) == 0:
+                schema_version = utils.get_standard_schema_version(
+                    element.getroottree()
+                )
+
+            label, key = locations.get_path_step(element)
+            sibling_counts = sibling_counts_stack[-1]
+            sibling_counts[locations.GENERIC_PATH_KEY] = (
+                sibling_counts.get(locations.GENERIC_PATH_KEY, 0) + 1
+            )
+            if key != locations.GENERIC_PATH_KEY:
+                sibling_counts[key] = sibling_counts.get(key, 0) + 1
+
+            path = ElementPath(
+                path_stack[-1] if len(path_stack) > 0 else None,
+                label,
+                key,
+                sibling_counts[key],
+                sibling_counts,
+            )
+            path_stack.append(path)
+            sibling_counts_stack.append(dict())
+
+            for stream_checker in start_checkers:
+                stream_checker.start(element, path)
+        else:
+            path = path_stack.pop()
+            sibling_counts_stack.pop()
+
+            for stream_checker in end_checkers:
+                stream_checker.end(element, path)
+
+            # Release the content of the element and its previous siblings. The
+            # element itself is kept, since its parent did not end yet.
+            element.clear(keep_tail=True)
+            parent = element.getparent()
+            if parent is not None:
+                while element.getprevious() is not None:
+                    del parent[0]
+
+    return schema_version
@@ -5,9 +5,12 @@
 # with this file, You can obtain one at https://mozilla.org/MPL/2.0/.
 
 from lxml import etree
-from typing import Optional, List, Dict
-from qc_otx.checks import models
+from typing import Optional, List, Dict, Iterable, Set, Tuple
+from qc_baselib import Result
+from qc_otx import constants
+from qc_otx.checks import models, xpaths
 import re
+import os
 import logging
 
 
@@ -21,52 +24,294 @@ def get_data_model_version(root: etree._Element):
     Returns:
         _type_: the read data model version. None if attribute xmlns is not found
     """
+    return get_nsmap_data_model_version(root.nsmap)
+
+
+def get_nsmap_data_model_version(nsmap: Dict[Optional[str], str]) -> Optional[str]:
+    """Get data model version from the namespaces of a root element, as in
+    get_data_model_version.
+    """
     xmlns_version = None
     xmlns_regex = "http://iso.org/OTX/*"
-    for key, value in root.nsmap.items():
+    for key, value in nsmap.items():
         if re.match(xmlns_regex, value):
             xmlns_version = value.replace(xmlns_regex[:-1], "")
             break
     return xmlns_version
 
 
-def get_all_attributes(
-    tree: etree._ElementTree, root: etree._Element
-) -> List[models.AttributeInfo]:
-    """Function to get all attributes in input xml document
+def read_document_header(file_path: str) -> models.DocumentHeader:
+    """Read the root element of an OTX document without parsing the rest of the
+    document. Parsing stops at the first start event, so only the first block
+    of the file is read, whatever the size of the document.
 
     Args:
-        tree (etree._ElementTree): the xml tree to analyse
-        root (etree._Element): the root node of the xml to analyse
+        file_path (str): the OTX document to read
+
+    Raises:
+        etree.XMLSyntaxError: if the document does not start with a valid root element
 
     Returns:
-        _type_: _description_
-    """
-    attributes = []
-    stack = [
-        models.QueueNode(root, tree.getpath(root))
-    ]  # Initialize stack with the root element
-
-    while stack:
-        current_node = stack.pop()
-        current_element = current_node.element
-        current_xpath = current_node.xpath
-
-        # Process attributes of the current element
-        for attr, value in current_element.attrib.items():
-            attributes.append(models.AttributeInfo(attr, value, current_xpath))
-
-        # Push children to the stack for further processing
-        stack.extend(
-            reversed(
-                [
-                    models.QueueNode(x, tree.getpath(x))
-                    for x in current_element.getchildren()
-                ]
+        models.DocumentHeader: the name, package, version and namespaces of the root element
+    """
+    with open(file_path, "rb") as file:
+        for _, element in etree.iterparse(file, events=("start",)):
+            return models.DocumentHeader(
+                name=element.get("name"),
+                package=element.get("package"),
+                version=element.get("version"),
+                nsmap=dict(element.nsmap),
             )
-        )
+    raise etree.XMLSyntaxError(f"No root element in {file_path}", None, 0, 0)
+
+
+def find_otx_files(directory: str) -> List[str]:
+    """Recursively find all OTX files in the given directory."""
+    otx_files = []
+    for root, _, files in os.walk(directory):
+        for file in files:
+            if file.endswith(".otx"):
+                otx_files.append(os.path.join(root, file))
+    return otx_files
+
+
+def get_package_dot_name(file: str) -> Optional[str]:
+    """Read the root element of an XML file and return its 'name' and `package` attributes
+    in the form: "package.name". None if the file cannot be parsed or an attribute is missing.
+    """
+    try:
+        header = read_document_header(file)
+        if header.package and header.name:
+            return header.package + "." + header.name
+    except etree.XMLSyntaxError:
+        logging.warning(f"Failed to parse XML file: {file}")
+    except Exception as e:
+        logging.warning(f"An error occurred while reading {file}: {e}")
+    return None
+
+
+def get_file_stat(file_path: str) -> Optional[Tuple[int, int]]:
+    try:
+        file_stat = os.stat(file_path)
+    except OSError:
+        return None
+    return (file_stat.st_mtime_ns, file_stat.st_size)
+
+
+def update_package_index(package_index: models.PackageIndex) -> None:
+    """Bring the package index up to date with the package root folder. Added and
+    changed files are read, removed files are dropped, and unchanged files are
+    kept without reading them again.
+    """
+    otx_files = set(find_otx_files(package_index.package_root))
+    changed = False
+
+    for file_path in list(package_index.file_stats):
+        if file_path not in otx_files:
+            del package_index.file_stats[file_path]
+            del package_index.dot_names[file_path]
+            changed = True
+
+    for file_path in otx_files:
+        file_stat = get_file_stat(file_path)
+        if file_stat is None or package_index.file_stats.get(file_path) == file_stat:
+            continue
+        package_index.file_stats[file_path] = file_stat
+        package_index.dot_names[file_path] = get_package_dot_name(file_path)
+        changed = True
+
+    if changed:
+        files_by_dot_name = dict()
+        for file_path in sorted(package_index.dot_names):
+            dot_name = package_index.dot_names[file_path]
+            if dot_name is not None:
+                files_by_dot_name.setdefault(dot_name, []).append(file_path)
+        package_index.files_by_dot_name = files_by_dot_name
+
+
+def get_package_index(
+    cache: models.CheckerCache, package_root: str
+) -> models.PackageIndex:
+    """Return the index of the package root folder, built on first use and then
+    shared through the cache. Call update_package_index to pick up later changes
+    to the package.
+    """
+    package_root = os.path.abspath(package_root)
+    if package_root not in cache.package_indexes:
+        package_index = models.PackageIndex(package_root=package_root)
+        update_package_index(package_index)
+        cache.package_indexes[package_root] = package_index
+    return cache.package_indexes[package_root]
+
 
-    return attributes
+# Children of the <otx> root element that can precede <imports>
+OTX_ELEMENTS_BEFORE_IMPORTS = {"specification", "metaData", "imports"}
+
+
+def read_document_imports(
+    file_path: str,
+) -> Tuple[models.DocumentHeader, List[Dict[str, str]]]:
+    """Read the root element and the <import> elements of an OTX document. Parsing
+    stops at the first child of the root element that follows <imports>, so the
+    procedures and declarations of the document are not read.
+
+    Raises:
+        etree.XMLSyntaxError: if the beginning of the document is not valid XML
+
+    Returns:
+        Tuple[models.DocumentHeader, List[Dict[str, str]]]: the root element and
+            the attributes of each <import> element
+    """
+    header = None
+    import_tag = None
+    imports = []
+    depth = 0
+
+    with open(file_path, "rb") as file:
+        for event, element in etree.iterparse(file, events=("start", "end")):
+            if event == "end":
+                depth -= 1
+                continue
+
+            depth += 1
+            if header is None:
+                header = models.DocumentHeader(
+                    name=element.get("name"),
+                    package=element.get("package"),
+                    version=element.get("version"),
+                    nsmap=dict(element.nsmap),
+                )
+                import_tag = get_import_tag(element)
+            elif (
+                depth == 2
+                and etree.QName(element).localname not in OTX_ELEMENTS_BEFORE_IMPORTS
+            ):
+                break
+            elif element.tag == import_tag:
+                imports.append(dict(element.attrib))
+
+    return header, imports
+
+
+def get_imported_document(
+    import_graph: models.ImportGraph, file_path: str
+) -> models.ImportedDocument:
+    """Return the metadata of a document of the import graph, reading it on first
+    use. A document that exists but cannot be parsed has an error and no data
+    model version or imports.
+    """
+    file_path = os.path.abspath(file_path)
+    if file_path in import_graph.documents:
+        return import_graph.documents[file_path]
+
+    file_stat = get_file_stat(file_path)
+    imported_document = models.ImportedDocument(
+        file_path=file_path, file_stat=file_stat, exists=os.path.exists(file_path)
+    )
+    if imported_document.exists:
+        try:
+            header, imports = read_document_imports(file_path)
+            imported_document.data_model_version = get_nsmap_data_model_version(
+                header.nsmap
+            )
+            # The imports of a document are resolved against its own folder
+            imported_document.imports = [
+                os.path.abspath(
+                    os.path.join(os.path.dirname(file_path), x["document"] + ".otx")
+                )
+                for x in imports
+                if x.get("document") is not None
+            ]
+        except etree.XMLSyntaxError as e:
+            imported_document.error = str(e)
+
+    import_graph.documents[file_path] = imported_document
+    return imported_document
+
+
+def update_import_graph(import_graph: models.ImportGraph) -> None:
+    """Drop the documents of the import graph whose file changed since they were
+    read, so that they are read again on next use.
+    """
+    for file_path, imported_document in list(import_graph.documents.items()):
+        if get_file_stat(file_path) != imported_document.file_stat:
+            del import_graph.documents[file_path]
+
+
+def find_import_cycles(
+    import_graph: models.ImportGraph,
+    file_paths: Iterable[str],
+    visited_files: Optional[Set[str]] = None,
+) -> List[List[str]]:
+    """Find the import cycles among the documents reachable from file_paths, with
+    an iterative version of Tarjan's strongly connected components algorithm.
+    The documents are read on first use, and each one is visited once.
+
+    Args:
+        import_graph (models.ImportGraph): the import graph to read the documents from
+        file_paths (Iterable[str]): the documents to start from
+        visited_files (Optional[Set[str]]): if given, receives the paths of all
+            the reachable documents
+
+    Returns:
+        List[List[str]]: the documents of each cycle, in import order
+    """
+    index_by_file = dict()
+    low_link = dict()
+    stack = []
+    on_stack = set()
+    cycles = []
+
+    for start_path in file_paths:
+        start_path = os.path.abspath(start_path)
+        if start_path in index_by_file:
+            continue
+
+        # Each frame holds a document and an iterator over its imports
+        work = [(start_path, None)]
+        while work:
+            file_path, imports = work[-1]
+            if imports is None:
+                index_by_file[file_path] = low_link[file_path] = len(index_by_file)
+                stack.append(file_path)
+                on_stack.add(file_path)
+                imports = iter(get_imported_document(import_graph, file_path).imports)
+                work[-1] = (file_path, imports)
+
+            next_path = next(imports, None)
+            if next_path is not None:
+                if next_path not in index_by_file:
+                    work.append((next_path, None))
+                elif next_path in on_stack:
+                    low_link[file_path] = min(
+                        low_link[file_path], index_by_file[next_path]
+                    )
+                continue
+
+            work.pop()
+            if work:
+                parent_path = work[-1][0]
+                low_link[parent_path] = min(low_link[parent_path], low_link[file_path])
+
+            if low_link[file_path] == index_by_file[file_path]:
+                component = []
+                while True:
+                    current_path = stack.pop()
+                    on_stack.discard(current_path)
+                    component.append(current_path)
+                    if current_path == file_path:
+                        break
+                component.reverse()
+                is_self_import = (
+                    file_path in get_imported_document(import_graph, file_path).imports
+                )
+                if len(component) > 1 or is_self_import:
+                    cycles.append(component)
+
+    if visited_files is not None:
+        visited_files.update(index_by_file)
+
+    return cycles
 
 
 def get_standard_schema_version(root: etree._ElementTree) -> Optional[str]:
@@ -116,7 +361,7 @@ def get_state_machine(input_node: etree._Element, nsmap: Dict) -> models.StateMa
     smp_id = input_node.get("id")
     smp_name = input_node.get("name")
 
-    smp_realisation = input_node.xpath("./smp:realisation", namespaces=nsmap)
+    smp_realisation = xpaths.get_xpath(xpaths.SMP_REALISATION, nsmap)(input_node)
     logging.debug(f"smp_realisation: {smp_realisation}")
 
     if smp_realisation is None or len(smp_realisation) != 1:
@@ -131,7 +376,14 @@ def get_state_machine(input_node: etree._Element, nsmap: Dict) -> models.StateMa
     logging.debug(f"initial_state_name: {initial_state_name}")
     logging.debug(f"completed_state_name: {completed_state_name}")
 
-    smp_states = smp_realisation.xpath("./smp:states/smp:state", namespaces=nsmap)
+    # The states, transitions and triggers are direct descendants, so they are
+    # read by walking the children of the realisation once
+    smp = "{" + nsmap["smp"] + "}"
+    smp_states = [
+        x
+        for states in smp_realisation.iterchildren(smp + "states")
+        for x in states.iterchildren(smp + "state")
+    ]
 
     logging.debug(f"smp_states: {smp_states}")
 
@@ -143,9 +395,11 @@ def get_state_machine(input_node: etree._Element, nsmap: Dict) -> models.StateMa
         is_initial = state_name == initial_state_name
         is_completed = state_name == completed_state_name
 
-        state_transitions = smp_state.xpath(
-            "./smp:transitions/smp:transition", namespaces=nsmap
-        )
+        state_transitions = [
+            x
+            for transitions in smp_state.iterchildren(smp + "transitions")
+            for x in transitions.iterchildren(smp + "transition")
+        ]
         transitions = []
         for state_transition in state_transitions:
             current_id = state_transition.get("id")
@@ -165,7 +419,11 @@ def get_state_machine(input_node: etree._Element, nsmap: Dict) -> models.StateMa
 
         logging.debug(f"transitions: {transitions}")
 
-        state_triggers = smp_state.xpath("./smp:triggers/smp:trigger", namespaces=nsmap)
+        state_triggers = [
+            x
+            for triggers in smp_state.iterchildren(smp + "triggers")
+            for x in triggers.iterchildren(smp + "trigger")
+        ]
         logging.debug(f"state_triggers: {state_triggers}")
 
         triggers = []
@@ -189,16 +447,270 @@ def get_state_machine(input_node: etree._Element, nsmap: Dict) -> models.StateMa
         sm_state_list.append(current_sm_state)
 
     state_machine_object = models.StateMachine(
-        smp_id, smp_name, sm_state_list, input_node
+        smp_id,
+        smp_name,
+        sm_state_list,
+        input_node,
+        smp_realisation,
     )
 
     return state_machine_object
 
 
-def get_state_machine_procedures(tree: etree._ElementTree, nsmap: Dict) -> List:
-    return tree.xpath("//*[@xsi:type='smp:StateMachineProcedure']", namespaces=nsmap)
+def get_state_machine_procedures(document_index: models.DocumentIndex) -> List:
+    return document_index.elements_by_xsi_type.get("smp:StateMachineProcedure", [])
+
+
+def get_state_machines(
+    checker_data: models.CheckerData,
+) -> Dict[etree._Element, Optional[models.StateMachine]]:
+    """Return the state machine of each StateMachineProcedure of the input document,
+    None for a procedure without a valid realisation. The state machines are built
+    on first use and then shared by the state machine checkers of the run.
+    """
+    document_models = checker_data.document_models
+    if document_models.state_machines is None:
+        nsmap = get_namespace_map(checker_data.input_file_xml_root)
+        document_models.state_machines = {
+            x: get_state_machine(x, nsmap)
+            for x in get_state_machine_procedures(checker_data.document_index)
+        }
+    return document_models.state_machines
+
+
+def evaluate_state_machines(
+    checker_data: models.CheckerData,
+) -> models.StateMachineFindings:
+    """Walk every StateMachineProcedure once and collect the violations of all
+    the state machine rules. The state machines come from get_state_machines.
+    """
+    nsmap = get_namespace_map(checker_data.input_file_xml_root)
+    otx_realisation_xpath = xpaths.get_xpath(xpaths.OTX_REALISATION, nsmap)
+    state_machines = get_state_machines(checker_data)
+    findings = models.StateMachineFindings()
+
+    for procedure, state_machine in state_machines.items():
+        realisations = otx_realisation_xpath(procedure)
+        if len(realisations) != 0:
+            findings.procedure_realisations.append((procedure, realisations[0]))
+
+        if state_machine is None:
+            continue
+
+        completed_state = None
+        for sm_state in state_machine.states:
+            if sm_state.is_completed:
+                if completed_state is None:
+                    completed_state = sm_state
+                continue
+            if len(sm_state.target_state_ids) == 0:
+                findings.states_without_target.append(sm_state)
+            if len(sm_state.triggers) == 0:
+                findings.states_without_trigger.append(sm_state)
+            if len(sm_state.transitions) == 0:
+                findings.states_without_transition.append(sm_state)
+
+        if completed_state is not None and len(completed_state.target_state_ids) != 0:
+            findings.completed_states_with_target.append(completed_state)
+
+        realisation = state_machine.realisation
+        if realisation.get("initialState") == realisation.get("completedState"):
+            findings.undistinguished_realisations.append(realisation)
+
+    return findings
+
+
+def get_state_machine_findings(
+    checker_data: models.CheckerData,
+) -> models.StateMachineFindings:
+    """Return the violations of the state machine rules, evaluated by the first
+    state machine checker of the run and reported by each checker for its rule.
+    """
+    document_models = checker_data.document_models
+    if document_models.state_machine_findings is None:
+        document_models.state_machine_findings = evaluate_state_machines(checker_data)
+    return document_models.state_machine_findings
 
 
 def get_namespace_map(tree: etree._ElementTree) -> Dict:
     root = tree.getroot()
     return {k: v for k, v in root.nsmap.items() if k is not None}
+
+
+def get_import_tag(root: etree._Element) -> str:
+    """Return the tag of the <import> elements, following the semantics of
+    root.findall(".//import", namespaces=root.nsmap).
+    """
+    default_namespace = root.nsmap.get(None)
+    return "{" + default_namespace + "}import" if default_namespace else "import"
+
+
+def get_document_position(element: etree._Element) -> Tuple[int, ...]:
+    """Sort key of an element in document order: the index of each of its
+    ancestors among their siblings, down to its own index.
+    """
+    position = []
+    parent = element.getparent()
+    while parent is not None:
+        position.append(parent.index(element))
+        element = parent
+        parent = element.getparent()
+    return tuple(reversed(position))
+
+
+def build_document_index(tree: etree._ElementTree) -> models.DocumentIndex:
+    """Index the input document in a single traversal so that checkers can look
+    up elements without walking the whole tree again.
+
+    Tags are indexed as reported by lxml, so a lookup for "procedure" matches
+    the XPath "//procedure" and a lookup for "{ns}procedure" matches the same
+    element in a default namespace. The import nodes follow the semantics of
+    root.findall(".//import", namespaces=root.nsmap).
+
+    Args:
+        tree (etree._ElementTree): the xml tree to index
+
+    Returns:
+        models.DocumentIndex: the lookup tables of the document
+    """
+    root = tree.getroot()
+    nsmap = get_namespace_map(tree)
+
+    xsi_type_attribute = None
+    if "xsi" in nsmap:
+        xsi_type_attribute = "{" + nsmap["xsi"] + "}type"
+
+    import_tag = get_import_tag(root)
+
+    elements_by_tag = dict()
+    elements_by_xsi_type = dict()
+    elements_by_name = dict()
+    attributes = dict()
+
+    for element in root.iter(tag=etree.Element):
+        elements_by_tag.setdefault(element.tag, []).append(element)
+
+        for attr in element.attrib.keys():
+            attributes.setdefault(attr, []).append(element)
+
+        name = element.get("name")
+        if name is not None:
+            elements_by_name.setdefault(name, []).append(element)
+
+        if xsi_type_attribute is not None:
+            xsi_type = element.get(xsi_type_attribute)
+            if xsi_type is not None:
+                elements_by_xsi_type.setdefault(xsi_type, []).append(element)
+
+    import_nodes = [x for x in elements_by_tag.get(import_tag, []) if x is not root]
+
+    return models.DocumentIndex(
+        elements_by_tag=elements_by_tag,
+        elements_by_xsi_type=elements_by_xsi_type,
+        elements_by_name=elements_by_name,
+        import_nodes=import_nodes,
+        attributes=attributes,
+    )
+
+
+# Declarations that can be typed with a StructureSignature
+STRUCTURE_DECLARATION_TAGS = {
+    "variable",
+    "constant",
+    "inParam",
+    "outParam",
+    "inoutParam",
+    "contextVariable",
+    "stateVariable",
+}
+
+
+def build_structure_symbol_table(
+    document_index: models.DocumentIndex,
+) -> models.StructureSymbolTable:
+    """Collect the structure signatures and the structure typed declarations of
+    the input document from its index.
+
+    The structure type of a declaration is the first structureType attribute
+    beneath it, so a list of structures is typed like a structure. Declarations
+    in a signature, e.g. the parameters of a procedure signature, are not
+    collected.
+    """
+    structure_elements_xpath = xpaths.get_xpath(xpaths.STRUCTURE_ELEMENTS)
+    symbol_table = models.StructureSymbolTable()
+
+    for signature in document_index.elements_by_tag.get("signature", []):
+        symbol_table.signatures[signature.get("name")] = {
+            x.get("name") for x in structure_elements_xpath(signature)
+        }
+
+    typed_declarations = set()
+    for typed_element in document_index.attributes.get("structureType", []):
+        declaration = next(
+            typed_element.iterancestors(*STRUCTURE_DECLARATION_TAGS), None
+        )
+        if declaration is None or declaration in typed_declarations:
+            continue
+        typed_declarations.add(declaration)
+
+        owner = next(declaration.iterancestors("procedure", "signature"), None)
+        if owner is None:
+            scope = symbol_table.global_types
+        elif owner.tag == "procedure":
+            scope = symbol_table.procedure_types.setdefault(owner, dict())
+        else:
+            continue
+        scope[declaration.get("name")] = typed_element.get("structureType")
+
+    return symbol_table
+
+
+def get_structure_symbol_table(
+    checker_data: models.CheckerData,
+) -> models.StructureSymbolTable:
+    """Return the structure symbol table of the input document, built on first use
+    and then shared by the checkers of the run.
+    """
+    document_models = checker_data.document_models
+    if document_models.structure_symbols is None:
+        document_models.structure_symbols = build_structure_symbol_table(
+            checker_data.document_index
+        )
+    return document_models.structure_symbols
+
+
+def serialize_result(result: Result) -> List[models.CheckerRecord]:
+    """Copy the checker results of the bundle into plain data records. Only the
+    xml locations of the issues are kept, which are the only ones used by the
+    checkers of this bundle.
+    """
+    checker_records = []
+    for checker in result.get_checker_results(constants.BUNDLE_NAME):
+        issue_records = []
+        for issue in checker.issues:
+            xml_locations = [
+                ([x.xpath for x in location.xml_location], location.description)
+                for location in issue.locations
+                if len(location.xml_location) > 0
+            ]
+            issue_records.append(
+                models.IssueRecord(
+                    description=issue.description,
+                    level=issue.level,
+                    rule_uid=issue.rule_uid,
+                    xml_locations=xml_locations,
+                )
+            )
+
+        checker_records.append(
+            models.CheckerRecord(
+                checker_id=checker.checker_id,
+                description=checker.description,
+                summary=checker.summary,
+                status=checker.status,
+                rule_uids=[x.rule_uid for x in checker.addressed_rule],
+                issues=issue_records,
+            )
+        )
+
+    return checker_records
@@ -0,0 +1,63 @@
+# SPDX-License-Identifier: MPL-2.0
+# Copyright 2024, ASAM e.V.
+# This Source Code Form is subject to the terms of the Mozilla
+# Public License, v. 2.0. If a copy of the MPL was not distributed
+# with this file, You can obtain one at https://mozilla.org/MPL/2.0/.
+
+import functools
+import re
+from typing import Dict, FrozenSet, Optional, Tuple
+
+from lxml import etree
+
+# Expressions evaluated on many elements of a document. They are compiled once
+# per namespace map by get_xpath instead of on every element.xpath call.
+SMP_REALISATION = "./smp:realisation"
+OTX_REALISATION = "./otx:realisation"
+LIST_LITERALS = ".//*[@xsi:type='ListLiteral']"
+TYPED_DESCENDANTS = ".//*[@xsi:type]"
+CONSTANT_INIT = ".//realisation/dataType/init"
+NAMED_DESCENDANTS = ".//*[@name]"
+STRUCTURE_ELEMENTS = ".//*[local-name()='element']"
+STRUCTURE_TYPES = ".//*[@structureType]"
+
+# Compiled expressions kept by get_xpath. Besides the expressions above, the
+# cache only grows with the namespace URIs of the prefixes they use.
+XPATH_CACHE_SIZE = 256
+
+# A name followed by a single colon, which is a namespace prefix, as opposed to
+# an axis such as child::
+_PREFIX_PATTERN = re.compile(r"(?<![\w.-])([A-Za-z_][\w.-]*):(?!:)")
+
+
+@functools.lru_cache(maxsize=XPATH_CACHE_SIZE)
+def _get_prefixes(expression: str) -> FrozenSet[str]:
+    return frozenset(_PREFIX_PATTERN.findall(expression))
+
+
+@functools.lru_cache(maxsize=XPATH_CACHE_SIZE)
+def _compile_xpath(
+    expression: str, namespaces: Tuple[Tuple[str, str], ...]
+) -> etree.XPath:
+    return etree.XPath(expression, namespaces=dict(namespaces))
+
+
+def get_xpath(expression: str, namespaces: Optional[Dict] = None) -> etree.XPath:
+    """Return the compiled XPath of an expression and namespace map. Compiled
+    expressions are kept in a bounded cache shared by all the checkers, so they
+    must not depend on the input document except through the namespace map.
+    Only the prefixes used by the expression are part of the cache key, so the
+    other namespaces declared by a document do not add entries.
+
+    Args:
+        expression (str): the XPath expression
+        namespaces (Optional[Dict]): the namespace map of the document
+
+    Returns:
+        etree.XPath: the compiled expression, to be called with the context element
+    """
+    prefixes = _get_prefixes(expression)
+    used_namespaces = tuple(
+        sorted(x for x in (namespaces or dict()).items() if x[0] in prefixes)
+    )
+    return _compile_xpath(expression, used_namespaces)
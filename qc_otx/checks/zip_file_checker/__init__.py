@@ -4,5 +4,17 @@
 # Public License, v. 2.0. If a copy of the MPL was not distributed
 # with this file, You can obtain one at https://mozilla.org/MPL/2.0/.
 
-from . import type_safe_zip_file as type_safe_zip_file
-from . import type_safe_unzip_file as type_safe_unzip_file
+import importlib
+
+# The rule modules are imported on first access as attributes of the package,
+# so that importing the package does not import all of its rules
+RULE_MODULES = [
+    "type_safe_zip_file",
+    "type_safe_unzip_file",
+]
+
+
+def __getattr__(name: str):
+    if name in RULE_MODULES:
+        return importlib.import_module(f"{__name__}.{name}")
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
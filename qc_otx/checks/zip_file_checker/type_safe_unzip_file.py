@@ -9,7 +9,7 @@ import logging
 from qc_baselib import IssueSeverity, StatusType
 
 from qc_otx import constants
-from qc_otx.checks import models
+from qc_otx.checks import models, xpaths
 
 
 CHECKER_ID = "check_asam_otx_zip_file_chk_001_type_safe_unzip_file"
@@ -53,14 +53,16 @@ def check_rule(checker_data: models.CheckerData) -> None:
 
         return
 
-    unzip_nodes = tree.xpath("//*[@xsi:type='zip:UnZipFile']", namespaces=nsmap)
+    unzip_nodes = checker_data.document_index.elements_by_xsi_type.get(
+        "zip:UnZipFile", []
+    )
 
     logging.debug(f"unzip_nodes {unzip_nodes}")
 
+    typed_descendants_xpath = xpaths.get_xpath(xpaths.TYPED_DESCENDANTS, nsmap)
+
     for unzip_node in unzip_nodes:
-        list_children = unzip_node.xpath(
-            ".//*[@xsi:type='ListLiteral']", namespaces=nsmap
-        )
+        list_children = xpaths.get_xpath(xpaths.LIST_LITERALS, nsmap)(unzip_node)
         logging.debug(f"list_children : {list_children}")
         if list_children is None or len(list_children) == 0:
             continue
@@ -68,7 +70,7 @@ def check_rule(checker_data: models.CheckerData) -> None:
         for current_list in list_children:
             logging.debug(f"current_list : {current_list}")
 
-            type_children = current_list.xpath(".//*[@xsi:type]", namespaces=nsmap)
+            type_children = typed_descendants_xpath(current_list)
 
             logging.debug(f"type_children : {type_children}")
             if type_children is None:
@@ -104,3 +106,6 @@ def check_rule(checker_data: models.CheckerData) -> None:
                     xpath=current_xpath,
                     description=f"Unzip action does not contain any String type",
                 )
+
+                if checker_data.is_fail_fast_issue(IssueSeverity.ERROR):
+                    return
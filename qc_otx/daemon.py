@@ -0,0 +1,256 @@
+# SPDX-License-Identifier: MPL-2.0
+# Copyright 2024, ASAM e.V.
+# This Source Code Form is subject to the terms of the Mozilla
+# Public License, v. 2.0. If a copy of the MPL was not distributed
+# with this file, You can obtain one at https://mozilla.org/MPL/2.0/.
+
+import argparse
+import dataclasses
+import json
+import logging
+import os
+import socket
+import socketserver
+import tempfile
+from typing import Dict, Optional
+
+from qc_baselib import Configuration
+from qc_otx import batch, constants, main, result_cache
+from qc_otx.checks import models, registry, utils
+
+# Requests and responses are single lines of JSON. A request holds either
+# "config_path" (a configuration file, as passed to qc_otx -c) or "input_file",
+# and optionally:
+#   "cwd": directory the relative paths of the request and of its
+#          configuration (InputFile, resultFile) are resolved against
+#   "format": "xqar" (default) to answer the result file content, "json" to
+#             answer the checkers and their issues, "none" to answer nothing
+#   "write_result": write the result file named in the configuration
+#   "generate_markdown": write the checker bundle documentation to the cwd
+#   "include_rules", "exclude_rules": lists of rule patterns overriding the
+#             ones of the configuration, as given to qc_otx --include_rules
+#   "fail_fast": severity name overriding the fail-fast severity of the
+#             configuration, as given to qc_otx --fail_fast
+#   "no_cache": run the checks without reading or writing the result cache
+#   "cache_dir": result cache directory used instead of the daemon's one
+#   "threads": number of threads running independent checkers, as qc_otx -t
+#   "streaming": read the input file incrementally, as qc_otx --streaming
+# A response holds "ok" and either "error" or the requested content.
+
+
+class CacheValidator:
+    """Drops the entries of a CheckerCache whose files changed since they were
+    cached, so that a long-lived cache never returns outdated data.
+    """
+
+    def __init__(self, cache: models.CheckerCache):
+        self.cache = cache
+
+    def invalidate_changed_files(self) -> None:
+        # Package indexes track the stats of their files themselves, and the
+        # package folders are scanned again to pick up added and removed files
+        for package_index in self.cache.package_indexes.values():
+            utils.update_package_index(package_index)
+
+        utils.update_import_graph(self.cache.import_graph)
+
+
+def resolve_config_paths(config: Configuration, cwd: str) -> None:
+    """Make the input and result file paths of the configuration absolute, as
+    relative paths of a request are relative to its cwd, not to the daemon's.
+    """
+    input_file = config.get_config_param("InputFile")
+    if input_file is not None:
+        config.set_config_param(name="InputFile", value=os.path.join(cwd, input_file))
+
+    result_file_path = config.get_checker_bundle_param(
+        checker_bundle_name=constants.BUNDLE_NAME, param_name="resultFile"
+    )
+    if result_file_path is not None:
+        config.set_checker_bundle_param(
+            checker_bundle_name=constants.BUNDLE_NAME,
+            name="resultFile",
+            value=os.path.join(cwd, result_file_path),
+        )
+
+
+def handle_request(
+    request: Dict,
+    cache_validator: CacheValidator,
+    result_cache_dir: Optional[str] = None,
+) -> Dict:
+    cwd = request.get("cwd", os.getcwd())
+
+    try:
+        if "config_path" in request:
+            config = Configuration()
+            config.load_from_file(
+                xml_file_path=os.path.join(cwd, request["config_path"])
+            )
+        elif "input_file" in request:
+            config = batch.create_file_config(request["input_file"])
+        else:
+            return {"ok": False, "error": "Missing config_path or input_file."}
+
+        resolve_config_paths(config, cwd)
+        main.set_cli_rule_patterns(
+            config, request.get("include_rules"), request.get("exclude_rules")
+        )
+        main.set_cli_fail_fast_severity(config, request.get("fail_fast"))
+
+        if request.get("no_cache", False):
+            result_cache_dir = None
+        elif request.get("cache_dir") is not None:
+            result_cache_dir = os.path.join(cwd, request["cache_dir"])
+
+        cache_validator.invalidate_changed_files()
+        result = main.create_result()
+        main.run_checks(
+            config,
+            result,
+            cache_validator.cache,
+            max_workers=request.get("threads", 1),
+            result_cache_dir=result_cache_dir,
+            use_streaming=request.get("streaming", False),
+        )
+        result.copy_param_from_config(config)
+
+        response = {"ok": True}
+        response_format = request.get("format", "xqar")
+        if response_format == "json":
+            response["checkers"] = [
+                dataclasses.asdict(x) for x in utils.serialize_result(result)
+            ]
+
+        if request.get("write_result", False):
+            result_file_path = config.get_checker_bundle_param(
+                checker_bundle_name=constants.BUNDLE_NAME, param_name="resultFile"
+            )
+            result.write_to_file(result_file_path, generate_summary=True)
+        else:
+            file_descriptor, result_file_path = tempfile.mkstemp(suffix=".xqar")
+            os.close(file_descriptor)
+            result.write_to_file(result_file_path, generate_summary=True)
+
+        if response_format == "xqar":
+            with open(result_file_path, "r", encoding="utf-8") as result_file:
+                response["xqar"] = result_file.read()
+
+        if not request.get("write_result", False):
+            os.remove(result_file_path)
+
+        if request.get("generate_markdown", False):
+            result.write_markdown_doc(
+                os.path.join(cwd, "generated_checker_bundle_doc.md")
+            )
+
+        return response
+    except Exception as e:
+        logging.exception("An error occurred while handling a daemon request.")
+        return {"ok": False, "error": str(e)}
+
+
+class DaemonRequestHandler(socketserver.StreamRequestHandler):
+    def handle(self) -> None:
+        line = self.rfile.readline()
+        if not line:
+            return
+
+        try:
+            request = json.loads(line)
+        except ValueError as e:
+            response = {"ok": False, "error": f"Invalid request: {e}"}
+        else:
+            response = handle_request(
+                request, self.server.cache_validator, self.server.result_cache_dir
+            )
+
+        self.wfile.write(json.dumps(response).encode("utf-8") + b"\n")
+
+
+class DaemonServer(socketserver.UnixStreamServer):
+    """Serves the requests one at a time, since the CheckerCache shared by the
+    requests is refreshed before each of them and is not safe to update while
+    another request reads it.
+
+    The checker modules are imported lazily by the registry, so they are loaded
+    when the server starts rather than while answering the first request.
+    """
+
+    def __init__(self, socket_path: str, result_cache_dir: Optional[str] = None):
+        self.cache_validator = CacheValidator(models.CheckerCache())
+        self.result_cache_dir = result_cache_dir
+
+        for checker in registry.get_checkers():
+            checker.load()
+
+        super().__init__(socket_path, DaemonRequestHandler)
+
+
+def create_server(
+    socket_path: str, result_cache_dir: Optional[str] = None
+) -> DaemonServer:
+    """Create the daemon server on socket_path. A leftover socket file is removed,
+    unless another daemon still answers on it.
+    """
+    if os.path.exists(socket_path):
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client:
+            try:
+                client.connect(socket_path)
+            except OSError:
+                os.remove(socket_path)
+            else:
+                raise RuntimeError(f"A daemon is already running on {socket_path}")
+
+    return DaemonServer(socket_path, result_cache_dir)
+
+
+def args_entrypoint() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        prog="QC OTX Daemon",
+        description="Keep the OTX checkers loaded and answer validation requests over a Unix socket.",
+    )
+
+    parser.add_argument(
+        "-s",
+        "--socket",
+        default=main.get_default_daemon_socket_path(),
+        help="Path of the Unix socket to listen on.",
+    )
+    parser.add_argument(
+        "--no-cache",
+        dest="no_cache",
+        action="store_true",
+        help="Always run the checks, without reading or writing the result cache.",
+    )
+    parser.add_argument(
+        "--cache_dir",
+        help="Directory of the result cache. Defaults to $QC_OTX_CACHE_DIR or ~/.cache/qc_otx.",
+    )
+
+    return parser.parse_args()
+
+
+def main_daemon():
+    args = args_entrypoint()
+
+    result_cache_dir = None
+    if not args.no_cache:
+        result_cache_dir = args.cache_dir or result_cache.get_default_cache_dir()
+
+    server = create_server(args.socket, result_cache_dir)
+    logging.info(f"Listening on {args.socket}")
+
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        os.remove(args.socket)
+
+    logging.info("Done")
+
+
+if __name__ == "__main__":
+    main_daemon()
@@ -5,19 +5,23 @@
 # with this file, You can obtain one at https://mozilla.org/MPL/2.0/.
 
 import argparse
+import dataclasses
+import heapq
+import json
 import logging
-from datetime import datetime
+import os
+import socket
+import tempfile
+import time
+import tracemalloc
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
 from lxml import etree
 import types
+from typing import Dict, List, Optional
 
-from qc_baselib import Configuration, Result, StatusType
-from qc_baselib.models.common import ParamType
-from qc_otx import constants
-from qc_otx.checks import core_checker
-from qc_otx.checks import data_type_checker
-from qc_otx.checks import zip_file_checker
-from qc_otx.checks import state_machine_checker
-from qc_otx.checks import utils, models
+from qc_baselib import Configuration, IssueSeverity, Result, StatusType
+from qc_otx import constants, result_cache, rule_selection
+from qc_otx.checks import families, registry, utils, models, streaming
 
 logging.basicConfig(format="%(asctime)s - %(message)s", level=logging.INFO)
 
@@ -32,15 +36,90 @@ def args_entrypoint() -> argparse.Namespace:
     group.add_argument("-c", "--config_path")
 
     parser.add_argument("-g", "--generate_markdown", action="store_true")
+    parser.add_argument(
+        "-t",
+        "--threads",
+        type=int,
+        default=1,
+        help="Number of threads used to run independent checkers concurrently.",
+    )
+    parser.add_argument(
+        "-p",
+        "--profile",
+        action="store_true",
+        help="Add the time, memory and issue count of each checker to its summary.",
+    )
+    parser.add_argument(
+        "--profile_json",
+        action="store_true",
+        help="Also write the checker profiles to a JSON file next to the result file.",
+    )
+    parser.add_argument(
+        "-s",
+        "--streaming",
+        action="store_true",
+        help="Read the input file incrementally for the checkers that support it, to bound memory use on very large files.",
+    )
+    parser.add_argument(
+        "--no-cache",
+        dest="no_cache",
+        action="store_true",
+        help="Always run the checks, without reading or writing the result cache.",
+    )
+    parser.add_argument(
+        "--cache_dir",
+        help="Directory of the result cache. Defaults to $QC_OTX_CACHE_DIR or ~/.cache/qc_otx.",
+    )
+    parser.add_argument(
+        "--include_rules",
+        nargs="+",
+        metavar="PATTERN",
+        help="Only run the rules matching one of the patterns: a checker id, a family (core, data_type, zip_file, state_machine) or a glob on the rule uid, e.g. 'asam.net:otx:1.0.0:state_machine.*'. Overrides the includeRules checker bundle param.",
+    )
+    parser.add_argument(
+        "--exclude_rules",
+        nargs="+",
+        metavar="PATTERN",
+        help="Skip the rules matching one of the patterns, in the format of --include_rules. Overrides the excludeRules checker bundle param.",
+    )
+    parser.add_argument(
+        "--fail_fast",
+        nargs="?",
+        const=IssueSeverity.ERROR.name,
+        choices=[x.name for x in IssueSeverity],
+        metavar="SEVERITY",
+        help="Stop checking a document at the first issue of SEVERITY or higher (default ERROR), reporting the remaining rules as skipped. Overrides the failFastSeverity checker bundle param.",
+    )
+    parser.add_argument(
+        "--daemon",
+        nargs="?",
+        const=get_default_daemon_socket_path(),
+        metavar="SOCKET_PATH",
+        help="Forward the checks to a running qc_otx_daemon, if any, instead of running them in this process.",
+    )
 
     return parser.parse_args()
 
 
+# Checker bundle param of the fail-fast severity, see get_fail_fast_severity
+FAIL_FAST_SEVERITY_PARAM = "failFastSeverity"
+
+
 def execute_checker(
     checker: types.ModuleType,
     checker_data: models.CheckerData,
     required_definition_setting: bool = True,
+    preconditions_satisfied: Optional[bool] = None,
+    skip_reason: Optional[str] = None,
 ) -> None:
+    """Run a checker and record its status in checker_data.result.
+
+    preconditions_satisfied can be given when the preconditions are evaluated by
+    the caller. Otherwise they are evaluated on checker_data.result.
+
+    If skip_reason is given, the checker is registered as SKIPPED with the reason
+    as summary, without running check_rule.
+    """
     # Register checker
     checker_data.result.register_checker(
         checker_bundle_name=constants.BUNDLE_NAME,
@@ -55,10 +134,28 @@ def execute_checker(
         rule_uid=checker.RULE_UID,
     )
 
+    if skip_reason is not None:
+        checker_data.result.set_checker_status(
+            checker_bundle_name=constants.BUNDLE_NAME,
+            checker_id=checker.CHECKER_ID,
+            status=StatusType.SKIPPED,
+        )
+
+        checker_data.result.add_checker_summary(
+            constants.BUNDLE_NAME, checker.CHECKER_ID, skip_reason
+        )
+
+        return
+
     # Check preconditions. If not satisfied then set status as SKIPPED and return
-    if not checker_data.result.all_checkers_completed_without_issue(
-        checker.CHECKER_PRECONDITIONS
-    ):
+    if preconditions_satisfied is None:
+        preconditions_satisfied = (
+            checker_data.result.all_checkers_completed_without_issue(
+                checker.CHECKER_PRECONDITIONS
+            )
+        )
+
+    if not preconditions_satisfied:
         checker_data.result.set_checker_status(
             checker_bundle_name=constants.BUNDLE_NAME,
             checker_id=checker.CHECKER_ID,
@@ -100,6 +197,14 @@ def execute_checker(
             return
 
     # Execute checker
+    if checker_data.profiles is not None:
+        start_wall_time = time.perf_counter()
+        start_cpu_time = time.thread_time()
+        start_memory = None
+        if tracemalloc.is_tracing():
+            start_memory, _ = tracemalloc.get_traced_memory()
+            tracemalloc.reset_peak()
+
     try:
         checker.check_rule(checker_data)
 
@@ -127,104 +232,582 @@ def execute_checker(
 
         logging.exception(f"An error occurred in {checker.CHECKER_ID}.")
 
+    if checker_data.profiles is not None:
+        peak_memory = None
+        if start_memory is not None:
+            _, peak_traced_memory = tracemalloc.get_traced_memory()
+            peak_memory = max(peak_traced_memory - start_memory, 0)
+
+        record_checker_profile(
+            checker,
+            checker_data,
+            wall_time=time.perf_counter() - start_wall_time,
+            cpu_time=time.thread_time() - start_cpu_time,
+            peak_memory=peak_memory,
+        )
+
+
+def record_checker_profile(
+    checker: types.ModuleType,
+    checker_data: models.CheckerData,
+    wall_time: float,
+    cpu_time: float,
+    peak_memory: Optional[int],
+) -> None:
+    """Store the profile of an executed checker and add it to the checker summary.
+
+    The memory is measured with tracemalloc, which traces the whole process.
+    When checkers run on several threads, the peak memory of a checker also
+    includes the allocations of the checkers running at the same time.
+    """
+    issue_count = checker_data.result.get_checker_issue_count(
+        constants.BUNDLE_NAME, checker.CHECKER_ID
+    )
+    checker_data.profiles[checker.CHECKER_ID] = models.CheckerProfile(
+        checker_id=checker.CHECKER_ID,
+        rule_uid=checker.RULE_UID,
+        wall_time=wall_time,
+        cpu_time=cpu_time,
+        peak_memory=peak_memory,
+        issue_count=issue_count,
+    )
+
+    summary = f"Wall time {wall_time:.6f} s, CPU time {cpu_time:.6f} s"
+    if peak_memory is not None:
+        summary += f", peak memory {peak_memory} B"
+    summary += f", {issue_count} issue(s) registered."
+
+    checker_data.result.add_checker_summary(
+        constants.BUNDLE_NAME, checker.CHECKER_ID, summary
+    )
+
+
+def sort_checker_profiles(
+    profiles: Dict[str, models.CheckerProfile],
+) -> List[models.CheckerProfile]:
+    """Return the checker profiles in rule order."""
+    checker_order = {
+        x.CHECKER_ID: index for index, x in enumerate(registry.get_checkers())
+    }
+    return sorted(
+        profiles.values(),
+        key=lambda x: (
+            checker_order.get(x.checker_id, len(checker_order)),
+            x.checker_id,
+        ),
+    )
+
+
+def write_profile(
+    profile_file_path: str,
+    input_file: str,
+    profiles: Dict[str, models.CheckerProfile],
+) -> None:
+    """Write the checker profiles of an input file as JSON, in rule order."""
+    profile = {
+        "bundle_version": constants.BUNDLE_VERSION,
+        "input_file": input_file,
+        "checkers": [dataclasses.asdict(x) for x in sort_checker_profiles(profiles)],
+    }
+
+    with open(profile_file_path, "w") as profile_file:
+        json.dump(profile, profile_file, indent=2)
+
+
+def get_profile_file_path(result_file_path: str) -> str:
+    return os.path.splitext(result_file_path)[0] + ".profile.json"
+
+
+def get_checker_dependents(
+    checkers: List[types.ModuleType],
+) -> Dict[str, List[str]]:
+    """Build the dependency graph of the checkers from their CHECKER_PRECONDITIONS.
+
+    Preconditions on checkers that are not part of the given list are ignored
+    here. They are never satisfied, so the dependent checker is skipped.
+
+    Returns:
+        Dict[str, List[str]]: for each checker id, the ids of the checkers that
+        have it as precondition, in rule order
+    """
+    checker_ids = set(x.CHECKER_ID for x in checkers)
+    dependents = {x.CHECKER_ID: [] for x in checkers}
+    for checker in checkers:
+        for precondition in sorted(checker.CHECKER_PRECONDITIONS):
+            if precondition in checker_ids:
+                dependents[precondition].append(checker.CHECKER_ID)
+
+    # Kahn's algorithm, to reject cyclic preconditions before running anything
+    pending = {
+        x.CHECKER_ID: len(x.CHECKER_PRECONDITIONS & checker_ids) for x in checkers
+    }
+    ready = [x for x, count in pending.items() if count == 0]
+    visited = 0
+    while ready:
+        current = ready.pop()
+        visited += 1
+        for dependent in dependents[current]:
+            pending[dependent] -= 1
+            if pending[dependent] == 0:
+                ready.append(dependent)
+
+    if visited != len(checkers):
+        cyclic_ids = sorted(x for x, count in pending.items() if count > 0)
+        raise RuntimeError(f"Cyclic checker preconditions: {cyclic_ids}")
+
+    return dependents
+
+
+def _merge_checker_result(result: Result, checker_result: Result) -> None:
+    """Append the checkers registered in checker_result to result. Issues get
+    new ids from result.
+    """
+    for checker in checker_result.get_checker_results(constants.BUNDLE_NAME):
+        result.register_checker(
+            checker_bundle_name=constants.BUNDLE_NAME,
+            checker_id=checker.checker_id,
+            description=checker.description,
+            summary=checker.summary,
+        )
+
+        for rule in checker.addressed_rule:
+            result.register_rule_by_uid(
+                checker_bundle_name=constants.BUNDLE_NAME,
+                checker_id=checker.checker_id,
+                rule_uid=rule.rule_uid,
+            )
+
+        if checker.status is not None:
+            result.set_checker_status(
+                checker_bundle_name=constants.BUNDLE_NAME,
+                checker_id=checker.checker_id,
+                status=checker.status,
+            )
+
+        merged_checker = result.get_checker_result(
+            constants.BUNDLE_NAME, checker.checker_id
+        )
+        merged_checker.params = checker.params
+        merged_checker.metadata = checker.metadata
+
+        for issue in checker.issues:
+            result.register_issue(
+                checker_bundle_name=constants.BUNDLE_NAME,
+                checker_id=checker.checker_id,
+                description=issue.description,
+                level=issue.level,
+                rule_uid=issue.rule_uid,
+            )
+            merged_issue = merged_checker.issues[-1]
+            merged_issue.locations = issue.locations
+            merged_issue.domain_specific_info = issue.domain_specific_info
+
+
+def execute_checkers(
+    checkers: List[types.ModuleType],
+    checker_data: models.CheckerData,
+    max_workers: int = 1,
+    skip_reasons: Optional[Dict[str, str]] = None,
+) -> None:
+    """Run the checkers following the dependency graph of their preconditions.
+
+    A checker starts once all its preconditions are finished. With more than
+    one worker, independent checkers run concurrently on a thread pool. Each
+    checker writes to its own Result, and the results are merged into
+    checker_data.result in the order of the given list, so the report does not
+    depend on the order of execution.
+
+    The checkers with an entry in skip_reasons are reported as SKIPPED with that
+    summary and not run.
+
+    In fail-fast mode (checker_data.fail_fast_severity), no checker is started
+    after one registered an issue of that severity or higher, and the remaining
+    checkers are reported as SKIPPED. With more than one worker, the checkers
+    already running at that time still finish.
+    """
+    if skip_reasons is None:
+        skip_reasons = dict()
+
+    # Checker whose issue ended the checks in fail-fast mode
+    fail_fast_checker_id = None
+
+    dependents = get_checker_dependents(checkers)
+    rule_order = {x.CHECKER_ID: index for index, x in enumerate(checkers)}
+    checker_ids = set(rule_order.keys())
+
+    checker_results = dict()
+    pending = {
+        x.CHECKER_ID: len(x.CHECKER_PRECONDITIONS & checker_ids) for x in checkers
+    }
+    ready = [rule_order[x] for x, count in pending.items() if count == 0]
+    heapq.heapify(ready)
+
+    def run(checker: types.ModuleType) -> Result:
+        preconditions_satisfied = all(
+            precondition in checker_results
+            and checker_results[precondition].all_checkers_completed_without_issue(
+                {precondition}
+            )
+            for precondition in checker.CHECKER_PRECONDITIONS
+        )
+
+        skip_reason = skip_reasons.get(checker.CHECKER_ID)
+        if skip_reason is None and fail_fast_checker_id is not None:
+            skip_reason = f"Fail-fast: {fail_fast_checker_id} registered an issue of severity {checker_data.fail_fast_severity.name} or higher. Skip the check."
+
+        checker_result = create_result()
+        execute_checker(
+            checker,
+            dataclasses.replace(checker_data, result=checker_result),
+            preconditions_satisfied=preconditions_satisfied,
+            skip_reason=skip_reason,
+        )
+
+        return checker_result
+
+    def finish(checker_id: str, checker_result: Result) -> None:
+        nonlocal fail_fast_checker_id
+        checker_results[checker_id] = checker_result
+        if fail_fast_checker_id is None and any(
+            checker_data.is_fail_fast_issue(x.level)
+            for x in checker_result.get_checker_result(
+                constants.BUNDLE_NAME, checker_id
+            ).issues
+        ):
+            fail_fast_checker_id = checker_id
+        for dependent in dependents[checker_id]:
+            pending[dependent] -= 1
+            if pending[dependent] == 0:
+                heapq.heappush(ready, rule_order[dependent])
+
+    if max_workers <= 1:
+        while ready:
+            checker = checkers[heapq.heappop(ready)]
+            finish(checker.CHECKER_ID, run(checker))
+    else:
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            running = dict()
+            while ready or running:
+                while ready:
+                    checker = checkers[heapq.heappop(ready)]
+                    running[executor.submit(run, checker)] = checker.CHECKER_ID
+
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    finish(running.pop(future), future.result())
+
+    for checker in checkers:
+        _merge_checker_result(checker_data.result, checker_results[checker.CHECKER_ID])
+
+
+def create_stream_checker_module(
+    checker: types.ModuleType, stream_checker: streaming.StreamChecker
+) -> types.ModuleType:
+    """Return a checker module that reports the findings of the stream checker,
+    so that it is scheduled like any other checker.
+    """
+    stream_checker_module = types.ModuleType(checker.__name__)
+    stream_checker_module.CHECKER_ID = checker.CHECKER_ID
+    stream_checker_module.CHECKER_DESCRIPTION = checker.CHECKER_DESCRIPTION
+    stream_checker_module.CHECKER_PRECONDITIONS = checker.CHECKER_PRECONDITIONS
+    stream_checker_module.RULE_UID = checker.RULE_UID
+    stream_checker_module.check_rule = stream_checker.check_rule
+    return stream_checker_module
+
+
+def create_result() -> Result:
+    result = Result()
+    result.register_checker_bundle(
+        name=constants.BUNDLE_NAME,
+        description="OTX checker bundle",
+        version=constants.BUNDLE_VERSION,
+        summary="",
+    )
+    result.set_result_version(version=constants.BUNDLE_VERSION)
+
+    return result
 
-def run_checks(config: Configuration, result: Result) -> None:
-    root = etree.parse(config.get_config_param("InputFile"))
-    otx_schema_version = utils.get_standard_schema_version(root)
+
+def run_checks(
+    config: Configuration,
+    result: Result,
+    cache: Optional[models.CheckerCache] = None,
+    max_workers: int = 1,
+    profiles: Optional[Dict[str, models.CheckerProfile]] = None,
+    result_cache_dir: Optional[str] = None,
+    use_streaming: bool = False,
+) -> None:
+    """Run the checkers on the input file of the configuration. The checkers left
+    out by the includeRules and excludeRules checker bundle params are reported
+    as SKIPPED, see rule_selection.
+
+    With use_streaming, the checkers that provide a StreamChecker read the input
+    file with etree.iterparse, so that their memory use does not grow with the
+    size of the document. The input file is only parsed into a full tree if
+    some of the other checkers need it.
+
+    If result_cache_dir is given, a cached result of the same input is replayed
+    into the result without parsing the input file, and a new result is stored
+    in the cache otherwise. The cache is not used when profiling, since cached
+    results carry no profile. The result is expected to hold no other checkers.
+    """
+    input_file = config.get_config_param("InputFile")
+    use_result_cache = result_cache_dir is not None and profiles is None
+    fail_fast_severity = get_fail_fast_severity(config)
+
+    # The rules left out by the rule selection are reported as SKIPPED without
+    # reading the input file for them
+    all_checkers = registry.get_checkers()
+    selection_skip_reasons = rule_selection.get_rule_selection_skip_reasons(
+        config, all_checkers
+    )
+    selected_checkers = [
+        x for x in all_checkers if x.CHECKER_ID not in selection_skip_reasons
+    ]
+
+    if use_result_cache:
+        checker_records = result_cache.load_cached_result(
+            result_cache_dir,
+            input_file,
+            selected_checkers,
+            fail_fast_severity=fail_fast_severity,
+        )
+        if checker_records is not None:
+            logging.info(f"Reusing the cached result of {input_file}")
+            result_cache.replay_checker_records(result, checker_records)
+            return
+
+    checkers = all_checkers
+    root = None
+    otx_schema_version = None
+    document_index = models.DocumentIndex(dict(), dict(), dict(), [], dict())
+
+    if use_streaming:
+        stream_checkers = {
+            x.CHECKER_ID: x.StreamChecker()
+            for x in selected_checkers
+            if hasattr(x, "StreamChecker")
+        }
+        otx_schema_version = streaming.stream_document(
+            input_file, list(stream_checkers.values())
+        )
+        checkers = [
+            (
+                create_stream_checker_module(x, stream_checkers[x.CHECKER_ID])
+                if x.CHECKER_ID in stream_checkers
+                else x
+            )
+            for x in all_checkers
+        ]
+
+    if len(selected_checkers) > 0 and (
+        not use_streaming
+        or any(not hasattr(x, "StreamChecker") for x in selected_checkers)
+    ):
+        root = etree.parse(input_file)
+        otx_schema_version = utils.get_standard_schema_version(root)
+        document_index = utils.build_document_index(root)
 
     checker_data = models.CheckerData(
         input_file_xml_root=root,
         config=config,
         result=result,
         schema_version=otx_schema_version,
+        document_index=document_index,
+        cache=cache if cache is not None else models.CheckerCache(),
+        profiles=profiles,
+        fail_fast_severity=fail_fast_severity,
     )
 
-    # 1. Run basic checks
-    # Chk001
-    execute_checker(core_checker.document_name_matches_filename, checker_data)
-    # Chk002
-    execute_checker(core_checker.document_name_package_uniqueness, checker_data)
-    # Chk003
-    execute_checker(core_checker.no_dead_import_links, checker_data)
-    # Chk004
-    execute_checker(core_checker.no_unused_imports, checker_data)
-    # Chk005
-    execute_checker(core_checker.no_use_of_undefined_import_prefixes, checker_data)
-    # Chk006
-    execute_checker(
-        core_checker.match_of_imported_document_data_model_version, checker_data
-    )
-    # Chk007
-    execute_checker(
-        core_checker.have_specification_if_no_realisation_exists, checker_data
-    )
-    # Chk008
-    execute_checker(core_checker.public_main_procedure, checker_data)
-    # Chk009
-    execute_checker(core_checker.mandatory_constant_initialization, checker_data)
-    # Chk010
-    execute_checker(core_checker.unique_node_names, checker_data)
-
-    # 2. Run data type checks
-    # Chk001
-    execute_checker(data_type_checker.accessing_structure_elements, checker_data)
-    # Chk008
-    execute_checker(
-        data_type_checker.correct_target_for_structure_element, checker_data
-    )
-
-    # 3. Run zip file checks
-    # Chk001
-    execute_checker(zip_file_checker.type_safe_zip_file, checker_data)
-    # Chk002
-    execute_checker(zip_file_checker.type_safe_unzip_file, checker_data)
-
-    # 4. Run state machine checks
-    # Chk001
-    execute_checker(state_machine_checker.no_procedure_realization, checker_data)
-    # Chk002
-    execute_checker(state_machine_checker.mandatory_target_state, checker_data)
-    # Chk003
-    execute_checker(
-        state_machine_checker.no_target_state_for_completed_state, checker_data
-    )
-    # Chk004
-    execute_checker(state_machine_checker.mandatory_transition, checker_data)
-    # Chk005
-    execute_checker(state_machine_checker.mandatory_trigger, checker_data)
-    # Chk006
-    execute_checker(
-        state_machine_checker.distinguished_initial_and_completed_state, checker_data
+    # Families without the namespaces or xsi:types they check are skipped as a
+    # whole, instead of each of their checkers finding out on its own
+    family_skip_reasons = families.get_family_skip_reasons(root, document_index)
+    skip_reasons = {
+        x.CHECKER_ID: family_skip_reasons[families.get_rule_family(x.RULE_UID)]
+        for x in checkers
+        if families.get_rule_family(x.RULE_UID) in family_skip_reasons
+    }
+    skip_reasons.update(selection_skip_reasons)
+
+    execute_checkers(checkers, checker_data, max_workers, skip_reasons)
+
+    if use_result_cache:
+        result_cache.store_cached_result(
+            result_cache_dir,
+            input_file,
+            selected_checkers,
+            utils.serialize_result(result),
+            checker_data.dependencies,
+            fail_fast_severity=fail_fast_severity,
+        )
+
+
+def set_cli_rule_patterns(
+    config: Configuration,
+    include_rules: Optional[List[str]],
+    exclude_rules: Optional[List[str]],
+) -> None:
+    """Override the rule patterns of the configuration with the ones given on the
+    command line, if any.
+    """
+    if include_rules is not None:
+        rule_selection.set_rule_patterns(
+            config, rule_selection.INCLUDE_RULES_PARAM, include_rules
+        )
+    if exclude_rules is not None:
+        rule_selection.set_rule_patterns(
+            config, rule_selection.EXCLUDE_RULES_PARAM, exclude_rules
+        )
+
+
+def get_fail_fast_severity(config: Configuration) -> Optional[IssueSeverity]:
+    """Severity of the failFastSeverity checker bundle param, given by name (e.g.
+    ERROR) or by level (e.g. 1). None if fail-fast is not enabled.
+    """
+    value = config.get_checker_bundle_param(
+        checker_bundle_name=constants.BUNDLE_NAME, param_name=FAIL_FAST_SEVERITY_PARAM
     )
+    if value is None or str(value).strip() == "":
+        return None
+
+    value = str(value).strip()
+    for severity in IssueSeverity:
+        if value.upper() == severity.name or value == str(severity.value):
+            return severity
+
+    raise ValueError(
+        f"Invalid {FAIL_FAST_SEVERITY_PARAM} {value}, expected one of {[x.name for x in IssueSeverity]}."
+    )
+
+
+def set_cli_fail_fast_severity(
+    config: Configuration, fail_fast_severity: Optional[str]
+) -> None:
+    """Override the fail-fast severity of the configuration with the one given on
+    the command line, if any.
+    """
+    if fail_fast_severity is not None:
+        config.set_checker_bundle_param(
+            checker_bundle_name=constants.BUNDLE_NAME,
+            name=FAIL_FAST_SEVERITY_PARAM,
+            value=fail_fast_severity,
+        )
+
+
+def get_default_daemon_socket_path() -> str:
+    user_id = os.getuid() if hasattr(os, "getuid") else 0
+    return os.path.join(tempfile.gettempdir(), f"qc_otx-{user_id}.sock")
+
+
+# Seconds the client waits for the daemon to accept and answer a request
+# before checking locally, see forward_to_daemon
+DAEMON_TIMEOUT = 60.0
+
+
+def forward_to_daemon(
+    socket_path: str, request: Dict, timeout: float = DAEMON_TIMEOUT
+) -> Optional[Dict]:
+    """Send a request to the daemon listening on socket_path. Each operation on
+    the socket fails after timeout seconds, so that a stuck daemon is treated
+    as if no daemon answered.
+
+    Returns:
+        Optional[Dict]: the daemon response, None if no daemon answered
+    """
+    if not hasattr(socket, "AF_UNIX"):
+        return None
+
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client:
+            client.settimeout(timeout)
+            client.connect(socket_path)
+            client.sendall(json.dumps(request).encode("utf-8") + b"\n")
+            with client.makefile("rb") as response_file:
+                response = response_file.readline()
+    except OSError:
+        # Also raised as socket.timeout when the daemon does not answer in time
+        return None
+
+    if not response:
+        return None
+    return json.loads(response)
 
 
 def main():
     args = args_entrypoint()
 
+    # Profiles are only collected by checks run in this process
+    if args.daemon is not None and not (args.profile or args.profile_json):
+        response = forward_to_daemon(
+            args.daemon,
+            {
+                "config_path": os.path.abspath(args.config_path),
+                "cwd": os.getcwd(),
+                "format": "none",
+                "write_result": True,
+                "generate_markdown": args.generate_markdown,
+                "include_rules": args.include_rules,
+                "exclude_rules": args.exclude_rules,
+                "fail_fast": args.fail_fast,
+                "no_cache": args.no_cache,
+                "cache_dir": (
+                    os.path.abspath(args.cache_dir) if args.cache_dir else None
+                ),
+                "threads": args.threads,
+                "streaming": args.streaming,
+            },
+        )
+        if response is not None and response["ok"]:
+            logging.info(f"Checks done by the daemon on {args.daemon}")
+            return
+        if response is None:
+            logging.info(f"No daemon answered on {args.daemon}, checking locally")
+        else:
+            logging.error(f"The daemon failed ({response['error']}), checking locally")
+
     logging.info("Initializing checks")
 
     config = Configuration()
     config.load_from_file(xml_file_path=args.config_path)
-
-    result = Result()
-    result.register_checker_bundle(
-        name=constants.BUNDLE_NAME,
-        description="OTX checker bundle",
-        version=constants.BUNDLE_VERSION,
-        summary="",
+    set_cli_rule_patterns(config, args.include_rules, args.exclude_rules)
+    set_cli_fail_fast_severity(config, args.fail_fast)
+
+    result = create_result()
+
+    profiles = None
+    if args.profile or args.profile_json:
+        profiles = dict()
+        tracemalloc.start()
+
+    result_cache_dir = None
+    if not args.no_cache:
+        result_cache_dir = args.cache_dir or result_cache.get_default_cache_dir()
+
+    run_checks(
+        config,
+        result,
+        max_workers=args.threads,
+        profiles=profiles,
+        result_cache_dir=result_cache_dir,
+        use_streaming=args.streaming,
     )
-    result.set_result_version(version=constants.BUNDLE_VERSION)
 
-    run_checks(config, result)
+    if profiles is not None:
+        tracemalloc.stop()
 
     result.copy_param_from_config(config)
 
-    result.write_to_file(
-        config.get_checker_bundle_param(
-            checker_bundle_name=constants.BUNDLE_NAME, param_name="resultFile"
-        ),
-        generate_summary=True,
+    result_file_path = config.get_checker_bundle_param(
+        checker_bundle_name=constants.BUNDLE_NAME, param_name="resultFile"
     )
+    result.write_to_file(result_file_path, generate_summary=True)
+
+    if args.profile_json:
+        write_profile(
+            get_profile_file_path(result_file_path),
+            config.get_config_param("InputFile"),
+            profiles,
+        )
 
     if args.generate_markdown:
         result.write_markdown_doc("generated_checker_bundle_doc.md")
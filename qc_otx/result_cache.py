@@ -0,0 +1,317 @@
+# SPDX-License-Identifier: MPL-2.0
+# Copyright 2024, ASAM e.V.
+# This Source Code Form is subject to the terms of the Mozilla
+# Public License, v. 2.0. If a copy of the MPL was not distributed
+# with this file, You can obtain one at https://mozilla.org/MPL/2.0/.
+
+import dataclasses
+import functools
+import hashlib
+import json
+import logging
+import os
+import tempfile
+from types import ModuleType
+from typing import Dict, List, Optional, Tuple
+
+from qc_baselib import IssueSeverity, Result, StatusType
+from qc_otx import constants
+from qc_otx.checks import models, utils
+
+# Each cache entry is a JSON file keyed by the content hash and path of the input
+# file, the bundle version, the checker ids and rules and a fingerprint of the
+# qc_otx sources. An entry is only reused if the files and directories read by
+# the checkers (imported documents, package content) did not change either.
+# Imported documents are compared by content hash, the other package documents
+# by (mtime_ns, size), so that a lookup does not read the whole package.
+CACHE_ENTRY_EXTENSION = ".json"
+# Least recently used entries are removed when the cache grows above this size
+DEFAULT_MAX_SIZE = 256 * 1024 * 1024
+
+# Approximate size in bytes of each cache directory used by this process
+_cache_sizes: Dict[str, int] = dict()
+
+
+def get_default_cache_dir() -> str:
+    cache_dir = os.environ.get("QC_OTX_CACHE_DIR")
+    if cache_dir is not None:
+        return cache_dir
+
+    cache_home = os.environ.get(
+        "XDG_CACHE_HOME", os.path.join(os.path.expanduser("~"), ".cache")
+    )
+    return os.path.join(cache_home, "qc_otx")
+
+
+def hash_file(file_path: str) -> Optional[str]:
+    """Return the SHA-256 hex digest of the file content, None if it cannot be read."""
+    file_hash = hashlib.sha256()
+    try:
+        with open(file_path, "rb") as file:
+            for chunk in iter(lambda: file.read(1024 * 1024), b""):
+                file_hash.update(chunk)
+    except OSError:
+        return None
+    return file_hash.hexdigest()
+
+
+@functools.lru_cache(maxsize=None)
+def get_code_fingerprint() -> str:
+    """Fingerprint of the qc_otx sources, so that results of modified checkers are
+    not reused even if their rule and the bundle version did not change.
+    """
+    package_dir = os.path.dirname(os.path.abspath(__file__))
+    fingerprint = hashlib.sha256()
+    for dir_path, dir_names, file_names in sorted(os.walk(package_dir)):
+        dir_names.sort()
+        for file_name in sorted(file_names):
+            if not file_name.endswith(".py"):
+                continue
+            file_stat = os.stat(os.path.join(dir_path, file_name))
+            relative_path = os.path.relpath(
+                os.path.join(dir_path, file_name), package_dir
+            )
+            fingerprint.update(
+                f"{relative_path}:{file_stat.st_size}:{file_stat.st_mtime_ns}\n".encode()
+            )
+    return fingerprint.hexdigest()
+
+
+def get_cache_key(
+    input_file: str,
+    checkers: List[ModuleType],
+    fail_fast_severity: Optional[IssueSeverity] = None,
+) -> Optional[str]:
+    """Return the cache key of the input file, None if the file cannot be read.
+    Fail-fast results are partial, so they are cached apart from full results.
+    """
+    input_file_hash = hash_file(input_file)
+    if input_file_hash is None:
+        return None
+
+    key = hashlib.sha256()
+    key.update(f"{input_file_hash}\n{os.path.abspath(input_file)}\n".encode())
+    key.update(f"{constants.BUNDLE_VERSION}\n{get_code_fingerprint()}\n".encode())
+    for checker in checkers:
+        key.update(f"{checker.CHECKER_ID}:{checker.RULE_UID}\n".encode())
+        # Plugin checkers are not part of the code fingerprint, their version is
+        distribution = getattr(checker, "distribution", None)
+        if distribution is not None:
+            key.update(f"{distribution}\n".encode())
+    if fail_fast_severity is not None:
+        key.update(f"fail_fast:{fail_fast_severity.name}\n".encode())
+    return key.hexdigest()
+
+
+def get_directory_otx_files(directory: str) -> Optional[List[str]]:
+    if not os.path.isdir(directory):
+        return None
+    return sorted(os.path.abspath(x) for x in utils.find_otx_files(directory))
+
+
+def get_file_stat(file_path: str) -> Optional[List[int]]:
+    """Return the (mtime_ns, size) of the file as stored in JSON, None if it is missing."""
+    file_stat = utils.get_file_stat(file_path)
+    return list(file_stat) if file_stat is not None else None
+
+
+def snapshot_dependencies(dependencies: models.InputDependencies) -> Dict:
+    return {
+        "files": {x: hash_file(x) for x in sorted(dependencies.files)},
+        "stat_files": {x: get_file_stat(x) for x in sorted(dependencies.stat_files)},
+        "directories": {
+            x: get_directory_otx_files(x) for x in sorted(dependencies.directories)
+        },
+    }
+
+
+def are_dependencies_unchanged(snapshot: Dict) -> bool:
+    for directory, otx_files in snapshot["directories"].items():
+        if get_directory_otx_files(directory) != otx_files:
+            return False
+    for file_path, file_stat in snapshot["stat_files"].items():
+        if get_file_stat(file_path) != file_stat:
+            return False
+    for file_path, file_hash in snapshot["files"].items():
+        if hash_file(file_path) != file_hash:
+            return False
+    return True
+
+
+def _get_entry_path(cache_dir: str, key: str) -> str:
+    return os.path.join(cache_dir, key[:2], key + CACHE_ENTRY_EXTENSION)
+
+
+def _load_checker_record(data: Dict) -> models.CheckerRecord:
+    return models.CheckerRecord(
+        checker_id=data["checker_id"],
+        description=data["description"],
+        summary=data["summary"],
+        status=StatusType(data["status"]) if data["status"] is not None else None,
+        rule_uids=data["rule_uids"],
+        issues=[
+            models.IssueRecord(
+                description=x["description"],
+                level=IssueSeverity(x["level"]),
+                rule_uid=x["rule_uid"],
+                xml_locations=[(y[0], y[1]) for y in x["xml_locations"]],
+            )
+            for x in data["issues"]
+        ],
+    )
+
+
+def load_cached_result(
+    cache_dir: str,
+    input_file: str,
+    checkers: List[ModuleType],
+    fail_fast_severity: Optional[IssueSeverity] = None,
+) -> Optional[List[models.CheckerRecord]]:
+    """Return the cached checker records of the input file, None on a cache miss."""
+    key = get_cache_key(input_file, checkers, fail_fast_severity)
+    if key is None:
+        return None
+
+    entry_path = _get_entry_path(cache_dir, key)
+    try:
+        with open(entry_path, "r") as entry_file:
+            entry = json.load(entry_file)
+        if not are_dependencies_unchanged(entry["dependencies"]):
+            return None
+        checker_records = [_load_checker_record(x) for x in entry["checkers"]]
+        # Mark the entry as recently used
+        os.utime(entry_path)
+    except FileNotFoundError:
+        return None
+    except (OSError, ValueError, KeyError, TypeError):
+        logging.warning(f"Ignoring invalid cache entry {entry_path}")
+        return None
+
+    return checker_records
+
+
+def store_cached_result(
+    cache_dir: str,
+    input_file: str,
+    checkers: List[ModuleType],
+    checker_records: List[models.CheckerRecord],
+    dependencies: models.InputDependencies,
+    max_size: int = DEFAULT_MAX_SIZE,
+    fail_fast_severity: Optional[IssueSeverity] = None,
+) -> None:
+    key = get_cache_key(input_file, checkers, fail_fast_severity)
+    if key is None:
+        return
+
+    entry = {
+        "input_file": os.path.abspath(input_file),
+        "dependencies": snapshot_dependencies(dependencies),
+        "checkers": [dataclasses.asdict(x) for x in checker_records],
+    }
+
+    entry_path = _get_entry_path(cache_dir, key)
+    try:
+        os.makedirs(os.path.dirname(entry_path), exist_ok=True)
+        # Write to a temporary file first, so that concurrent readers never see
+        # a partial entry
+        file_descriptor, temp_path = tempfile.mkstemp(
+            dir=os.path.dirname(entry_path), suffix=".tmp"
+        )
+        with os.fdopen(file_descriptor, "w") as entry_file:
+            json.dump(entry, entry_file)
+        os.replace(temp_path, entry_path)
+    except OSError as e:
+        logging.warning(f"Cannot write cache entry {entry_path}: {e}")
+        return
+
+    cache_dir_key = os.path.abspath(cache_dir)
+    if cache_dir_key not in _cache_sizes:
+        _cache_sizes[cache_dir_key] = get_cache_size(cache_dir)
+    else:
+        _cache_sizes[cache_dir_key] += os.path.getsize(entry_path)
+
+    if _cache_sizes[cache_dir_key] > max_size:
+        _cache_sizes[cache_dir_key] = evict_cache_entries(cache_dir, max_size)
+
+
+def _list_cache_entries(cache_dir: str) -> List[Tuple[str, os.stat_result]]:
+    entries = []
+    for dir_path, _, file_names in os.walk(cache_dir):
+        for file_name in file_names:
+            if file_name.endswith(CACHE_ENTRY_EXTENSION):
+                entry_path = os.path.join(dir_path, file_name)
+                try:
+                    entries.append((entry_path, os.stat(entry_path)))
+                except OSError:
+                    pass
+    return entries
+
+
+def get_cache_size(cache_dir: str) -> int:
+    return sum(x[1].st_size for x in _list_cache_entries(cache_dir))
+
+
+def evict_cache_entries(cache_dir: str, max_size: int) -> int:
+    """Remove the least recently used entries until the cache is at most half of
+    max_size, so that eviction does not run again on every new entry.
+
+    Returns:
+        int: the size of the remaining entries in bytes
+    """
+    entries = sorted(_list_cache_entries(cache_dir), key=lambda x: x[1].st_mtime)
+    cache_size = sum(x[1].st_size for x in entries)
+
+    for entry_path, entry_stat in entries:
+        if cache_size <= max_size // 2:
+            break
+        try:
+            os.remove(entry_path)
+        except OSError:
+            continue
+        cache_size -= entry_stat.st_size
+
+    return cache_size
+
+
+def replay_checker_records(
+    result: Result, checker_records: List[models.CheckerRecord]
+) -> None:
+    """Register the checker records in the result, as if the checkers had run."""
+    for checker in checker_records:
+        result.register_checker(
+            checker_bundle_name=constants.BUNDLE_NAME,
+            checker_id=checker.checker_id,
+            description=checker.description,
+            summary=checker.summary,
+        )
+        for rule_uid in checker.rule_uids:
+            result.register_rule_by_uid(
+                checker_bundle_name=constants.BUNDLE_NAME,
+                checker_id=checker.checker_id,
+                rule_uid=rule_uid,
+            )
+
+        # Status is set first, since a SKIPPED checker cannot hold issues
+        if checker.status is not None:
+            result.set_checker_status(
+                checker_bundle_name=constants.BUNDLE_NAME,
+                checker_id=checker.checker_id,
+                status=checker.status,
+            )
+
+        for issue in checker.issues:
+            issue_id = result.register_issue(
+                checker_bundle_name=constants.BUNDLE_NAME,
+                checker_id=checker.checker_id,
+                description=issue.description,
+                level=issue.level,
+                rule_uid=issue.rule_uid,
+            )
+            for xpaths, description in issue.xml_locations:
+                result.add_xml_location(
+                    checker_bundle_name=constants.BUNDLE_NAME,
+                    checker_id=checker.checker_id,
+                    issue_id=issue_id,
+                    xpath=xpaths,
+                    description=description,
+                )
@@ -0,0 +1,95 @@
+# SPDX-License-Identifier: MPL-2.0
+# Copyright 2024, ASAM e.V.
+# This Source Code Form is subject to the terms of the Mozilla
+# Public License, v. 2.0. If a copy of the MPL was not distributed
+# with this file, You can obtain one at https://mozilla.org/MPL/2.0/.
+
+import fnmatch
+import logging
+import re
+import types
+from typing import Dict, List
+
+from qc_baselib import Configuration
+from qc_otx import constants
+from qc_otx.checks import families
+
+# Checker bundle params holding the rule patterns, separated by commas or
+# whitespace. A pattern is a checker id, a family name such as "core", or a
+# glob on the rule uid such as "asam.net:otx:1.0.0:state_machine.*".
+INCLUDE_RULES_PARAM = "includeRules"
+EXCLUDE_RULES_PARAM = "excludeRules"
+
+
+def parse_rule_patterns(value: object) -> List[str]:
+    if value is None:
+        return []
+    return [x for x in re.split(r"[,\s]+", str(value)) if x]
+
+
+def get_rule_patterns(config: Configuration, param_name: str) -> List[str]:
+    return parse_rule_patterns(
+        config.get_checker_bundle_param(
+            checker_bundle_name=constants.BUNDLE_NAME, param_name=param_name
+        )
+    )
+
+
+def set_rule_patterns(
+    config: Configuration, param_name: str, patterns: List[str]
+) -> None:
+    """Store the patterns in the checker bundle params, replacing the patterns
+    of the configuration file.
+    """
+    config.set_checker_bundle_param(
+        checker_bundle_name=constants.BUNDLE_NAME,
+        name=param_name,
+        value=",".join(patterns),
+    )
+
+
+def matches_rule_pattern(checker: types.ModuleType, pattern: str) -> bool:
+    return (
+        pattern == families.get_rule_family(checker.RULE_UID)
+        or fnmatch.fnmatchcase(checker.CHECKER_ID, pattern)
+        or fnmatch.fnmatchcase(checker.RULE_UID, pattern)
+    )
+
+
+def get_rule_selection_skip_reasons(
+    config: Configuration, checkers: List[types.ModuleType]
+) -> Dict[str, str]:
+    """Select the checkers to run from the includeRules and excludeRules params.
+
+    Without includeRules, all the checkers are included. A checker is run if it
+    is included and no exclude pattern matches it.
+
+    Returns:
+        Dict[str, str]: the summary of each checker left out, by checker id
+    """
+    include_patterns = get_rule_patterns(config, INCLUDE_RULES_PARAM)
+    exclude_patterns = get_rule_patterns(config, EXCLUDE_RULES_PARAM)
+
+    for pattern in include_patterns + exclude_patterns:
+        if not any(matches_rule_pattern(x, pattern) for x in checkers):
+            logging.warning(f"Rule pattern '{pattern}' matches no checker.")
+
+    skip_reasons = dict()
+    for checker in checkers:
+        if len(include_patterns) > 0 and not any(
+            matches_rule_pattern(checker, x) for x in include_patterns
+        ):
+            skip_reasons[checker.CHECKER_ID] = (
+                f"Rule not matched by {INCLUDE_RULES_PARAM}. Skip the check."
+            )
+            continue
+
+        exclude_pattern = next(
+            (x for x in exclude_patterns if matches_rule_pattern(checker, x)), None
+        )
+        if exclude_pattern is not None:
+            skip_reasons[checker.CHECKER_ID] = (
+                f"Rule excluded by {EXCLUDE_RULES_PARAM} pattern '{exclude_pattern}'. Skip the check."
+            )
+
+    return skip_reasons
@@ -0,0 +1,18 @@
+# SPDX-License-Identifier: MPL-2.0
+# Copyright 2024, ASAM e.V.
+# This Source Code Form is subject to the terms of the Mozilla
+# Public License, v. 2.0. If a copy of the MPL was not distributed
+# with this file, You can obtain one at https://mozilla.org/MPL/2.0/.
+
+import pytest
+
+
+@pytest.fixture(autouse=True)
+def result_cache_dir(monkeypatch, tmp_path_factory) -> str:
+    """Keep the result cache of each test in its own temporary directory, so that
+    tests never replay results cached by earlier runs in ~/.cache/qc_otx. The
+    directory is apart from tmp_path, which tests list as their output folder.
+    """
+    cache_dir = str(tmp_path_factory.mktemp("qc_otx_cache"))
+    monkeypatch.setenv("QC_OTX_CACHE_DIR", cache_dir)
+    return cache_dir
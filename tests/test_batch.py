@@ -0,0 +1,257 @@
+# SPDX-License-Identifier: MPL-2.0
+# Copyright 2024, ASAM e.V.
+# This Source Code Form is subject to the terms of the Mozilla
+# Public License, v. 2.0. If a copy of the MPL was not distributed
+# with this file, You can obtain one at https://mozilla.org/MPL/2.0/.
+
+import multiprocessing
+import os
+import subprocess
+import sys
+import pytest
+from qc_baselib import Configuration, IssueSeverity, Result, StatusType
+from qc_otx import batch, constants
+from qc_otx.checks import core_checker, models, registry
+
+
+def test_collect_input_files() -> None:
+    input_files = batch.collect_input_files(
+        [
+            "tests/data/Core_Chk002",
+            "tests/data/Core_Chk003/*.otx",
+            "tests/data/Core_Chk003/Core_Chk003_negative.otx",
+        ]
+    )
+
+    assert len(input_files) == 7
+    assert len(set(input_files)) == len(input_files)
+    assert all(x.endswith(".otx") for x in input_files)
+
+
+def test_batch_output_dir(monkeypatch, tmp_path) -> None:
+    monkeypatch.setattr(
+        sys,
+        "argv",
+        ["batch.py", "tests/data/Core_Chk009", "-o", str(tmp_path)],
+    )
+    batch.main_batch()
+
+    result_files = sorted(os.listdir(tmp_path))
+    assert result_files == [
+        "Core_Chk009_negative.xqar",
+        "Core_Chk009_negative_multiple.xqar",
+        "Core_Chk009_negative_multiple_errors.xqar",
+        "Core_Chk009_positive.xqar",
+        "Core_Chk009_positive_multiple.xqar",
+    ]
+
+    result = Result()
+    result.load_from_file(os.path.join(tmp_path, "Core_Chk009_negative.xqar"))
+    assert (
+        len(
+            result.get_issues_by_rule_uid(
+                core_checker.mandatory_constant_initialization.RULE_UID
+            )
+        )
+        == 1
+    )
+
+
+def test_batch_combined_result(monkeypatch, tmp_path) -> None:
+    result_file = os.path.join(tmp_path, "combined.xqar")
+    monkeypatch.setattr(
+        sys,
+        "argv",
+        ["batch.py", "tests/data/Core_Chk009/*.otx", "-r", result_file],
+    )
+    batch.main_batch()
+
+    result = Result()
+    result.load_from_file(result_file)
+
+    checker_ids = result.get_checker_ids(constants.BUNDLE_NAME)
+    assert len(checker_ids) == len(set(checker_ids))
+    assert (
+        result.get_checker_status(
+            core_checker.mandatory_constant_initialization.CHECKER_ID
+        )
+        == StatusType.COMPLETED
+    )
+
+    expected_issue_count = 0
+    for input_file in batch.collect_input_files(["tests/data/Core_Chk009/*.otx"]):
+        file_result = batch.main.create_result()
+        batch.main.run_checks(batch.create_file_config(input_file), file_result)
+        expected_issue_count += file_result.get_issue_count()
+
+    assert result.get_issue_count() == expected_issue_count
+    assert (
+        len(
+            result.get_issues_by_rule_uid(
+                core_checker.mandatory_constant_initialization.RULE_UID
+            )
+        )
+        == 4
+    )
+
+
+def test_batch_parallel_matches_sequential(tmp_path) -> None:
+    input_files = batch.collect_input_files(
+        ["tests/data/Core_Chk009", "tests/data/StateMachine_Chk002"]
+    )
+    sequential_file = os.path.join(tmp_path, "sequential.xqar")
+    parallel_file = os.path.join(tmp_path, "parallel.xqar")
+
+    batch.run_batch(input_files, result_file=sequential_file, jobs=1)
+    batch.run_batch(input_files, result_file=parallel_file, jobs=3)
+
+    with open(sequential_file, "rb") as f:
+        sequential_content = f.read()
+    with open(parallel_file, "rb") as f:
+        parallel_content = f.read()
+
+    assert sequential_content == parallel_content
+
+
+def test_batch_parallel_isolates_failing_file(tmp_path) -> None:
+    input_files = batch.collect_input_files(["tests/data/Core_Chk009"])
+    input_files.insert(1, "tests/data/missing.otx")
+    result_file = os.path.join(tmp_path, "combined.xqar")
+
+    result = batch.run_batch(input_files, result_file=result_file, jobs=2)
+
+    assert (
+        len(
+            result.get_issues_by_rule_uid(
+                core_checker.mandatory_constant_initialization.RULE_UID
+            )
+        )
+        == 4
+    )
+
+
+def test_worker_loads_checkers() -> None:
+    # Run in a fresh interpreter, where no rule module is imported yet
+    process = subprocess.run(
+        [
+            sys.executable,
+            "-c",
+            "import sys\n"
+            "from qc_otx import batch\n"
+            "batch._init_worker(None, False, None, False)\n"
+            "print('\\n'.join(x for x in sys.modules if '_checker.' in x))\n",
+        ],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+
+    assert sorted(process.stdout.split()) == sorted(
+        x.__name__ for x in registry.BUILTIN_CHECKERS
+    )
+
+
+def test_merge_results_groups_summaries() -> None:
+    def create_report(input_file: str, summary: str) -> batch.FileReport:
+        return batch.FileReport(
+            input_file,
+            [
+                models.CheckerRecord(
+                    core_checker.mandatory_constant_initialization.CHECKER_ID,
+                    "",
+                    summary,
+                    StatusType.COMPLETED,
+                    [core_checker.mandatory_constant_initialization.RULE_UID],
+                    [
+                        models.IssueRecord(
+                            "Constant is not initialized.",
+                            IssueSeverity.ERROR,
+                            core_checker.mandatory_constant_initialization.RULE_UID,
+                            [("/otx/declarations/constant", "Constant")],
+                        )
+                    ],
+                )
+            ],
+        )
+
+    combined_result = batch.main.create_result()
+    batch.merge_results(
+        combined_result,
+        [
+            create_report("a.otx", "Same summary."),
+            create_report("b.otx", "Other summary."),
+            create_report("c.otx", "Same summary."),
+            batch.FileReport("d.otx", error="Failure"),
+        ],
+    )
+
+    checker_result = combined_result.get_checker_result(
+        constants.BUNDLE_NAME,
+        core_checker.mandatory_constant_initialization.CHECKER_ID,
+    )
+    assert checker_result.summary == "2 files: Same summary. b.otx: Other summary."
+    assert [x.issue_id for x in checker_result.issues] == [0, 1, 2]
+    assert [
+        x.domain_specific_info[0][0].get("path") for x in checker_result.issues
+    ] == ["a.otx", "b.otx", "c.otx"]
+    assert (
+        combined_result.get_checker_bundle_result(constants.BUNDLE_NAME).summary
+        == "Error in d.otx: Failure."
+    )
+
+
+def test_create_file_config_keeps_template() -> None:
+    config_template = Configuration()
+    config_template.set_config_param(name="InputFile", value="template.otx")
+    config_template.register_checker_bundle(checker_bundle_name=constants.BUNDLE_NAME)
+
+    first_config = batch.create_file_config("first.otx", config_template)
+    second_config = batch.create_file_config("second.otx", config_template)
+
+    assert first_config.get_config_param("InputFile") == "first.otx"
+    assert second_config.get_config_param("InputFile") == "second.otx"
+    assert config_template.get_config_param("InputFile") == "template.otx"
+
+
+CRASHING_FILE_NAME = "crash.otx"
+
+
+def _check_file_or_crash(input_file: str, result_path) -> batch.FileReport:
+    if os.path.basename(input_file) == CRASHING_FILE_NAME:
+        os._exit(1)
+    return batch.check_file(input_file, None, models.CheckerCache(), result_path)
+
+
+@pytest.mark.skipif(
+    multiprocessing.get_start_method() != "fork",
+    reason="the patched worker function is only inherited by forked workers",
+)
+def test_batch_parallel_isolates_only_files_in_flight(monkeypatch, tmp_path) -> None:
+    input_files = batch.collect_input_files(["tests/data/Core_Chk009"])
+    # The largest file is submitted first, so the pool breaks on the first files
+    crashing_file = os.path.join(tmp_path, CRASHING_FILE_NAME)
+    with open(input_files[0], "r") as source, open(crashing_file, "w") as target:
+        target.write(source.read() + " " * 1000000)
+    input_files.append(crashing_file)
+
+    pool_sizes = []
+
+    class RecordingExecutor(batch.ProcessPoolExecutor):
+        def __init__(self, max_workers, **kwargs):
+            pool_sizes.append(max_workers)
+            super().__init__(max_workers=max_workers, **kwargs)
+
+    monkeypatch.setattr(batch, "ProcessPoolExecutor", RecordingExecutor)
+    monkeypatch.setattr(batch, "_check_file_in_worker", _check_file_or_crash)
+
+    file_reports = batch.run_parallel(
+        input_files, {x: None for x in input_files}, None, jobs=2
+    )
+
+    assert sorted(file_reports) == sorted(input_files)
+    assert [x for x in input_files if file_reports[x].error is not None] == [
+        crashing_file
+    ]
+    assert pool_sizes[0] == 2
+    assert 1 <= pool_sizes.count(1) <= 2
+    assert pool_sizes[-1] == 2
@@ -0,0 +1,113 @@
+# SPDX-License-Identifier: MPL-2.0
+# Copyright 2024, ASAM e.V.
+# This Source Code Form is subject to the terms of the Mozilla
+# Public License, v. 2.0. If a copy of the MPL was not distributed
+# with this file, You can obtain one at https://mozilla.org/MPL/2.0/.
+
+import pytest
+from qc_baselib import Configuration
+from qc_otx import constants, main
+from qc_otx.benchmark import generator, scaling
+from qc_otx.checks import core_checker, registry
+
+
+def run_generated_document(tmp_path, shape: generator.DocumentShape):
+    input_file = generator.generate_otx_document(str(tmp_path), shape)
+
+    config = Configuration()
+    config.set_config_param(name="InputFile", value=input_file)
+    config.register_checker_bundle(checker_bundle_name=constants.BUNDLE_NAME)
+
+    result = main.create_result()
+    main.run_checks(config, result)
+    return result
+
+
+def test_generated_document_without_issues(tmp_path) -> None:
+    result = run_generated_document(tmp_path, generator.DocumentShape())
+
+    for checker in registry.BUILTIN_CHECKERS:
+        issue_count = result.get_checker_issue_count(
+            constants.BUNDLE_NAME, checker.CHECKER_ID
+        )
+        if checker.CHECKER_ID == core_checker.unique_node_names.CHECKER_ID:
+            continue
+        assert issue_count == 0, checker.CHECKER_ID
+
+
+def test_generated_document_with_issues(tmp_path) -> None:
+    shape = generator.DocumentShape(constants=10, imports=4, issue_interval=2)
+    result = run_generated_document(tmp_path, shape)
+
+    assert (
+        len(
+            result.get_issues_by_rule_uid(
+                core_checker.mandatory_constant_initialization.RULE_UID
+            )
+        )
+        == 5
+    )
+    assert (
+        len(result.get_issues_by_rule_uid(core_checker.no_unused_imports.RULE_UID)) == 2
+    )
+
+
+def test_fit_scaling_exponent() -> None:
+    sizes = [1000, 2000, 4000, 8000]
+
+    assert scaling.fit_scaling_exponent(
+        sizes, [x * 1e-6 for x in sizes]
+    ) == pytest.approx(1)
+    assert scaling.fit_scaling_exponent(
+        sizes, [x**2 * 1e-9 for x in sizes]
+    ) == pytest.approx(2)
+    assert scaling.fit_scaling_exponent([1000], [0.1]) is None
+
+
+def test_run_benchmark(tmp_path) -> None:
+    shape = generator.DocumentShape(procedures=2, constants=2, state_machines=1)
+    samples = scaling.run_benchmark(str(tmp_path), shape, [1, 2])
+
+    assert [x.scale for x in samples] == [1, 2]
+    assert samples[0].input_size < samples[1].input_size
+
+    rule_scalings = scaling.get_rule_scalings(samples)
+    assert [x.checker_id for x in rule_scalings] == [
+        x.CHECKER_ID for x in registry.BUILTIN_CHECKERS
+    ] + [scaling.RUN_CHECKS_LABEL]
+    assert "run_checks" in scaling.format_rule_scalings(samples, rule_scalings)
+
+
+def test_run_xpath_benchmark(tmp_path) -> None:
+    xpath_timings = scaling.run_xpath_benchmark(
+        str(tmp_path), generator.DocumentShape(), 1
+    )
+
+    assert [x.expression for x in xpath_timings] == scaling.XPATH_EXPRESSIONS
+    assert all(x.element_count > 0 for x in xpath_timings)
+    assert all(
+        x.element_xpath_time > 0 and x.compiled_xpath_time > 0 for x in xpath_timings
+    )
+    assert "get_xpath" in scaling.format_xpath_timings(xpath_timings)
+
+
+def test_no_unused_imports_scales_linearly(tmp_path) -> None:
+    # The number of imports and of attributes both grow with the scale, so a check
+    # comparing every import with every attribute would scale quadratically
+    shape = generator.DocumentShape(
+        procedures=20,
+        signatures=0,
+        constants=0,
+        imports=20,
+        state_machines=0,
+        zip_lists=0,
+        issue_interval=2,
+    )
+    samples = scaling.run_benchmark(str(tmp_path), shape, [2, 8, 32], repeat=3)
+
+    rule_scaling = next(
+        x
+        for x in scaling.get_rule_scalings(samples)
+        if x.checker_id == core_checker.no_unused_imports.CHECKER_ID
+    )
+    assert rule_scaling.exponent < 1.5
@@ -7,7 +7,8 @@
 import os
 import pytest
 import test_utils
-from qc_baselib import Result, IssueSeverity, StatusType
+from qc_baselib import Configuration, Result, IssueSeverity, StatusType
+from qc_otx import main
 from qc_otx.checks import core_checker
 
 
@@ -240,6 +241,30 @@ def test_chk004_negative(
     test_utils.cleanup_files()
 
 
+def test_chk004_negative_prefix_substring(
+    monkeypatch,
+) -> None:
+    base_path = "tests/data/Core_Chk004"
+    target_file_name = f"Core_Chk004_negative_prefix_substring.otx"
+    target_file_path = os.path.join(base_path, target_file_name)
+
+    test_utils.create_test_config(target_file_path)
+
+    test_utils.launch_main(monkeypatch)
+
+    result = Result()
+    result.load_from_file(test_utils.REPORT_FILE_PATH)
+
+    # The prefix sig is only part of the used prefix sig2
+    core_issues = result.get_issues_by_rule_uid(
+        "asam.net:otx:1.0.0:core.chk_004.no_unused_imports"
+    )
+    assert len(core_issues) == 1
+    assert "prefix:sig]" in core_issues[0].locations[0].description
+
+    test_utils.cleanup_files()
+
+
 def test_chk005_positive(
     monkeypatch,
 ) -> None:
@@ -299,6 +324,39 @@ def test_chk005_negative(
     test_utils.cleanup_files()
 
 
+@pytest.mark.parametrize("use_streaming", [False, True])
+def test_chk005_issues_in_document_order(tmp_path, use_streaming: bool) -> None:
+    with open("tests/data/Core_Chk005/Core_Chk005_negative.otx", "r") as f:
+        content = f.read()
+    # Undefined prefixes in attributes whose names do not sort in document order
+    content = content.replace(
+        '<term xsi:type="StringLiteral" value="DealershopWorkshop" />',
+        '<term xsi:type="StringLiteral" value="DealershopWorkshop" validFor="bar:X" procedure="baz:Main" />',
+    )
+    input_file = os.path.join(tmp_path, "Core_Chk005_negative.otx")
+    with open(input_file, "w") as f:
+        f.write(content)
+
+    config = Configuration()
+    config.set_config_param(name="InputFile", value=input_file)
+    result = main.create_result()
+    main.run_checks(config, result, use_streaming=use_streaming)
+
+    core_issues = result.get_issues_by_rule_uid(
+        core_checker.no_use_of_undefined_import_prefixes.RULE_UID
+    )
+    assert [x.locations[0].xml_location[0].xpath for x in core_issues] == [
+        "/otx/validities/validity[1]/realisation/term[1]",
+        "/otx/validities/validity[1]/realisation/term[2]",
+        "/otx/validities/validity[1]/realisation/term[2]",
+    ]
+    assert [x.locations[0].description for x in core_issues] == [
+        "Imported prefix foo not found across import elements",
+        "Imported prefix bar not found across import elements",
+        "Imported prefix baz not found across import elements",
+    ]
+
+
 def test_chk006_positive(
     monkeypatch,
 ) -> None:
@@ -532,6 +590,44 @@ def test_chk007_negative_empty_string(
     test_utils.cleanup_files()
 
 
+ORDERED_CHK007_DOCUMENT = """<?xml version="1.0" encoding="UTF-8"?>
+<otx id="2" name="Core_Chk007_order" package="Core_Chk007" version="1.0.0">
+  <validities>
+    <validity name="Workshop" id="4-v1">
+      <specification></specification>
+    </validity>
+  </validities>
+  <signatures>
+    <signature name="Sig" id="5-s1" />
+  </signatures>
+  <procedures>
+    <procedure name="main" id="6-p1" />
+  </procedures>
+</otx>
+"""
+
+
+@pytest.mark.parametrize("use_streaming", [False, True])
+def test_chk007_issues_in_document_order(tmp_path, use_streaming: bool) -> None:
+    input_file = os.path.join(tmp_path, "Core_Chk007_order.otx")
+    with open(input_file, "w") as f:
+        f.write(ORDERED_CHK007_DOCUMENT)
+
+    config = Configuration()
+    config.set_config_param(name="InputFile", value=input_file)
+    result = main.create_result()
+    main.run_checks(config, result, use_streaming=use_streaming)
+
+    core_issues = result.get_issues_by_rule_uid(
+        core_checker.have_specification_if_no_realisation_exists.RULE_UID
+    )
+    assert [x.locations[0].xml_location[0].xpath for x in core_issues] == [
+        "/otx/validities/validity",
+        "/otx/signatures/signature",
+        "/otx/procedures/procedure",
+    ]
+
+
 def test_chk008_positive(
     monkeypatch,
 ) -> None:
@@ -0,0 +1,281 @@
+# SPDX-License-Identifier: MPL-2.0
+# Copyright 2024, ASAM e.V.
+# This Source Code Form is subject to the terms of the Mozilla
+# Public License, v. 2.0. If a copy of the MPL was not distributed
+# with this file, You can obtain one at https://mozilla.org/MPL/2.0/.
+
+import logging
+import os
+import shutil
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import pytest
+import test_utils
+from qc_baselib import Configuration, Result
+from qc_otx import constants, daemon, main, result_cache
+from qc_otx.checks import core_checker, registry
+
+
+@pytest.fixture
+def socket_path():
+    # Unix socket paths are limited in length, so they are not placed in tmp_path
+    socket_dir = tempfile.mkdtemp()
+    socket_path = os.path.join(socket_dir, "qc_otx.sock")
+    server = daemon.create_server(socket_path)
+    server_thread = threading.Thread(target=server.serve_forever)
+    server_thread.start()
+
+    yield socket_path
+
+    server.shutdown()
+    server_thread.join()
+    server.server_close()
+    shutil.rmtree(socket_dir)
+
+
+def count_issues(response, checker_id: str) -> int:
+    checker = next(x for x in response["checkers"] if x["checker_id"] == checker_id)
+    return len(checker["issues"])
+
+
+def test_daemon_json_issues(socket_path) -> None:
+    response = main.forward_to_daemon(
+        socket_path,
+        {
+            "input_file": "tests/data/Core_Chk009/Core_Chk009_negative_multiple_errors.otx",
+            "cwd": os.getcwd(),
+            "format": "json",
+        },
+    )
+
+    assert response["ok"]
+    assert (
+        count_issues(
+            response, core_checker.mandatory_constant_initialization.CHECKER_ID
+        )
+        == 2
+    )
+
+
+def test_daemon_imported_document_changed(socket_path, tmp_path) -> None:
+    input_file = os.path.join(tmp_path, "Core_Chk006_negative.otx")
+    imported_file = os.path.join(tmp_path, "ImportExample.otx")
+    shutil.copy("tests/data/Core_Chk006/Core_Chk006_negative.otx", input_file)
+    shutil.copy("tests/data/Core_Chk006/ImportExample.otx", imported_file)
+    request = {"input_file": input_file, "format": "json"}
+    checker_id = core_checker.match_of_imported_document_data_model_version.CHECKER_ID
+
+    response = main.forward_to_daemon(socket_path, request)
+    assert count_issues(response, checker_id) == 1
+
+    # The daemon must not answer from its cache once the imported document changed
+    with open(imported_file, "r") as file:
+        content = file.read()
+    with open(imported_file, "w") as file:
+        file.write(content.replace("OTX/1.0.0", "OTX/2.0.0"))
+    file_stat = os.stat(imported_file)
+    os.utime(imported_file, ns=(file_stat.st_atime_ns, file_stat.st_mtime_ns + 10**9))
+
+    response = main.forward_to_daemon(socket_path, request)
+    assert count_issues(response, checker_id) == 0
+
+
+def test_daemon_relative_paths(monkeypatch, socket_path, tmp_path) -> None:
+    def fail_chdir(path):
+        pytest.fail("The daemon changed its working directory")
+
+    monkeypatch.setattr(os, "chdir", fail_chdir)
+
+    # The paths of the request and of its configuration are relative to its cwd
+    shutil.copy(
+        "tests/data/Core_Chk009/Core_Chk009_negative_multiple_errors.otx",
+        os.path.join(tmp_path, "input.otx"),
+    )
+    config = Configuration()
+    config.set_config_param(name="InputFile", value="input.otx")
+    config.register_checker_bundle(checker_bundle_name=constants.BUNDLE_NAME)
+    config.set_checker_bundle_param(
+        checker_bundle_name=constants.BUNDLE_NAME,
+        name="resultFile",
+        value="result.xqar",
+    )
+    config.write_to_file(os.path.join(tmp_path, "config.xml"))
+
+    response = main.forward_to_daemon(
+        socket_path,
+        {
+            "config_path": "config.xml",
+            "cwd": str(tmp_path),
+            "format": "none",
+            "write_result": True,
+        },
+    )
+    assert response["ok"]
+
+    result = Result()
+    result.load_from_file(os.path.join(tmp_path, "result.xqar"))
+    assert (
+        len(
+            result.get_issues_by_rule_uid(
+                core_checker.mandatory_constant_initialization.RULE_UID
+            )
+        )
+        == 2
+    )
+
+
+def test_daemon_result_cache_options(socket_path, tmp_path) -> None:
+    cache_dir = os.path.join(tmp_path, "cache")
+    request = {
+        "input_file": "tests/data/Core_Chk009/Core_Chk009_negative_multiple_errors.otx",
+        "cwd": os.getcwd(),
+        "format": "json",
+        "cache_dir": cache_dir,
+        "no_cache": True,
+        "threads": 2,
+        "streaming": True,
+    }
+    checker_id = core_checker.mandatory_constant_initialization.CHECKER_ID
+
+    response = main.forward_to_daemon(socket_path, request)
+    assert count_issues(response, checker_id) == 2
+    assert not os.path.exists(cache_dir)
+
+    request["no_cache"] = False
+    response = main.forward_to_daemon(socket_path, request)
+    assert count_issues(response, checker_id) == 2
+    assert len(result_cache._list_cache_entries(cache_dir)) == 1
+
+
+def test_daemon_client_forwards_options(monkeypatch, tmp_path) -> None:
+    requests = []
+
+    def forward_to_daemon(socket_path, request):
+        requests.append(request)
+        return {"ok": True}
+
+    monkeypatch.setattr(main, "forward_to_daemon", forward_to_daemon)
+    monkeypatch.setattr(
+        sys,
+        "argv",
+        [
+            "main.py",
+            "-c",
+            "config.xml",
+            "--daemon",
+            os.path.join(tmp_path, "qc_otx.sock"),
+            "--no-cache",
+            "--cache_dir",
+            "cache",
+            "--threads",
+            "4",
+            "--streaming",
+        ],
+    )
+    main.main()
+
+    assert requests[0]["no_cache"]
+    assert requests[0]["cache_dir"] == os.path.abspath("cache")
+    assert requests[0]["threads"] == 4
+    assert requests[0]["streaming"]
+
+
+def test_daemon_client_flag(monkeypatch, caplog, socket_path) -> None:
+    test_utils.create_test_config(
+        "tests/data/Core_Chk009/Core_Chk009_negative_multiple_errors.otx"
+    )
+    monkeypatch.setattr(
+        sys,
+        "argv",
+        ["main.py", "-c", test_utils.CONFIG_FILE_PATH, "--daemon", socket_path],
+    )
+
+    with caplog.at_level(logging.INFO):
+        main.main()
+
+    assert "Checks done by the daemon" in caplog.text
+
+    result = Result()
+    result.load_from_file(test_utils.REPORT_FILE_PATH)
+    assert (
+        len(
+            result.get_issues_by_rule_uid(
+                core_checker.mandatory_constant_initialization.RULE_UID
+            )
+        )
+        == 2
+    )
+
+    test_utils.cleanup_files()
+
+
+def test_daemon_client_fallback(monkeypatch, tmp_path) -> None:
+    test_utils.create_test_config(
+        "tests/data/Core_Chk009/Core_Chk009_negative_multiple_errors.otx"
+    )
+    monkeypatch.setattr(
+        sys,
+        "argv",
+        [
+            "main.py",
+            "-c",
+            test_utils.CONFIG_FILE_PATH,
+            "--daemon",
+            os.path.join(tmp_path, "missing.sock"),
+        ],
+    )
+
+    main.main()
+
+    result = Result()
+    result.load_from_file(test_utils.REPORT_FILE_PATH)
+    assert len(result.get_checker_ids(constants.BUNDLE_NAME)) == len(
+        registry.get_checkers()
+    )
+
+    test_utils.cleanup_files()
+
+
+def test_daemon_loads_checkers() -> None:
+    # Run in a fresh interpreter, where no rule module is imported yet
+    process = subprocess.run(
+        [
+            sys.executable,
+            "-c",
+            "import os, shutil, sys, tempfile\n"
+            "from qc_otx import daemon\n"
+            "socket_dir = tempfile.mkdtemp()\n"
+            "server = daemon.create_server(os.path.join(socket_dir, 'qc_otx.sock'))\n"
+            "server.server_close()\n"
+            "shutil.rmtree(socket_dir)\n"
+            "print('\\n'.join(x for x in sys.modules if '_checker.' in x))\n",
+        ],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+
+    assert sorted(process.stdout.split()) == sorted(
+        x.__name__ for x in registry.BUILTIN_CHECKERS
+    )
+
+
+def test_daemon_client_timeout() -> None:
+    # A server which accepts the connection but never answers
+    socket_dir = tempfile.mkdtemp()
+    socket_path = os.path.join(socket_dir, "qc_otx.sock")
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as server:
+        server.bind(socket_path)
+        server.listen(1)
+
+        response = main.forward_to_daemon(
+            socket_path,
+            {"input_file": "tests/data/Core_Chk009/Core_Chk009_negative.otx"},
+            timeout=0.1,
+        )
+
+    shutil.rmtree(socket_dir)
+    assert response is None
@@ -138,3 +138,34 @@ def test_chk008_negative(
     assert "DateOfBirth" in data_type_issues[1].locations[0].description
 
     test_utils.cleanup_files()
+
+
+def test_chk008_negative_special_names(
+    monkeypatch,
+) -> None:
+    base_path = "tests/data/DataType_Chk008/"
+    target_file_name = f"negative_special_names.otx"
+    target_file_path = os.path.join(base_path, target_file_name)
+
+    test_utils.create_test_config(target_file_path)
+
+    test_utils.launch_main(monkeypatch)
+
+    result = Result()
+    result.load_from_file(test_utils.REPORT_FILE_PATH)
+
+    assert (
+        result.get_checker_status(
+            data_type_checker.correct_target_for_structure_element.CHECKER_ID
+        )
+        == StatusType.COMPLETED
+    )
+
+    # The variable of an imported structure type is not checked
+    data_type_issues = result.get_issues_by_rule_uid(
+        "asam.net:otx:1.0.0:data_type.chk_008.correct_target_for_structure_element"
+    )
+    assert len(data_type_issues) == 1
+    assert "O'Brien" in data_type_issues[0].locations[0].description
+
+    test_utils.cleanup_files()
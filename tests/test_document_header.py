@@ -0,0 +1,52 @@
+# SPDX-License-Identifier: MPL-2.0
+# Copyright 2024, ASAM e.V.
+# This Source Code Form is subject to the terms of the Mozilla
+# Public License, v. 2.0. If a copy of the MPL was not distributed
+# with this file, You can obtain one at https://mozilla.org/MPL/2.0/.
+
+import glob
+import os
+import pytest
+from lxml import etree
+from qc_otx.checks import utils
+
+
+@pytest.mark.parametrize(
+    "input_file", sorted(glob.glob("tests/data/**/*.otx", recursive=True))
+)
+def test_document_header(input_file: str) -> None:
+    root = etree.parse(input_file).getroot()
+    header = utils.read_document_header(input_file)
+
+    assert header.name == root.get("name")
+    assert header.package == root.get("package")
+    assert header.version == root.get("version")
+    assert header.nsmap == root.nsmap
+    assert utils.get_nsmap_data_model_version(
+        header.nsmap
+    ) == utils.get_data_model_version(root)
+
+
+def test_document_header_reads_root_only(tmp_path) -> None:
+    input_file = os.path.join(tmp_path, "truncated.otx")
+    with open(input_file, "w") as file:
+        file.write('<otx xmlns="http://iso.org/OTX/1.0.0" name="Truncated" ')
+        file.write('package="Examples" version="1.0.0"><procedures>')
+        file.write("<procedure>" * 10000)
+
+    header = utils.read_document_header(input_file)
+
+    assert header.name == "Truncated"
+    assert header.package == "Examples"
+    assert utils.get_nsmap_data_model_version(header.nsmap) == "1.0.0"
+
+
+def test_document_header_invalid_root(tmp_path) -> None:
+    input_file = os.path.join(tmp_path, "invalid.otx")
+    with open(input_file, "w") as file:
+        file.write("<otx name=>")
+
+    with pytest.raises(etree.XMLSyntaxError):
+        utils.read_document_header(input_file)
+
+    assert utils.get_package_dot_name(input_file) is None
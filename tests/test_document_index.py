@@ -0,0 +1,46 @@
+# SPDX-License-Identifier: MPL-2.0
+# Copyright 2024, ASAM e.V.
+# This Source Code Form is subject to the terms of the Mozilla
+# Public License, v. 2.0. If a copy of the MPL was not distributed
+# with this file, You can obtain one at https://mozilla.org/MPL/2.0/.
+
+import pytest
+from lxml import etree
+from qc_otx.checks import utils
+
+
+@pytest.mark.parametrize(
+    "target_file_path",
+    [
+        "tests/data/Core_Chk005/Core_Chk005_negative.otx",
+        "tests/data/Core_Chk010/Core_Chk010_negative.otx",
+        "tests/data/DataType_Chk008/negative.otx",
+        "tests/data/StateMachine_Chk002/negative.otx",
+        "tests/data/ZipFile_Chk002/negative.otx",
+    ],
+)
+def test_document_index_matches_xpath(target_file_path: str) -> None:
+    tree = etree.parse(target_file_path)
+    root = tree.getroot()
+    nsmap = utils.get_namespace_map(tree)
+
+    document_index = utils.build_document_index(tree)
+
+    for tag in ["procedure", "constant", "signature", "variable", "stepByName"]:
+        assert document_index.elements_by_tag.get(tag, []) == tree.xpath(f"//{tag}")
+
+    assert document_index.import_nodes == root.findall(
+        ".//import", namespaces=root.nsmap
+    )
+
+    for name, elements in document_index.elements_by_name.items():
+        assert elements == tree.xpath("//*[@name=$name]", name=name)
+
+    if "xsi" in nsmap:
+        for xsi_type in ["smp:StateMachineProcedure", "zip:ZipFile", "ListLiteral"]:
+            assert document_index.elements_by_xsi_type.get(xsi_type, []) == tree.xpath(
+                "//*[@xsi:type=$xsi_type]", namespaces=nsmap, xsi_type=xsi_type
+            )
+
+    attribute_count = sum(len(x) for x in document_index.attributes.values())
+    assert attribute_count == len(tree.xpath("//@*"))
@@ -0,0 +1,175 @@
+# SPDX-License-Identifier: MPL-2.0
+# Copyright 2024, ASAM e.V.
+# This Source Code Form is subject to the terms of the Mozilla
+# Public License, v. 2.0. If a copy of the MPL was not distributed
+# with this file, You can obtain one at https://mozilla.org/MPL/2.0/.
+
+import os
+import sys
+import pytest
+from typing import Optional
+from qc_baselib import Configuration, IssueSeverity, Result, StatusType
+from qc_otx import constants, main, rule_selection
+from qc_otx.checks import core_checker, data_type_checker, families, registry
+
+MULTIPLE_ERRORS_FILE = "tests/data/Core_Chk009/Core_Chk009_negative_multiple_errors.otx"
+
+FAIL_FAST_SUMMARY = (
+    f"Fail-fast: {core_checker.mandatory_constant_initialization.CHECKER_ID} "
+    "registered an issue of severity ERROR or higher. Skip the check."
+)
+
+
+def create_config(
+    input_file: str,
+    fail_fast_severity: Optional[str],
+    include_rules: Optional[str] = None,
+) -> Configuration:
+    config = Configuration()
+    config.set_config_param(name="InputFile", value=input_file)
+    config.register_checker_bundle(checker_bundle_name=constants.BUNDLE_NAME)
+    if fail_fast_severity is not None:
+        config.set_checker_bundle_param(
+            checker_bundle_name=constants.BUNDLE_NAME,
+            name=main.FAIL_FAST_SEVERITY_PARAM,
+            value=fail_fast_severity,
+        )
+    if include_rules is not None:
+        config.set_checker_bundle_param(
+            checker_bundle_name=constants.BUNDLE_NAME,
+            name=rule_selection.INCLUDE_RULES_PARAM,
+            value=include_rules,
+        )
+    return config
+
+
+def get_issue_count(result: Result, checker_id: str) -> int:
+    return result.get_checker_issue_count(constants.BUNDLE_NAME, checker_id)
+
+
+def test_fail_fast_severity_param() -> None:
+    assert (
+        main.get_fail_fast_severity(create_config(MULTIPLE_ERRORS_FILE, None)) is None
+    )
+    assert (
+        main.get_fail_fast_severity(create_config(MULTIPLE_ERRORS_FILE, "ERROR"))
+        == IssueSeverity.ERROR
+    )
+    assert (
+        main.get_fail_fast_severity(create_config(MULTIPLE_ERRORS_FILE, "warning"))
+        == IssueSeverity.WARNING
+    )
+    assert (
+        main.get_fail_fast_severity(create_config(MULTIPLE_ERRORS_FILE, "3"))
+        == IssueSeverity.INFORMATION
+    )
+    with pytest.raises(ValueError):
+        main.get_fail_fast_severity(create_config(MULTIPLE_ERRORS_FILE, "CRITICAL"))
+
+
+@pytest.mark.parametrize("use_streaming", [False, True])
+def test_fail_fast_stops_at_first_error(use_streaming: bool) -> None:
+    result = main.create_result()
+    main.run_checks(
+        create_config(MULTIPLE_ERRORS_FILE, "ERROR"),
+        result,
+        use_streaming=use_streaming,
+    )
+
+    checker_ids = [x.CHECKER_ID for x in registry.BUILTIN_CHECKERS]
+    failing_index = checker_ids.index(
+        core_checker.mandatory_constant_initialization.CHECKER_ID
+    )
+    assert get_issue_count(result, checker_ids[failing_index]) == 1
+
+    for checker_id in checker_ids[:failing_index]:
+        checker_result = result.get_checker_result(constants.BUNDLE_NAME, checker_id)
+        assert "Fail-fast" not in checker_result.summary
+
+    # The zip file and state machine families are skipped for their namespaces
+    for checker in registry.BUILTIN_CHECKERS[failing_index + 1 :]:
+        checker_result = result.get_checker_result(
+            constants.BUNDLE_NAME, checker.CHECKER_ID
+        )
+        assert checker_result.status == StatusType.SKIPPED
+        if families.get_rule_family(checker.RULE_UID) in ["core", "data_type"]:
+            assert checker_result.summary == FAIL_FAST_SUMMARY
+
+
+def test_fail_fast_severity_threshold() -> None:
+    # Duplicated node names are warnings, which only stop at the WARNING severity
+    unique_node_names_id = core_checker.unique_node_names.CHECKER_ID
+    for fail_fast_severity, issue_count in [
+        (None, 3),
+        ("ERROR", 3),
+        ("WARNING", 1),
+    ]:
+        result = main.create_result()
+        main.run_checks(
+            create_config(
+                "tests/data/Core_Chk010/Core_Chk010_negative.otx",
+                fail_fast_severity,
+                include_rules=unique_node_names_id,
+            ),
+            result,
+        )
+        assert get_issue_count(result, unique_node_names_id) == issue_count
+
+    structure_element_id = (
+        data_type_checker.correct_target_for_structure_element.CHECKER_ID
+    )
+    result = main.create_result()
+    main.run_checks(
+        create_config(
+            "tests/data/DataType_Chk008/negative.otx",
+            "ERROR",
+            include_rules=structure_element_id,
+        ),
+        result,
+    )
+    assert get_issue_count(result, structure_element_id) == 1
+
+
+def test_fail_fast_result_cache(tmp_path) -> None:
+    cache_dir = os.path.join(tmp_path, "cache")
+    checker_id = core_checker.mandatory_constant_initialization.CHECKER_ID
+
+    result = main.create_result()
+    main.run_checks(
+        create_config(MULTIPLE_ERRORS_FILE, "ERROR"), result, result_cache_dir=cache_dir
+    )
+    assert get_issue_count(result, checker_id) == 1
+
+    # A full run must not replay the partial result of the fail-fast run
+    result = main.create_result()
+    main.run_checks(
+        create_config(MULTIPLE_ERRORS_FILE, None), result, result_cache_dir=cache_dir
+    )
+    assert get_issue_count(result, checker_id) == 2
+
+
+def test_cli_fail_fast(monkeypatch, tmp_path) -> None:
+    config_file = os.path.join(tmp_path, "config.xml")
+    result_file = os.path.join(tmp_path, "result.xqar")
+    config = create_config(MULTIPLE_ERRORS_FILE, None)
+    config.set_checker_bundle_param(
+        checker_bundle_name=constants.BUNDLE_NAME, name="resultFile", value=result_file
+    )
+    config.write_to_file(config_file)
+
+    monkeypatch.setattr(
+        sys, "argv", ["main.py", "-c", config_file, "--no-cache", "--fail_fast"]
+    )
+    main.main()
+
+    result = Result()
+    result.load_from_file(result_file)
+    assert (
+        get_issue_count(
+            result, core_checker.mandatory_constant_initialization.CHECKER_ID
+        )
+        == 1
+    )
+    assert result.get_checker_result(
+        constants.BUNDLE_NAME, core_checker.unique_node_names.CHECKER_ID
+    ).summary.startswith(FAIL_FAST_SUMMARY)
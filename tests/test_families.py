@@ -0,0 +1,95 @@
+# SPDX-License-Identifier: MPL-2.0
+# Copyright 2024, ASAM e.V.
+# This Source Code Form is subject to the terms of the Mozilla
+# Public License, v. 2.0. If a copy of the MPL was not distributed
+# with this file, You can obtain one at https://mozilla.org/MPL/2.0/.
+
+import os
+from typing import List
+from qc_baselib import Configuration, Result, StatusType
+from qc_otx import constants, main
+from qc_otx.checks import families, registry
+
+
+def run_checks(input_file: str) -> Result:
+    config = Configuration()
+    config.set_config_param(name="InputFile", value=input_file)
+    result = main.create_result()
+    main.run_checks(config, result)
+    return result
+
+
+def get_family_checkers(family: str) -> List:
+    return [
+        x
+        for x in registry.BUILTIN_CHECKERS
+        if families.get_rule_family(x.RULE_UID) == family
+    ]
+
+
+def fail_check_rule(checker_data) -> None:
+    raise AssertionError("check_rule of a skipped family was called")
+
+
+def test_rule_families() -> None:
+    assert [
+        families.get_rule_family(x.RULE_UID) for x in registry.BUILTIN_CHECKERS
+    ] == (["core"] * 10 + ["data_type"] * 2 + ["zip_file"] * 2 + ["state_machine"] * 6)
+
+
+def test_families_without_namespace_are_skipped(monkeypatch) -> None:
+    for family in ["zip_file", "state_machine"]:
+        for checker in get_family_checkers(family):
+            monkeypatch.setattr(checker, "check_rule", fail_check_rule)
+
+    result = run_checks("tests/data/Core_Chk009/Core_Chk009_negative.otx")
+
+    for family in ["zip_file", "state_machine"]:
+        for checker in get_family_checkers(family):
+            checker_result = result.get_checker_result(
+                constants.BUNDLE_NAME, checker.CHECKER_ID
+            )
+            assert checker_result.status == StatusType.SKIPPED
+            assert (
+                checker_result.summary
+                == families.FAMILY_REQUIREMENTS[family].missing_prefix_summary
+            )
+
+
+def test_family_without_xsi_type_is_skipped(monkeypatch, tmp_path) -> None:
+    for checker in get_family_checkers("state_machine"):
+        monkeypatch.setattr(checker, "check_rule", fail_check_rule)
+
+    input_file = os.path.join(tmp_path, "NoStateMachine.otx")
+    with open(input_file, "w") as f:
+        f.write(
+            '<?xml version="1.0" encoding="UTF-8"?>\n'
+            '<otx xmlns="http://iso.org/OTX/1.0.0" '
+            'xmlns:smp="http://iso.org/OTX/1.0.0/StateMachineProcedure" '
+            'id="1" name="NoStateMachine" package="Test" version="1.0.0" '
+            'timestamp="2024-01-01T00:00:00">\n'
+            '  <procedures><procedure name="main" id="2" visibility="PUBLIC"/></procedures>\n'
+            "</otx>\n"
+        )
+
+    result = run_checks(input_file)
+
+    for checker in get_family_checkers("state_machine"):
+        checker_result = result.get_checker_result(
+            constants.BUNDLE_NAME, checker.CHECKER_ID
+        )
+        assert checker_result.status == StatusType.SKIPPED
+        assert (
+            checker_result.summary
+            == "State machine procedures not found. Skip the check."
+        )
+
+
+def test_families_with_namespace_are_run() -> None:
+    result = run_checks("tests/data/StateMachine_Chk001/negative.otx")
+
+    for checker in get_family_checkers("state_machine"):
+        assert (
+            result.get_checker_result(constants.BUNDLE_NAME, checker.CHECKER_ID).status
+            == StatusType.COMPLETED
+        )
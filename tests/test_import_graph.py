@@ -0,0 +1,110 @@
+# SPDX-License-Identifier: MPL-2.0
+# Copyright 2024, ASAM e.V.
+# This Source Code Form is subject to the terms of the Mozilla
+# Public License, v. 2.0. If a copy of the MPL was not distributed
+# with this file, You can obtain one at https://mozilla.org/MPL/2.0/.
+
+import os
+from typing import List
+from qc_baselib import Configuration
+from qc_otx import constants, main
+from qc_otx.checks import core_checker, models, utils
+
+
+def write_document(directory, name: str, imports: List[str], body: str = "") -> str:
+    file_path = os.path.join(directory, name + ".otx")
+    with open(file_path, "w") as file:
+        file.write(
+            f'<otx xmlns="http://iso.org/OTX/1.0.0" name="{name}" package="Examples" version="1.0.0">'
+        )
+        file.write("<imports>")
+        for i, imported_name in enumerate(imports):
+            file.write(
+                f'<import package="Examples" document="{imported_name}" prefix="p{i}"/>'
+            )
+        file.write("</imports>")
+        file.write(body)
+        file.write("</otx>")
+    return file_path
+
+
+def test_read_document_imports_stops_after_imports(tmp_path) -> None:
+    file_path = write_document(
+        tmp_path, "Truncated", ["Library"], "<procedures><procedure>"
+    )
+
+    header, imports = utils.read_document_imports(file_path)
+
+    assert header.name == "Truncated"
+    assert imports == [{"package": "Examples", "document": "Library", "prefix": "p0"}]
+
+
+def test_import_cycles(tmp_path) -> None:
+    a = write_document(tmp_path, "A", ["B", "Missing"])
+    b = write_document(tmp_path, "B", ["C"])
+    c = write_document(tmp_path, "C", ["A", "D"])
+    d = write_document(tmp_path, "D", ["D"])
+    e = write_document(tmp_path, "E", ["A"])
+    import_graph = models.ImportGraph()
+
+    visited_files = set()
+    cycles = utils.find_import_cycles(import_graph, [e], visited_files)
+
+    assert cycles == [[d], [a, b, c]]
+    assert visited_files == {a, b, c, d, e, os.path.join(tmp_path, "Missing.otx")}
+    assert not import_graph.documents[os.path.join(tmp_path, "Missing.otx")].exists
+    assert utils.find_import_cycles(import_graph, [d]) == [[d]]
+
+
+def test_import_chain_is_not_recursive(tmp_path) -> None:
+    length = 3000
+    for i in range(length):
+        write_document(tmp_path, f"Doc{i}", [f"Doc{i + 1}"] if i + 1 < length else [])
+    import_graph = models.ImportGraph()
+
+    visited_files = set()
+    cycles = utils.find_import_cycles(
+        import_graph, [os.path.join(tmp_path, "Doc0.otx")], visited_files
+    )
+
+    assert cycles == []
+    assert len(visited_files) == length
+
+
+def test_import_cycle_summary(tmp_path) -> None:
+    input_file = write_document(tmp_path, "A", ["B"])
+    write_document(tmp_path, "B", ["A"])
+
+    config = Configuration()
+    config.set_config_param(name="InputFile", value=input_file)
+    result = main.create_result()
+    main.run_checks(config, result)
+
+    checker_result = next(
+        x
+        for x in result.get_checker_results(constants.BUNDLE_NAME)
+        if x.checker_id == core_checker.no_dead_import_links.CHECKER_ID
+    )
+    assert "Import cycle found: A.otx -> B.otx -> A.otx." in checker_result.summary
+
+
+def test_shared_library_read_once(monkeypatch, tmp_path) -> None:
+    library = write_document(tmp_path, "Library", [])
+    input_files = [write_document(tmp_path, f"User{i}", ["Library"]) for i in range(5)]
+
+    read_files = []
+    read_document_imports = utils.read_document_imports
+
+    def counting_read_document_imports(file_path):
+        read_files.append(file_path)
+        return read_document_imports(file_path)
+
+    monkeypatch.setattr(utils, "read_document_imports", counting_read_document_imports)
+
+    cache = models.CheckerCache()
+    for input_file in input_files:
+        config = Configuration()
+        config.set_config_param(name="InputFile", value=input_file)
+        main.run_checks(config, main.create_result(), cache)
+
+    assert read_files.count(library) == 1
@@ -0,0 +1,56 @@
+# SPDX-License-Identifier: MPL-2.0
+# Copyright 2024, ASAM e.V.
+# This Source Code Form is subject to the terms of the Mozilla
+# Public License, v. 2.0. If a copy of the MPL was not distributed
+# with this file, You can obtain one at https://mozilla.org/MPL/2.0/.
+
+import glob
+import pytest
+from lxml import etree
+from qc_otx.checks import locations
+
+from test_streaming import MIXED_NAMESPACE_DOCUMENT
+
+
+def assert_paths_match(tree: etree._ElementTree) -> None:
+    elements = list(tree.getroot().iter(etree.Element))
+
+    # Locate the elements in reverse order, so that the ancestors are not
+    # located first
+    locator = locations.ElementLocator()
+    paths = [locator.get_path(x) for x in reversed(elements)]
+
+    assert list(reversed(paths)) == [tree.getpath(x) for x in elements]
+
+
+@pytest.mark.parametrize(
+    "input_file", sorted(glob.glob("tests/data/**/*.otx", recursive=True))
+)
+def test_element_paths(input_file: str) -> None:
+    assert_paths_match(etree.parse(input_file))
+
+
+def test_element_paths_mixed_namespaces() -> None:
+    root = etree.fromstring(MIXED_NAMESPACE_DOCUMENT.encode("utf-8"))
+    assert_paths_match(root.getroottree())
+
+
+def test_paths_are_cached() -> None:
+    root = etree.fromstring(
+        "<otx><procedures>"
+        + "".join(f'<procedure name="p{i}"/>' for i in range(100))
+        + "</procedures></otx>"
+    )
+
+    locator = locations.ElementLocator()
+    path = locator.get_path(root[0][50])
+
+    assert path == "/otx/procedures/procedure[51]"
+    assert locator.get_path(root[0][50]) is path
+    # The siblings were numbered in the same pass
+    assert len(locator._paths) == 102
+
+
+def test_stream_locations() -> None:
+    locator = locations.ElementLocator()
+    assert locator.get_path("/otx/imports/import[2]") == "/otx/imports/import[2]"
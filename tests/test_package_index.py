@@ -0,0 +1,94 @@
+# SPDX-License-Identifier: MPL-2.0
+# Copyright 2024, ASAM e.V.
+# This Source Code Form is subject to the terms of the Mozilla
+# Public License, v. 2.0. If a copy of the MPL was not distributed
+# with this file, You can obtain one at https://mozilla.org/MPL/2.0/.
+
+import os
+import shutil
+from qc_baselib import Configuration
+from qc_otx import constants, main
+from qc_otx.checks import core_checker, models, utils
+
+
+def copy_negative_package(tmp_path) -> str:
+    package_root = os.path.join(tmp_path, "negative")
+    shutil.copytree("tests/data/Core_Chk002/negative", package_root)
+    return package_root
+
+
+def count_package_issues(input_file: str, cache: models.CheckerCache) -> int:
+    config = Configuration()
+    config.set_config_param(name="InputFile", value=input_file)
+    config.register_checker_bundle(checker_bundle_name=constants.BUNDLE_NAME)
+
+    result = main.create_result()
+    main.run_checks(config, result, cache)
+    return len(
+        result.get_issues_by_rule_uid(
+            core_checker.document_name_package_uniqueness.RULE_UID
+        )
+    )
+
+
+def test_package_index_duplicates(tmp_path) -> None:
+    package_root = copy_negative_package(tmp_path)
+    package_index = utils.get_package_index(models.CheckerCache(), package_root)
+
+    assert package_index.files_by_dot_name == {
+        "negative.package1.Core_Chk002_negative": [
+            os.path.join(package_root, "package1", "Core_Chk002_negative.otx"),
+            os.path.join(package_root, "package2", "Core_Chk002_negative.otx"),
+        ]
+    }
+
+
+def test_package_index_read_once(monkeypatch, tmp_path) -> None:
+    package_root = copy_negative_package(tmp_path)
+    read_files = []
+    get_package_dot_name = utils.get_package_dot_name
+
+    def counting_get_package_dot_name(file):
+        read_files.append(file)
+        return get_package_dot_name(file)
+
+    monkeypatch.setattr(utils, "get_package_dot_name", counting_get_package_dot_name)
+
+    cache = models.CheckerCache()
+    for package in ("package1", "package2"):
+        input_file = os.path.join(package_root, package, "Core_Chk002_negative.otx")
+        assert count_package_issues(input_file, cache) == 1
+
+    assert len(read_files) == 2
+
+
+def test_package_index_update(tmp_path) -> None:
+    package_root = copy_negative_package(tmp_path)
+    cache = models.CheckerCache()
+    package_index = utils.get_package_index(cache, package_root)
+    dot_name = "negative.package1.Core_Chk002_negative"
+
+    # A changed document is read again
+    changed_file = os.path.join(package_root, "package2", "Core_Chk002_negative.otx")
+    with open(changed_file, "r") as file:
+        content = file.read()
+    with open(changed_file, "w") as file:
+        file.write(content.replace("negative.package1", "negative.package2"))
+    file_stat = os.stat(changed_file)
+    os.utime(changed_file, ns=(file_stat.st_atime_ns, file_stat.st_mtime_ns + 10**9))
+
+    utils.update_package_index(package_index)
+    assert len(package_index.files_by_dot_name[dot_name]) == 1
+
+    # Added and removed documents are picked up
+    added_file = os.path.join(package_root, "package2", "Copy.otx")
+    shutil.copy(
+        os.path.join(package_root, "package1", "Core_Chk002_negative.otx"), added_file
+    )
+    utils.update_package_index(package_index)
+    assert package_index.files_by_dot_name[dot_name][-1] == added_file
+
+    os.remove(added_file)
+    utils.update_package_index(package_index)
+    assert len(package_index.files_by_dot_name[dot_name]) == 1
+    assert utils.get_package_index(cache, package_root) is package_index
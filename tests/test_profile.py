@@ -0,0 +1,61 @@
+# SPDX-License-Identifier: MPL-2.0
+# Copyright 2024, ASAM e.V.
+# This Source Code Form is subject to the terms of the Mozilla
+# Public License, v. 2.0. If a copy of the MPL was not distributed
+# with this file, You can obtain one at https://mozilla.org/MPL/2.0/.
+
+import json
+import os
+import sys
+import pytest
+from qc_baselib import Configuration, Result
+import qc_otx.main as main
+from qc_otx import constants
+from qc_otx.checks import core_checker, families, registry
+
+
+def test_checker_profiles(monkeypatch, tmp_path) -> None:
+    config_file = os.path.join(tmp_path, "config.xml")
+    result_file = os.path.join(tmp_path, "result.xqar")
+    config = Configuration()
+    config.set_config_param(
+        name="InputFile", value="tests/data/Core_Chk009/Core_Chk009_negative.otx"
+    )
+    config.register_checker_bundle(checker_bundle_name=constants.BUNDLE_NAME)
+    config.set_checker_bundle_param(
+        checker_bundle_name=constants.BUNDLE_NAME, name="resultFile", value=result_file
+    )
+    config.write_to_file(config_file)
+
+    monkeypatch.setattr(sys, "argv", ["main.py", "-c", config_file, "--profile_json"])
+    main.main()
+
+    with open(main.get_profile_file_path(result_file)) as f:
+        profile = json.load(f)
+
+    # The document has no zip or state machine namespace, so these families are
+    # skipped without running and have no profile
+    checker_profiles = profile["checkers"]
+    assert [x["checker_id"] for x in checker_profiles] == [
+        x.CHECKER_ID
+        for x in registry.BUILTIN_CHECKERS
+        if families.get_rule_family(x.RULE_UID) in ["core", "data_type"]
+    ]
+    for checker_profile in checker_profiles:
+        assert checker_profile["wall_time"] >= 0
+        assert checker_profile["cpu_time"] >= 0
+        assert checker_profile["peak_memory"] >= 0
+
+    constant_profile = next(
+        x
+        for x in checker_profiles
+        if x["checker_id"] == core_checker.mandatory_constant_initialization.CHECKER_ID
+    )
+    assert constant_profile["issue_count"] == 1
+
+    result = Result()
+    result.load_from_file(result_file)
+    checker = result.get_checker_result(
+        constants.BUNDLE_NAME, core_checker.mandatory_constant_initialization.CHECKER_ID
+    )
+    assert "1 issue(s) registered" in checker.summary
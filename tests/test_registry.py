@@ -0,0 +1,152 @@
+# SPDX-License-Identifier: MPL-2.0
+# Copyright 2024, ASAM e.V.
+# This Source Code Form is subject to the terms of the Mozilla
+# Public License, v. 2.0. If a copy of the MPL was not distributed
+# with this file, You can obtain one at https://mozilla.org/MPL/2.0/.
+
+import importlib
+import importlib.metadata
+import os
+import subprocess
+import sys
+from qc_baselib import Configuration, StatusType
+from qc_otx import constants, main
+from qc_otx.checks import registry
+
+# Budget of the time spent in the modules of qc_otx when importing qc_otx.main,
+# without the time of the third party modules they import
+IMPORT_TIME_BUDGET_US = 250_000
+
+PLUGIN_RULE_MODULE = """
+from qc_baselib import IssueSeverity
+from qc_otx import constants
+
+CHECKER_ID = "check_acme_otx_chk_001_always_fails"
+CHECKER_DESCRIPTION = "Always registers an issue."
+CHECKER_PRECONDITIONS = set()
+RULE_UID = "acme.com:otx:1.0.0:acme.chk_001.always_fails"
+
+
+def check_rule(checker_data) -> None:
+    checker_data.result.register_issue(
+        checker_bundle_name=constants.BUNDLE_NAME,
+        checker_id=CHECKER_ID,
+        description="Issue found by a plugin rule",
+        level=IssueSeverity.ERROR,
+        rule_uid=RULE_UID,
+    )
+"""
+
+PLUGIN_REGISTRY_MODULE = """
+from qc_otx.checks import registry
+
+CHECKERS = [
+    registry.CheckerEntry(
+        module_name="acme_rule",
+        checker_id="check_acme_otx_chk_001_always_fails",
+        checker_description="Always registers an issue.",
+        rule_uid="acme.com:otx:1.0.0:acme.chk_001.always_fails",
+    )
+]
+"""
+
+
+def run_python(code: str, *args: str) -> subprocess.CompletedProcess:
+    return subprocess.run(
+        [sys.executable, *args, "-c", code],
+        capture_output=True,
+        text=True,
+        check=True,
+        cwd=os.getcwd(),
+    )
+
+
+def test_builtin_checkers_match_modules() -> None:
+    assert len(set(x.CHECKER_ID for x in registry.BUILTIN_CHECKERS)) == len(
+        registry.BUILTIN_CHECKERS
+    )
+    for checker in registry.BUILTIN_CHECKERS:
+        module = importlib.import_module(checker.__name__)
+        assert checker.CHECKER_ID == module.CHECKER_ID
+        assert checker.CHECKER_DESCRIPTION == module.CHECKER_DESCRIPTION
+        assert checker.CHECKER_PRECONDITIONS == module.CHECKER_PRECONDITIONS
+        assert checker.RULE_UID == module.RULE_UID
+        assert checker.check_rule is module.check_rule
+
+
+def test_import_time_budget() -> None:
+    process = run_python("import qc_otx.main", "-X", "importtime")
+
+    qc_otx_modules = dict()
+    for line in process.stderr.splitlines():
+        if not line.startswith("import time:") or "[us]" in line:
+            continue
+        self_time, _, module_name = line[len("import time:") :].split("|")
+        module_name = module_name.strip()
+        if module_name.split(".")[0] == "qc_otx":
+            qc_otx_modules[module_name] = int(self_time)
+
+    assert "qc_otx.main" in qc_otx_modules
+    assert [x for x in qc_otx_modules if x.count("_checker.") > 0] == []
+    assert sum(qc_otx_modules.values()) < IMPORT_TIME_BUDGET_US, qc_otx_modules
+
+
+def test_excluded_rules_are_not_imported() -> None:
+    process = run_python(
+        "import sys\n"
+        "from qc_baselib import Configuration\n"
+        "from qc_otx import constants, main\n"
+        "config = Configuration()\n"
+        "config.set_config_param(name='InputFile', value='tests/data/Core_Chk009/Core_Chk009_negative.otx')\n"
+        "config.register_checker_bundle(checker_bundle_name=constants.BUNDLE_NAME)\n"
+        "config.set_checker_bundle_param(checker_bundle_name=constants.BUNDLE_NAME, name='includeRules', value='core')\n"
+        "main.run_checks(config, main.create_result())\n"
+        "print('\\n'.join(x for x in sys.modules if '_checker.' in x))\n"
+    )
+
+    imported_modules = process.stdout.split()
+    assert len(imported_modules) == 10
+    assert all(x.startswith("qc_otx.checks.core_checker.") for x in imported_modules)
+
+
+def test_plugin_checkers(monkeypatch, tmp_path) -> None:
+    with open(os.path.join(tmp_path, "acme_rule.py"), "w") as f:
+        f.write(PLUGIN_RULE_MODULE)
+    with open(os.path.join(tmp_path, "acme_registry.py"), "w") as f:
+        f.write(PLUGIN_REGISTRY_MODULE)
+    monkeypatch.syspath_prepend(str(tmp_path))
+
+    plugin_checkers = registry.load_plugin_checkers(
+        [
+            importlib.metadata.EntryPoint(
+                name="acme",
+                value="acme_registry:CHECKERS",
+                group=registry.ENTRY_POINT_GROUP,
+            ),
+            importlib.metadata.EntryPoint(
+                name="broken",
+                value="acme_missing:CHECKERS",
+                group=registry.ENTRY_POINT_GROUP,
+            ),
+        ]
+    )
+    assert [x.CHECKER_ID for x in plugin_checkers] == [
+        "check_acme_otx_chk_001_always_fails"
+    ]
+    assert "acme_rule" not in sys.modules
+
+    monkeypatch.setattr(
+        registry, "_checkers", registry.BUILTIN_CHECKERS + plugin_checkers
+    )
+    config = Configuration()
+    config.set_config_param(
+        name="InputFile", value="tests/data/Core_Chk009/Core_Chk009_negative.otx"
+    )
+    result = main.create_result()
+    main.run_checks(config, result)
+
+    checker_result = result.get_checker_result(
+        constants.BUNDLE_NAME, "check_acme_otx_chk_001_always_fails"
+    )
+    assert checker_result.status == StatusType.COMPLETED
+    assert len(checker_result.issues) == 1
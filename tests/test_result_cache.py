@@ -0,0 +1,136 @@
+# SPDX-License-Identifier: MPL-2.0
+# Copyright 2024, ASAM e.V.
+# This Source Code Form is subject to the terms of the Mozilla
+# Public License, v. 2.0. If a copy of the MPL was not distributed
+# with this file, You can obtain one at https://mozilla.org/MPL/2.0/.
+
+import os
+import shutil
+import pytest
+from qc_baselib import Configuration
+from qc_otx import constants, main, result_cache
+from qc_otx.checks import core_checker
+
+
+def check_file(input_file: str, cache_dir: str, result_file: str):
+    config = Configuration()
+    config.set_config_param(name="InputFile", value=input_file)
+    config.register_checker_bundle(checker_bundle_name=constants.BUNDLE_NAME)
+
+    result = main.create_result()
+    main.run_checks(config, result, result_cache_dir=cache_dir)
+    result.write_to_file(result_file, generate_summary=True)
+    return result
+
+
+def test_result_cache_replay(monkeypatch, tmp_path) -> None:
+    cache_dir = os.path.join(tmp_path, "cache")
+    input_file = "tests/data/Core_Chk009/Core_Chk009_negative_multiple_errors.otx"
+    first_result_file = os.path.join(tmp_path, "first.xqar")
+    second_result_file = os.path.join(tmp_path, "second.xqar")
+
+    check_file(input_file, cache_dir, first_result_file)
+
+    # The second run must not parse the input file
+    def fail_parse(*args, **kwargs):
+        pytest.fail("The input file was parsed despite a cached result")
+
+    monkeypatch.setattr(main.etree, "parse", fail_parse)
+    result = check_file(input_file, cache_dir, second_result_file)
+
+    assert (
+        len(
+            result.get_issues_by_rule_uid(
+                core_checker.mandatory_constant_initialization.RULE_UID
+            )
+        )
+        == 2
+    )
+    with open(first_result_file, "rb") as first, open(
+        second_result_file, "rb"
+    ) as second:
+        assert first.read() == second.read()
+
+
+def test_result_cache_imported_document_changed(tmp_path) -> None:
+    cache_dir = os.path.join(tmp_path, "cache")
+    input_file = os.path.join(tmp_path, "Core_Chk003_negative.otx")
+    result_file = os.path.join(tmp_path, "result.xqar")
+    shutil.copy("tests/data/Core_Chk003/Core_Chk003_negative.otx", input_file)
+
+    result = check_file(input_file, cache_dir, result_file)
+    assert (
+        len(result.get_issues_by_rule_uid(core_checker.no_dead_import_links.RULE_UID))
+        == 1
+    )
+
+    # Creating the imported document invalidates the cached result
+    shutil.copy(
+        "tests/data/Core_Chk003/ImportExample.otx", os.path.join(tmp_path, "foo.otx")
+    )
+    result = check_file(input_file, cache_dir, result_file)
+    assert (
+        len(result.get_issues_by_rule_uid(core_checker.no_dead_import_links.RULE_UID))
+        == 0
+    )
+
+
+def test_result_cache_package_document_changed(monkeypatch, tmp_path) -> None:
+    cache_dir = os.path.join(tmp_path, "cache")
+    result_file = os.path.join(tmp_path, "result.xqar")
+    shutil.copytree(
+        "tests/data/Core_Chk002/positive", os.path.join(tmp_path, "positive")
+    )
+    input_file = os.path.join(
+        tmp_path, "positive", "package1", "Core_Chk002_positive.otx"
+    )
+    other_file = os.path.join(
+        tmp_path, "positive", "package2", "Core_Chk002_positive.otx"
+    )
+    rule_uid = core_checker.document_name_package_uniqueness.RULE_UID
+
+    result = check_file(input_file, cache_dir, result_file)
+    assert len(result.get_issues_by_rule_uid(rule_uid)) == 0
+
+    # The other documents of the package are not read on a cache lookup
+    hashed_files = []
+    hash_file = result_cache.hash_file
+
+    def record_hash_file(file_path: str):
+        hashed_files.append(os.path.abspath(file_path))
+        return hash_file(file_path)
+
+    monkeypatch.setattr(result_cache, "hash_file", record_hash_file)
+    result = check_file(input_file, cache_dir, result_file)
+    assert len(result.get_issues_by_rule_uid(rule_uid)) == 0
+    assert os.path.abspath(other_file) not in hashed_files
+
+    # Re-using the document name in another document of the package invalidates
+    # the cached result, through the modification time of that document
+    with open(other_file, "r") as f:
+        content = f.read()
+    with open(other_file, "w") as f:
+        f.write(content.replace("Core_Chk002_positive456", "Core_Chk002_positive123"))
+    file_stat = os.stat(other_file)
+    os.utime(other_file, ns=(file_stat.st_atime_ns, file_stat.st_mtime_ns + 1000))
+
+    result = check_file(input_file, cache_dir, result_file)
+    assert len(result.get_issues_by_rule_uid(rule_uid)) == 1
+
+
+def test_result_cache_eviction(tmp_path) -> None:
+    cache_dir = str(tmp_path)
+    for i in range(10):
+        entry_path = os.path.join(cache_dir, f"{i:02d}", f"{i:02d}.json")
+        os.makedirs(os.path.dirname(entry_path))
+        with open(entry_path, "w") as entry_file:
+            entry_file.write("x" * 100)
+        os.utime(entry_path, (i, i))
+
+    cache_size = result_cache.evict_cache_entries(cache_dir, 600)
+
+    assert cache_size == 300
+    remaining_entries = sorted(
+        os.path.basename(x[0]) for x in result_cache._list_cache_entries(cache_dir)
+    )
+    assert remaining_entries == ["07.json", "08.json", "09.json"]
@@ -0,0 +1,201 @@
+# SPDX-License-Identifier: MPL-2.0
+# Copyright 2024, ASAM e.V.
+# This Source Code Form is subject to the terms of the Mozilla
+# Public License, v. 2.0. If a copy of the MPL was not distributed
+# with this file, You can obtain one at https://mozilla.org/MPL/2.0/.
+
+import os
+import sys
+from typing import Optional
+from qc_baselib import Configuration, Result, StatusType
+from qc_otx import constants, main, rule_selection
+from qc_otx.checks import core_checker, families, registry
+
+PRE_COMMIT_CHECKER_IDS = [
+    core_checker.no_dead_import_links.CHECKER_ID,
+    core_checker.no_use_of_undefined_import_prefixes.CHECKER_ID,
+    core_checker.mandatory_constant_initialization.CHECKER_ID,
+]
+
+
+def create_config(
+    input_file: str,
+    include_rules: Optional[str] = None,
+    exclude_rules: Optional[str] = None,
+) -> Configuration:
+    config = Configuration()
+    config.set_config_param(name="InputFile", value=input_file)
+    config.register_checker_bundle(checker_bundle_name=constants.BUNDLE_NAME)
+    if include_rules is not None:
+        config.set_checker_bundle_param(
+            checker_bundle_name=constants.BUNDLE_NAME,
+            name=rule_selection.INCLUDE_RULES_PARAM,
+            value=include_rules,
+        )
+    if exclude_rules is not None:
+        config.set_checker_bundle_param(
+            checker_bundle_name=constants.BUNDLE_NAME,
+            name=rule_selection.EXCLUDE_RULES_PARAM,
+            value=exclude_rules,
+        )
+    return config
+
+
+def fail_check_rule(checker_data) -> None:
+    raise AssertionError("check_rule of an excluded rule was called")
+
+
+def test_rule_patterns() -> None:
+    checker = core_checker.no_dead_import_links
+    assert rule_selection.matches_rule_pattern(checker, checker.CHECKER_ID)
+    assert rule_selection.matches_rule_pattern(checker, "core")
+    assert rule_selection.matches_rule_pattern(checker, "asam.net:otx:1.0.0:core.*")
+    assert rule_selection.matches_rule_pattern(checker, "*core_chk_003*")
+    assert not rule_selection.matches_rule_pattern(checker, "data_type")
+    assert not rule_selection.matches_rule_pattern(
+        checker, "asam.net:otx:1.0.0:state_machine.*"
+    )
+
+    assert rule_selection.parse_rule_patterns(" core, zip_file\nstate_machine ") == [
+        "core",
+        "zip_file",
+        "state_machine",
+    ]
+    assert rule_selection.parse_rule_patterns(None) == []
+
+
+def test_include_rules(monkeypatch) -> None:
+    for checker in registry.BUILTIN_CHECKERS:
+        if checker.CHECKER_ID not in PRE_COMMIT_CHECKER_IDS:
+            monkeypatch.setattr(checker, "check_rule", fail_check_rule)
+
+    config = create_config(
+        "tests/data/Core_Chk009/Core_Chk009_negative.otx",
+        include_rules=",".join(PRE_COMMIT_CHECKER_IDS),
+    )
+    result = main.create_result()
+    main.run_checks(config, result)
+
+    for checker in registry.BUILTIN_CHECKERS:
+        checker_result = result.get_checker_result(
+            constants.BUNDLE_NAME, checker.CHECKER_ID
+        )
+        if checker.CHECKER_ID in PRE_COMMIT_CHECKER_IDS:
+            assert checker_result.status == StatusType.COMPLETED
+        else:
+            assert checker_result.status == StatusType.SKIPPED
+            assert (
+                checker_result.summary
+                == "Rule not matched by includeRules. Skip the check."
+            )
+
+    assert (
+        len(
+            result.get_issues_by_rule_uid(
+                core_checker.mandatory_constant_initialization.RULE_UID
+            )
+        )
+        == 1
+    )
+
+
+def test_exclude_rules(monkeypatch) -> None:
+    for checker in registry.BUILTIN_CHECKERS:
+        if families.get_rule_family(checker.RULE_UID) == "state_machine":
+            monkeypatch.setattr(checker, "check_rule", fail_check_rule)
+
+    config = create_config(
+        "tests/data/StateMachine_Chk001/negative.otx",
+        exclude_rules="asam.net:otx:1.0.0:state_machine.*",
+    )
+    result = main.create_result()
+    main.run_checks(config, result)
+
+    for checker in registry.BUILTIN_CHECKERS:
+        checker_result = result.get_checker_result(
+            constants.BUNDLE_NAME, checker.CHECKER_ID
+        )
+        if families.get_rule_family(checker.RULE_UID) == "state_machine":
+            assert checker_result.status == StatusType.SKIPPED
+            assert (
+                checker_result.summary
+                == "Rule excluded by excludeRules pattern 'asam.net:otx:1.0.0:state_machine.*'. Skip the check."
+            )
+        else:
+            assert "excludeRules" not in checker_result.summary
+
+
+def test_no_rule_selected(monkeypatch) -> None:
+    def fail_parse(*args, **kwargs):
+        raise AssertionError("The input file was parsed without a selected rule")
+
+    monkeypatch.setattr(main.etree, "parse", fail_parse)
+
+    config = create_config(
+        "tests/data/Core_Chk009/Core_Chk009_negative.otx", exclude_rules="*"
+    )
+    result = main.create_result()
+    main.run_checks(config, result)
+
+    assert all(
+        x.status == StatusType.SKIPPED
+        for x in result.get_checker_results(constants.BUNDLE_NAME)
+    )
+
+
+def test_rule_selection_result_cache(tmp_path) -> None:
+    cache_dir = os.path.join(tmp_path, "cache")
+    input_file = "tests/data/Core_Chk009/Core_Chk009_negative.otx"
+    checker_id = core_checker.mandatory_constant_initialization.CHECKER_ID
+
+    result = main.create_result()
+    main.run_checks(
+        create_config(input_file, exclude_rules="core"),
+        result,
+        result_cache_dir=cache_dir,
+    )
+    assert (
+        result.get_checker_result(constants.BUNDLE_NAME, checker_id).status
+        == StatusType.SKIPPED
+    )
+
+    # Another selection must not replay the cached result of the first one
+    result = main.create_result()
+    main.run_checks(create_config(input_file), result, result_cache_dir=cache_dir)
+    assert (
+        result.get_checker_result(constants.BUNDLE_NAME, checker_id).status
+        == StatusType.COMPLETED
+    )
+
+
+def test_cli_rule_selection(monkeypatch, tmp_path) -> None:
+    config_file = os.path.join(tmp_path, "config.xml")
+    result_file = os.path.join(tmp_path, "result.xqar")
+    config = create_config(
+        "tests/data/Core_Chk009/Core_Chk009_negative.otx", include_rules="data_type"
+    )
+    config.set_checker_bundle_param(
+        checker_bundle_name=constants.BUNDLE_NAME, name="resultFile", value=result_file
+    )
+    config.write_to_file(config_file)
+
+    # The command line patterns replace the ones of the configuration file
+    monkeypatch.setattr(
+        sys,
+        "argv",
+        ["main.py", "-c", config_file, "--no-cache", "--include_rules", "core"],
+    )
+    main.main()
+
+    result = Result()
+    result.load_from_file(result_file)
+    for checker in registry.BUILTIN_CHECKERS:
+        checker_result = result.get_checker_result(
+            constants.BUNDLE_NAME, checker.CHECKER_ID
+        )
+        if families.get_rule_family(checker.RULE_UID) == "core":
+            assert "includeRules" not in checker_result.summary
+        else:
+            assert checker_result.summary.startswith(
+                "Rule not matched by includeRules. Skip the check."
+            )
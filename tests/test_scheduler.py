@@ -0,0 +1,160 @@
+# SPDX-License-Identifier: MPL-2.0
+# Copyright 2024, ASAM e.V.
+# This Source Code Form is subject to the terms of the Mozilla
+# Public License, v. 2.0. If a copy of the MPL was not distributed
+# with this file, You can obtain one at https://mozilla.org/MPL/2.0/.
+
+import os
+import types
+from concurrent.futures import ThreadPoolExecutor
+import pytest
+from lxml import etree
+from qc_baselib import Configuration, IssueSeverity, StatusType
+import qc_otx.main as main
+from qc_otx import constants
+from qc_otx.checks import models, utils
+
+
+def create_checker(name: str, preconditions: set, has_issue: bool, calls: list):
+    checker = types.ModuleType(name)
+    checker.CHECKER_ID = name
+    checker.CHECKER_DESCRIPTION = f"Test checker {name}"
+    checker.CHECKER_PRECONDITIONS = preconditions
+    checker.RULE_UID = f"asam.net:otx:1.0.0:test.{name}"
+
+    def check_rule(checker_data: models.CheckerData) -> None:
+        calls.append(name)
+        if has_issue:
+            checker_data.result.register_issue(
+                checker_bundle_name=constants.BUNDLE_NAME,
+                checker_id=name,
+                description="Test issue",
+                level=IssueSeverity.ERROR,
+                rule_uid=checker.RULE_UID,
+            )
+
+    checker.check_rule = check_rule
+    return checker
+
+
+def create_checker_data() -> models.CheckerData:
+    tree = etree.parse("tests/data/Core_Chk001/Core_Chk001_positive.otx")
+    return models.CheckerData(
+        input_file_xml_root=tree,
+        config=Configuration(),
+        result=main.create_result(),
+        schema_version=utils.get_standard_schema_version(tree),
+        document_index=utils.build_document_index(tree),
+    )
+
+
+@pytest.mark.parametrize("max_workers", [1, 4])
+def test_preconditions_follow_dependency_graph(max_workers: int) -> None:
+    calls = []
+    # Rule order lists dependents before their preconditions
+    checkers = [
+        create_checker("chk_c", {"chk_b"}, False, calls),
+        create_checker("chk_d", {"chk_a"}, False, calls),
+        create_checker("chk_b", set(), False, calls),
+        create_checker("chk_a", set(), True, calls),
+        create_checker("chk_e", {"chk_unknown"}, False, calls),
+    ]
+    checker_data = create_checker_data()
+
+    main.execute_checkers(checkers, checker_data, max_workers)
+
+    result = checker_data.result
+    assert result.get_checker_ids(constants.BUNDLE_NAME) == [
+        "chk_c",
+        "chk_d",
+        "chk_b",
+        "chk_a",
+        "chk_e",
+    ]
+    assert result.get_checker_status("chk_c") == StatusType.COMPLETED
+    assert result.get_checker_status("chk_d") == StatusType.SKIPPED
+    assert result.get_checker_status("chk_e") == StatusType.SKIPPED
+    assert calls.index("chk_b") < calls.index("chk_c")
+    assert "chk_d" not in calls
+    assert result.get_issue_count() == 1
+
+
+def test_cyclic_preconditions_are_rejected() -> None:
+    calls = []
+    checkers = [
+        create_checker("chk_a", {"chk_b"}, False, calls),
+        create_checker("chk_b", {"chk_a"}, False, calls),
+    ]
+
+    with pytest.raises(RuntimeError):
+        main.execute_checkers(checkers, create_checker_data())
+
+    assert calls == []
+
+
+def test_threaded_checks_match_sequential(tmp_path) -> None:
+    result_files = []
+    for max_workers in [1, 8]:
+        config = Configuration()
+        config.set_config_param(
+            name="InputFile", value="tests/data/StateMachine_Chk002/negative.otx"
+        )
+        result = main.create_result()
+        main.run_checks(config, result, max_workers=max_workers)
+
+        result_file = os.path.join(tmp_path, f"result_{max_workers}.xqar")
+        result.write_to_file(result_file)
+        result_files.append(result_file)
+
+    contents = []
+    for result_file in result_files:
+        with open(result_file, "rb") as f:
+            contents.append(f.read())
+
+    assert contents[0] == contents[1]
+
+
+def test_checker_data_paths() -> None:
+    checker_data = create_checker_data()
+    checker_data.config.set_config_param(
+        name="InputFile", value="tests/data/Core_Chk002/negative/package1/x.otx"
+    )
+    input_directory = os.path.abspath("tests/data/Core_Chk002/negative/package1")
+
+    assert checker_data.get_input_directory() == input_directory
+    assert checker_data.get_package_root("negative.package1") == os.path.abspath(
+        "tests/data/Core_Chk002/negative"
+    )
+    assert checker_data.resolve_import("foo") == os.path.join(
+        input_directory, "foo.otx"
+    )
+
+
+def test_concurrent_files_with_external_documents() -> None:
+    # These documents make the checkers read the package and imported documents
+    input_files = [
+        "tests/data/Core_Chk002/negative/package1/Core_Chk002_negative.otx",
+        "tests/data/Core_Chk002/positive/package1/Core_Chk002_positive.otx",
+        "tests/data/Core_Chk003/Core_Chk003_negative.otx",
+        "tests/data/Core_Chk003/Core_Chk003_positive.otx",
+        "tests/data/Core_Chk006/Core_Chk006_negative.otx",
+        "tests/data/Core_Chk006/Core_Chk006_positive.otx",
+    ]
+    working_directory = os.getcwd()
+
+    def run(input_file: str):
+        config = Configuration()
+        config.set_config_param(name="InputFile", value=input_file)
+        result = main.create_result()
+        main.run_checks(config, result, max_workers=4)
+        return [
+            (x.checker_id, x.status, len(x.issues))
+            for x in result.get_checker_results(constants.BUNDLE_NAME)
+        ]
+
+    sequential = [run(x) for x in input_files]
+    with ThreadPoolExecutor(max_workers=len(input_files)) as executor:
+        for _ in range(5):
+            assert list(executor.map(run, input_files)) == sequential
+
+    assert os.getcwd() == working_directory
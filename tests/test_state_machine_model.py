@@ -0,0 +1,92 @@
+# SPDX-License-Identifier: MPL-2.0
+# Copyright 2024, ASAM e.V.
+# This Source Code Form is subject to the terms of the Mozilla
+# Public License, v. 2.0. If a copy of the MPL was not distributed
+# with this file, You can obtain one at https://mozilla.org/MPL/2.0/.
+
+import dataclasses
+import glob
+import pytest
+from lxml import etree
+from qc_baselib import Configuration
+from qc_otx import constants, main
+from qc_otx.checks import models, state_machine_checker, utils
+
+
+def create_checker_data(input_file: str) -> models.CheckerData:
+    tree = etree.parse(input_file)
+    return models.CheckerData(
+        input_file_xml_root=tree,
+        config=Configuration(),
+        result=main.create_result(),
+        schema_version=utils.get_standard_schema_version(tree),
+        document_index=utils.build_document_index(tree),
+    )
+
+
+@pytest.mark.parametrize(
+    "input_file", sorted(glob.glob("tests/data/StateMachine_Chk*/*.otx"))
+)
+def test_state_machines_match_xpath(input_file: str) -> None:
+    checker_data = create_checker_data(input_file)
+    nsmap = utils.get_namespace_map(checker_data.input_file_xml_root)
+    state_machines = utils.get_state_machines(checker_data)
+
+    assert list(state_machines) == utils.get_state_machine_procedures(
+        checker_data.document_index
+    )
+    for procedure, state_machine in state_machines.items():
+        realisations = procedure.xpath("./smp:realisation", namespaces=nsmap)
+        if len(realisations) != 1:
+            assert state_machine is None
+            continue
+
+        assert state_machine.realisation is realisations[0]
+        states = realisations[0].xpath("./smp:states/smp:state", namespaces=nsmap)
+        assert [x.xml_element for x in state_machine.states] == states
+        for sm_state, state in zip(state_machine.states, states):
+            assert [x.xml_element for x in sm_state.transitions] == state.xpath(
+                "./smp:transitions/smp:transition", namespaces=nsmap
+            )
+            assert [x.xml_element for x in sm_state.triggers] == state.xpath(
+                "./smp:triggers/smp:trigger", namespaces=nsmap
+            )
+
+
+def test_state_machines_are_shared() -> None:
+    checker_data = create_checker_data("tests/data/StateMachine_Chk002/negative.otx")
+    state_machines = utils.get_state_machines(checker_data)
+
+    checker_copy = dataclasses.replace(checker_data, result=main.create_result())
+    assert utils.get_state_machines(checker_copy) is state_machines
+
+
+def test_state_machine_rules_share_one_evaluation(monkeypatch) -> None:
+    evaluations = []
+    evaluate_state_machines = utils.evaluate_state_machines
+
+    def counting_evaluate_state_machines(checker_data):
+        evaluations.append(checker_data)
+        return evaluate_state_machines(checker_data)
+
+    monkeypatch.setattr(
+        utils, "evaluate_state_machines", counting_evaluate_state_machines
+    )
+
+    config = Configuration()
+    config.set_config_param(
+        name="InputFile", value="tests/data/StateMachine_Chk002/negative.otx"
+    )
+    config.register_checker_bundle(checker_bundle_name=constants.BUNDLE_NAME)
+    result = main.create_result()
+    main.run_checks(config, result)
+
+    assert len(evaluations) == 1
+    assert (
+        len(
+            result.get_issues_by_rule_uid(
+                state_machine_checker.mandatory_target_state.RULE_UID
+            )
+        )
+        == 1
+    )
@@ -0,0 +1,131 @@
+# SPDX-License-Identifier: MPL-2.0
+# Copyright 2024, ASAM e.V.
+# This Source Code Form is subject to the terms of the Mozilla
+# Public License, v. 2.0. If a copy of the MPL was not distributed
+# with this file, You can obtain one at https://mozilla.org/MPL/2.0/.
+
+import glob
+import os
+import pytest
+from lxml import etree
+from qc_baselib import Configuration
+from qc_otx import constants, main
+from qc_otx.checks import streaming
+
+
+MIXED_NAMESPACE_DOCUMENT = """<?xml version="1.0" encoding="UTF-8"?>
+<otx xmlns="http://iso.org/OTX/1.0.0" xmlns:smp="http://iso.org/OTX/1.0.0/StateMachineProcedure" version="1.0.0">
+  <!-- comment -->
+  <declarations>
+    <constant name="a"/>
+    <smp:constant name="b"/>
+    <constant xmlns="" name="c"/>
+    <constant xmlns="" name="d"/>
+    <smp:other/>
+    <constant xmlns="" name="e"/>
+  </declarations>
+  <smp:procedure/>
+  <procedure xmlns=""/>
+</otx>
+"""
+
+
+class PathRecorder(streaming.StreamChecker):
+    def __init__(self):
+        self.paths = []
+
+    def start(self, element, path):
+        self.paths.append(path)
+
+    def check_rule(self, checker_data):
+        pass
+
+
+def assert_paths_match(input_file: str) -> None:
+    recorder = PathRecorder()
+    streaming.stream_document(input_file, [recorder])
+
+    tree = etree.parse(input_file)
+    expected_paths = [tree.getpath(x) for x in tree.getroot().iter(etree.Element)]
+    assert [str(x) for x in recorder.paths] == expected_paths
+
+
+@pytest.mark.parametrize(
+    "input_file", sorted(glob.glob("tests/data/**/*.otx", recursive=True))
+)
+def test_element_paths(input_file: str) -> None:
+    assert_paths_match(input_file)
+
+
+def test_element_paths_mixed_namespaces(tmp_path) -> None:
+    input_file = os.path.join(tmp_path, "mixed.otx")
+    with open(input_file, "w") as file:
+        file.write(MIXED_NAMESPACE_DOCUMENT)
+
+    assert_paths_match(input_file)
+
+
+def test_processed_elements_are_cleared(tmp_path) -> None:
+    input_file = os.path.join(tmp_path, "large.otx")
+    with open(input_file, "w") as file:
+        file.write('<otx version="1.0.0"><declarations>')
+        for i in range(1000):
+            file.write(f'<constant name="c{i}"><realisation/></constant>')
+        file.write("</declarations></otx>")
+
+    # Only the previous sibling, which is kept until its parent ends, remains
+    class SiblingCounter(streaming.StreamChecker):
+        max_previous_siblings = 0
+
+        def end(self, element, path):
+            previous_siblings = len(list(element.itersiblings(preceding=True)))
+            self.max_previous_siblings = max(
+                self.max_previous_siblings, previous_siblings
+            )
+
+        def check_rule(self, checker_data):
+            pass
+
+    counter = SiblingCounter()
+    streaming.stream_document(input_file, [counter])
+
+    assert counter.max_previous_siblings == 1
+
+
+@pytest.mark.parametrize(
+    "input_file",
+    [
+        "tests/data/Core_Chk003/Core_Chk003_negative.otx",
+        "tests/data/Core_Chk005/Core_Chk005_negative.otx",
+        "tests/data/Core_Chk006/Core_Chk006_negative.otx",
+        "tests/data/Core_Chk007/Core_Chk007_negative.otx",
+        "tests/data/Core_Chk009/Core_Chk009_negative_multiple_errors.otx",
+        "tests/data/Core_Chk010/Core_Chk010_negative.otx",
+    ],
+)
+def test_streaming_matches_full_tree(input_file: str, tmp_path) -> None:
+    result_files = []
+    for use_streaming in (False, True):
+        config = Configuration()
+        config.set_config_param(name="InputFile", value=input_file)
+        config.register_checker_bundle(checker_bundle_name=constants.BUNDLE_NAME)
+
+        result = main.create_result()
+        main.run_checks(config, result, use_streaming=use_streaming)
+
+        result_file = os.path.join(tmp_path, f"streaming_{use_streaming}.xqar")
+        result.write_to_file(result_file, generate_summary=True)
+        result_files.append(result_file)
+
+    with open(result_files[0], "rb") as full_tree, open(
+        result_files[1], "rb"
+    ) as streamed:
+        assert full_tree.read() == streamed.read()
+
+
+def test_stream_checker_requires_check_rule() -> None:
+    class IncompleteChecker(streaming.StreamChecker):
+        pass
+
+    with pytest.raises(TypeError):
+        IncompleteChecker()
@@ -0,0 +1,103 @@
+# SPDX-License-Identifier: MPL-2.0
+# Copyright 2024, ASAM e.V.
+# This Source Code Form is subject to the terms of the Mozilla
+# Public License, v. 2.0. If a copy of the MPL was not distributed
+# with this file, You can obtain one at https://mozilla.org/MPL/2.0/.
+
+import dataclasses
+from lxml import etree
+from qc_baselib import Configuration
+from qc_otx import main
+from qc_otx.checks import models, utils
+
+
+SCOPED_DOCUMENT = """<?xml version="1.0" encoding="utf-8"?>
+<otx xmlns:dataType="http://iso.org/OTX/1.0.0/DataType"
+  xmlns:xsi="http://www.w3.org/2001/XMLSchema-instance" name="Scopes" package="Examples" version="1.0.0">
+  <declarations>
+    <constant name="Shared">
+      <realisation><dataType xsi:type="dataType:Structure" structureType="A"/></realisation>
+    </constant>
+  </declarations>
+  <signatures>
+    <signature name="A">
+      <realisation xsi:type="dataType:StructureSignature">
+        <dataType:elements><dataType:element name="x"/></dataType:elements>
+      </realisation>
+    </signature>
+    <signature name="B">
+      <realisation xsi:type="dataType:StructureSignature">
+        <dataType:elements><dataType:element name="y"/><dataType:element name="z"/></dataType:elements>
+      </realisation>
+    </signature>
+    <signature name="Call">
+      <realisation xsi:type="ProcedureSignature">
+        <parameters>
+          <inParam name="Signed"><realisation><dataType xsi:type="dataType:Structure" structureType="B"/></realisation></inParam>
+        </parameters>
+      </realisation>
+    </signature>
+  </signatures>
+  <procedures>
+    <procedure name="first">
+      <parameters>
+        <inParam name="Input"><realisation><dataType xsi:type="dataType:Structure" structureType="A"/></realisation></inParam>
+      </parameters>
+      <realisation>
+        <declarations>
+          <variable name="Local"><realisation><dataType xsi:type="dataType:Structure" structureType="A"/></realisation></variable>
+        </declarations>
+        <flow><action name="a1"/></flow>
+      </realisation>
+    </procedure>
+    <procedure name="second">
+      <realisation>
+        <declarations>
+          <variable name="Local"><realisation><dataType xsi:type="List"><itemType xsi:type="dataType:Structure" structureType="B"/></dataType></realisation></variable>
+          <variable name="Shared"><realisation><dataType xsi:type="dataType:Structure" structureType="B"/></realisation></variable>
+        </declarations>
+        <flow><action name="a2"/></flow>
+      </realisation>
+    </procedure>
+  </procedures>
+</otx>
+"""
+
+
+def test_structure_symbol_table_scopes() -> None:
+    tree = etree.ElementTree(etree.fromstring(SCOPED_DOCUMENT.encode("utf-8")))
+    symbol_table = utils.build_structure_symbol_table(utils.build_document_index(tree))
+
+    assert symbol_table.signatures["A"] == {"x"}
+    assert symbol_table.signatures["B"] == {"y", "z"}
+    assert symbol_table.global_types == {"Shared": "A"}
+
+    first_action = tree.xpath("//action[@name='a1']")[0]
+    second_action = tree.xpath("//action[@name='a2']")[0]
+
+    assert symbol_table.get_structure_type("Local", first_action) == "A"
+    assert symbol_table.get_structure_type("Input", first_action) == "A"
+    assert symbol_table.get_structure_type("Shared", first_action) == "A"
+
+    assert symbol_table.get_structure_type("Local", second_action) == "B"
+    assert symbol_table.get_structure_type("Input", second_action) is None
+    assert symbol_table.get_structure_type("Shared", second_action) == "B"
+
+    # Parameters of a procedure signature are not declarations of the document
+    assert symbol_table.get_structure_type("Signed", tree.getroot()) is None
+
+
+def test_structure_symbol_table_is_shared() -> None:
+    tree = etree.ElementTree(etree.fromstring(SCOPED_DOCUMENT.encode("utf-8")))
+    checker_data = models.CheckerData(
+        input_file_xml_root=tree,
+        config=Configuration(),
+        result=main.create_result(),
+        schema_version="1.0.0",
+        document_index=utils.build_document_index(tree),
+    )
+    symbol_table = utils.get_structure_symbol_table(checker_data)
+
+    # Checkers receive copies of the checker data with their own result
+    checker_copy = dataclasses.replace(checker_data, result=main.create_result())
+    assert utils.get_structure_symbol_table(checker_copy) is symbol_table
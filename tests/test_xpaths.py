@@ -0,0 +1,47 @@
+# SPDX-License-Identifier: MPL-2.0
+# Copyright 2024, ASAM e.V.
+# This Source Code Form is subject to the terms of the Mozilla
+# Public License, v. 2.0. If a copy of the MPL was not distributed
+# with this file, You can obtain one at https://mozilla.org/MPL/2.0/.
+
+from lxml import etree
+from qc_otx.checks import utils, xpaths
+
+
+def test_xpath_compiled_once() -> None:
+    nsmap = {"smp": "http://iso.org/OTX/1.0.0/StateMachineProcedure"}
+
+    assert xpaths.get_xpath(xpaths.SMP_REALISATION, nsmap) is xpaths.get_xpath(
+        xpaths.SMP_REALISATION, dict(nsmap)
+    )
+    assert xpaths.get_xpath(xpaths.SMP_REALISATION, nsmap) is not xpaths.get_xpath(
+        xpaths.SMP_REALISATION,
+        {"smp": "http://iso.org/OTX/2.0.0/StateMachineProcedure"},
+    )
+    assert xpaths.get_xpath(xpaths.CONSTANT_INIT) is xpaths.get_xpath(
+        xpaths.CONSTANT_INIT, dict()
+    )
+
+
+def test_xpath_cache_ignores_unused_prefixes() -> None:
+    nsmap = {"smp": "http://iso.org/OTX/1.0.0/StateMachineProcedure"}
+
+    for i in range(2 * xpaths.XPATH_CACHE_SIZE):
+        other_nsmap = dict(nsmap, **{f"ns{i}": f"http://example.com/{i}"})
+        assert xpaths.get_xpath(xpaths.SMP_REALISATION, other_nsmap) is (
+            xpaths.get_xpath(xpaths.SMP_REALISATION, nsmap)
+        )
+        assert xpaths.get_xpath(xpaths.CONSTANT_INIT, other_nsmap) is (
+            xpaths.get_xpath(xpaths.CONSTANT_INIT)
+        )
+
+
+def test_xpath_matches_element_xpath() -> None:
+    tree = etree.parse("tests/data/ZipFile_Chk002/negative.otx")
+    nsmap = utils.get_namespace_map(tree)
+    root = tree.getroot()
+
+    for expression in [xpaths.LIST_LITERALS, xpaths.TYPED_DESCENDANTS]:
+        assert xpaths.get_xpath(expression, nsmap)(root) == root.xpath(
+            expression, namespaces=nsmap
+        )